@@ -7,13 +7,25 @@ from .models import (
     Task, Customer, Credit, Notification, Insurance, MortalityRecord,
     AdditionalIncome, ActivityLog, VetVisit, VaccinationSchedule,
     BudgetPlanning, PerformanceEvaluation, CustomReminder, Document,
-    PhotoGallery, WeatherRecord, MarketPrice, FarmEvent, BreedingPlan
+    PhotoGallery, WeatherRecord, MarketPrice, FarmEvent, BreedingPlan,
+    BackgroundJob, OutboxMessage, ScheduledTask, ScheduledTaskRun,
 )
 
 
+class IndexedSearchMixin:
+    """Admin search box → FTS5 index (farm/search.py); index na ho to default icontains."""
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        from .search import matching_ids, search_available
+        if search_term and search_available():
+            return queryset.filter(pk__in=matching_ids(self.search_kind, search_term)), False
+        return super().get_search_results(request, queryset, search_term)
+
 
 @admin.register(Goat)
-class GoatAdmin(admin.ModelAdmin):
+class GoatAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = 'goat'
     list_display = ['tag_number', 'name', 'breed', 'gender', 'status', 'date_of_birth']
     list_filter = ['breed', 'gender', 'status', 'created_at']
     search_fields = ['tag_number', 'name']
@@ -34,7 +46,8 @@ class BreedingRecordAdmin(admin.ModelAdmin):
     search_fields = ['mother__name', 'father__name']
 
 @admin.register(HealthRecord)
-class HealthRecordAdmin(admin.ModelAdmin):
+class HealthRecordAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = 'health'
     list_display = ['goat', 'record_type', 'date', 'cost']
     list_filter = ['record_type', 'date']
     search_fields = ['goat__name']
@@ -79,7 +92,8 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ['status', 'priority']
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = 'customer'
     list_display = ['name', 'contact', 'email']
     search_fields = ['name', 'contact']
 
@@ -135,9 +149,11 @@ class CustomReminderAdmin(admin.ModelAdmin):
     list_filter = ['reminder_type', 'is_active']
 
 @admin.register(Document)
-class DocumentAdmin(admin.ModelAdmin):
+class DocumentAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = 'document'
     list_display = ['title', 'document_type', 'expiry_date', 'goat']
     list_filter = ['document_type']
+    search_fields = ['title', 'tags']
 
 @admin.register(PhotoGallery)
 class PhotoGalleryAdmin(admin.ModelAdmin):
@@ -161,4 +177,43 @@ class FarmEventAdmin(admin.ModelAdmin):
 @admin.register(BreedingPlan)
 class BreedingPlanAdmin(admin.ModelAdmin):
     list_display = ['title', 'status', 'budget', 'actual_spent', 'start_date']
-    list_filter = ['status']
\ No newline at end of file
+    list_filter = ['status']
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'progress', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'heartbeat_at', 'worker', 'attempts']
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'subject_id', 'for_date', 'recipient', 'status', 'attempts', 'sent_at']
+    list_filter = ['status', 'kind', 'for_date']
+    search_fields = ['recipient', 'title']
+    readonly_fields = ['created_at', 'claimed_at', 'sent_at', 'batch', 'attempts', 'provider_sid']
+
+
+@admin.register(ScheduledTask)
+class ScheduledTaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'task', 'schedule', 'enabled', 'next_run_at', 'last_run_at', 'last_status']
+    list_filter = ['enabled', 'task', 'last_status']
+    readonly_fields = ['next_run_at', 'last_run_at', 'last_status']
+    actions = ['run_now']
+
+    def save_model(self, request, obj, form, change):
+        # Schedule badla → run_scheduler agla run naye cron se nikaale
+        if {'schedule', 'jitter_seconds', 'enabled'} & set(form.changed_data):
+            obj.next_run_at = None
+        super().save_model(request, obj, form, change)
+
+    @admin.action(description='Run now (agle scheduler tick par)')
+    def run_now(self, request, queryset):
+        from django.utils import timezone
+        queryset.filter(enabled=True).update(next_run_at=timezone.now())
+
+
+@admin.register(ScheduledTaskRun)
+class ScheduledTaskRunAdmin(admin.ModelAdmin):
+    list_display = ['task', 'status', 'scheduled_for', 'started_at', 'finished_at', 'holder']
+    list_filter = ['status', 'task']
+    readonly_fields = ['task', 'status', 'scheduled_for', 'started_at', 'finished_at', 'result', 'error', 'holder']
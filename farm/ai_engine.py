@@ -21,10 +21,12 @@ from .models import (
     Goat, BreedingRecord, HealthRecord, MilkProduction,
     WeightRecord, Sale, MarketPrice, Expense
 )
+from .db_router import analytics_reads
 
 
 # ==================== 1. BEST BREEDING PAIR ====================
 
+@analytics_reads()
 def suggest_breeding_pairs(limit: int = 5):
     """
     Best mother-father pairs suggest karo.
@@ -127,6 +129,7 @@ def _get_breeding_reasons(female, male, f_score, m_score) -> list:
 
 # ==================== 2. SICK GOAT DETECTION ====================
 
+@analytics_reads()
 def detect_sick_goats():
     """
     Early warning system for potentially sick goats.
@@ -208,6 +211,7 @@ def detect_sick_goats():
 
 # ==================== 3. OPTIMAL SELLING TIME ====================
 
+@analytics_reads()
 def suggest_sell_goats():
     """
     Kaun se goats sell karne chahiye abhi.
@@ -283,6 +287,7 @@ def suggest_sell_goats():
 
 # ==================== 4. FEED OPTIMIZATION ====================
 
+@analytics_reads()
 def get_feed_optimization():
     """
     Daily feed requirement suggest karo goat categories ke basis par.
@@ -326,6 +331,7 @@ def get_feed_optimization():
 
 # ==================== 5. REVENUE FORECAST ====================
 
+@analytics_reads()
 def forecast_revenue(months_ahead: int = 3):
     """
     Simple linear trend se agle months ka revenue forecast.
@@ -1,5 +1,5 @@
 """
-🐐 Goat Farm Analytics Engine — v6.0
+🐐 Goat Farm Analytics Engine — v6.1
 Batch 1: Advanced Analytics & Reports
 
 Yeh module sab analytics calculations handle karta hai:
@@ -9,43 +9,111 @@ Yeh module sab analytics calculations handle karta hai:
 - Herd growth trends
 - Top performing goats
 - Feed efficiency metrics
+
+v6.1: month-by-month / goat-by-goat loops ki jagah grouped queries.
+- Month buckets: PostgreSQL par date_trunc('month') (TruncMonth), SQLite par native strftime
+- Conditional counts: Count(filter=Q) → PostgreSQL par FILTER (WHERE ...) aggregates
+- Per-goat sums: correlated subqueries — N+1 nahi
 """
 
-from django.db.models import Sum, Count, Avg, F, Q, Case, When, IntegerField, FloatField
-from django.db.models.functions import TruncMonth, TruncYear
+from django.db import connections
+from django.db.models import (
+    Sum, Count, Avg, F, Q, Value, FloatField, CharField, Func, OuterRef, Subquery,
+)
+from django.db.models.functions import TruncMonth, Coalesce
 from datetime import date, timedelta
 from decimal import Decimal
 
 from .models import (
     Goat, Sale, Expense, MilkProduction, HealthRecord,
     BreedingRecord, WeightRecord, FeedInventory, FeedConsumption,
-    AdditionalIncome
+    AdditionalIncome, MortalityRecord,
 )
+from .db_router import analytics_reads
+
+
+# ==================== QUERY HELPERS ====================
+
+def _month_bucket(qs, field):
+    """
+    Month grouping expression, database ke hisaab se:
+    PostgreSQL → date_trunc('month', field); SQLite → strftime('%Y-%m', field)
+    (SQLite par Django ka TruncMonth Python function hai — har row par slow).
+    """
+    if connections[qs.db].vendor == 'postgresql':
+        return TruncMonth(field)
+    return Func(Value('%Y-%m'), F(field), function='strftime', output_field=CharField())
+
+
+def _month_of(bucket) -> tuple:
+    """Bucket value (date ya 'YYYY-MM') → (year, month)."""
+    if isinstance(bucket, str):
+        year, month = bucket.split('-')[:2]
+        return int(year), int(month)
+    return bucket.year, bucket.month
+
+
+def monthly_totals(qs, date_field, start, end, **aggregates) -> dict:
+    """
+    [start, end) range ke andar har month ke aggregates — ek grouped query:
+        {(year, month): {alias: value}}
+    """
+    qs = qs.filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end}).order_by()
+    rows = qs.annotate(_bucket=_month_bucket(qs, date_field)).values('_bucket').annotate(**aggregates)
+    return {_month_of(row.pop('_bucket')): row for row in rows}
+
+
+def _last_n_months(months: int, today=None):
+    """Purane se naye: [(year, month), ...] + query range (start, end)."""
+    today = today or date.today()
+    keys = []
+    for i in range(months - 1, -1, -1):
+        year, month = today.year, today.month - i
+        while month <= 0:
+            month += 12
+            year -= 1
+        keys.append((year, month))
+    start = date(*keys[0], 1)
+    end = date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
+    return keys, start, end
+
+
+def _sum_subquery(qs, field):
+    """Correlated SUM(field) — per-goat loop ki jagah annotate() mein use karo."""
+    total = (
+        qs.order_by()
+        .annotate(_one=Value(1))
+        .values('_one')
+        .annotate(total=Sum(field))
+        .values('total')[:1]
+    )
+    return Coalesce(Subquery(total), Value(0.0), output_field=FloatField())
 
 
 # ==================== P&L (Profit & Loss) ====================
 
+def _monthly_pl_totals(start, end):
+    """Income / additional / expense — teen grouped queries, har table ek."""
+    income = monthly_totals(Sale.objects.all(), 'date', start, end, total=Sum('total_amount'))
+    additional = monthly_totals(AdditionalIncome.objects.all(), 'date', start, end, total=Sum('amount'))
+    expense = monthly_totals(Expense.objects.all(), 'date', start, end, total=Sum('amount'))
+
+    def total(table, key):
+        return float(table.get(key, {}).get('total') or 0)
+
+    return lambda key: (total(income, key) + total(additional, key), total(expense, key))
+
+
+@analytics_reads()
 def get_monthly_pl(year: int):
     """
     Poore saal ka monthly P&L data.
     Returns: list of 12 months with income, expense, profit
     """
+    totals_for = _monthly_pl_totals(date(year, 1, 1), date(year + 1, 1, 1))
     months = []
     for month in range(1, 13):
-        income = Sale.objects.filter(
-            date__year=year, date__month=month
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-
-        additional = AdditionalIncome.objects.filter(
-            date__year=year, date__month=month
-        ).aggregate(total=Sum('amount'))['total'] or 0
-
-        expense = Expense.objects.filter(
-            date__year=year, date__month=month
-        ).aggregate(total=Sum('amount'))['total'] or 0
-
-        total_income = float(income) + float(additional)
-        total_expense = float(expense)
+        total_income, total_expense = totals_for((year, month))
 
         months.append({
             'month': month,
@@ -65,23 +133,30 @@ def get_monthly_pl(year: int):
     }
 
 
+@analytics_reads()
 def get_yearly_pl_summary(years: int = 3):
-    """Last N years ka yearly summary."""
+    """Last N years ka yearly summary — saare saal ek hi range query mein."""
     current_year = date.today().year
+    first_year = current_year - years + 1
+    totals_for = _monthly_pl_totals(date(first_year, 1, 1), date(current_year + 1, 1, 1))
     results = []
-    for y in range(current_year - years + 1, current_year + 1):
-        data = get_monthly_pl(y)
+    for y in range(first_year, current_year + 1):
+        # get_monthly_pl jaisa hi rounding — pehle month, phir saal
+        months = [totals_for((y, m)) for m in range(1, 13)]
+        income = round(sum(round(i, 2) for i, _ in months), 2)
+        expense = round(sum(round(e, 2) for _, e in months), 2)
         results.append({
             'year': y,
-            'income': data['total_income'],
-            'expense': data['total_expense'],
-            'profit': data['total_profit'],
+            'income': income,
+            'expense': expense,
+            'profit': round(sum(round(i - e, 2) for i, e in months), 2),
         })
     return results
 
 
 # ==================== Breed-wise Performance ====================
 
+@analytics_reads()
 def get_breed_performance():
     """
     Har breed ka performance comparison.
@@ -89,21 +164,21 @@ def get_breed_performance():
     """
     breeds = Goat.objects.values('breed').annotate(
         total=Count('id'),
-        active=Count(Case(When(status='A', then=1), output_field=IntegerField())),
+        active=Count('id', filter=Q(status='A')),
         avg_weight=Avg('weight'),
     ).order_by('-total')
 
+    milk_by_breed = dict(
+        MilkProduction.objects.order_by().values_list('goat__breed').annotate(total=Sum('quantity'))
+    )
+    health_by_breed = dict(
+        HealthRecord.objects.order_by().values_list('goat__breed').annotate(avg=Avg('cost'))
+    )
+
     result = []
     for b in breeds:
-        breed_goat_ids = list(Goat.objects.filter(breed=b['breed']).values_list('id', flat=True))
-
-        total_milk = MilkProduction.objects.filter(
-            goat_id__in=breed_goat_ids
-        ).aggregate(total=Sum('quantity'))['total'] or 0
-
-        avg_health_cost = HealthRecord.objects.filter(
-            goat_id__in=breed_goat_ids
-        ).aggregate(avg=Avg('cost'))['avg'] or 0
+        total_milk = milk_by_breed.get(b['breed']) or 0
+        avg_health_cost = health_by_breed.get(b['breed']) or 0
 
         avg_milk_per_goat = round(float(total_milk) / max(b['total'], 1), 2)
 
@@ -122,39 +197,36 @@ def get_breed_performance():
 
 # ==================== ROI per Goat ====================
 
+@analytics_reads()
 def get_top_goats_by_roi(limit: int = 10):
     """
     Har goat ka ROI calculate karo.
     ROI = (total revenue generated - purchase price) / purchase price × 100
     """
-    goats = Goat.objects.filter(status__in=['A', 'P', 'S']).select_related('mother', 'father')
+    total_farm_milk = MilkProduction.objects.aggregate(
+        total=Sum('quantity'))['total'] or 1
+
+    goats = Goat.objects.filter(status__in=['A', 'P', 'S']).annotate(
+        # Milk sales goat ke purchase ke baad se (goat ka share niche nikalte hain)
+        milk_revenue=_sum_subquery(
+            Sale.objects.filter(sale_type='M', date__gte=OuterRef('purchase_date')), 'total_amount'
+        ),
+        goat_milk=_sum_subquery(MilkProduction.objects.filter(goat=OuterRef('pk')), 'quantity'),
+        direct_sale=_sum_subquery(Sale.objects.filter(goat=OuterRef('pk'), sale_type='G'), 'total_amount'),
+        health_cost=_sum_subquery(HealthRecord.objects.filter(goat=OuterRef('pk')), 'cost'),
+    )
     result = []
 
     for goat in goats:
-        # Revenue: milk sales (proportional) + direct goat sale
-        milk_revenue = Sale.objects.filter(
-            sale_type='M', date__gte=goat.purchase_date
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
         # Milk revenue approximation: goat's share = goat_milk / total_farm_milk
-        goat_milk = MilkProduction.objects.filter(goat=goat).aggregate(
-            total=Sum('quantity'))['total'] or 0
-        total_farm_milk = MilkProduction.objects.aggregate(
-            total=Sum('quantity'))['total'] or 1
-        milk_share = float(goat_milk) / float(total_farm_milk)
-        goat_milk_revenue = float(milk_revenue) * milk_share
-
-        # Direct sale revenue
-        direct_sale = Sale.objects.filter(
-            goat=goat, sale_type='G'
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-
-        total_revenue = goat_milk_revenue + float(direct_sale)
+        milk_share = float(goat.goat_milk) / float(total_farm_milk)
+        goat_milk_revenue = float(goat.milk_revenue) * milk_share
+
+        total_revenue = goat_milk_revenue + float(goat.direct_sale)
         purchase_price = float(goat.purchase_price)
 
         # Health cost (investment)
-        health_cost = HealthRecord.objects.filter(goat=goat).aggregate(
-            total=Sum('cost'))['total'] or 0
-        total_investment = purchase_price + float(health_cost)
+        total_investment = purchase_price + float(goat.health_cost)
 
         roi = ((total_revenue - total_investment) / max(total_investment, 1)) * 100
 
@@ -167,7 +239,7 @@ def get_top_goats_by_roi(limit: int = 10):
             'total_revenue': round(total_revenue, 2),
             'total_investment': round(total_investment, 2),
             'roi_percent': round(roi, 1),
-            'milk_liters': round(float(goat_milk), 2),
+            'milk_liters': round(float(goat.goat_milk), 2),
         })
 
     return sorted(result, key=lambda x: x['roi_percent'], reverse=True)[:limit]
@@ -175,50 +247,39 @@ def get_top_goats_by_roi(limit: int = 10):
 
 # ==================== Herd Growth Trend ====================
 
+@analytics_reads()
 def get_herd_growth(months: int = 12):
     """
     Last N months ka herd size trend.
     Returns: births, deaths, sales, net change per month
     """
-    today = date.today()
-    result = []
+    keys, start, end = _last_n_months(months)
 
-    for i in range(months - 1, -1, -1):
-        # Month calculate karo
-        year = today.year
-        month = today.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-
-        births = BreedingRecord.objects.filter(
-            actual_delivery_date__year=year,
-            actual_delivery_date__month=month,
-            status='D'
-        ).aggregate(kids=Sum('number_of_kids'))['kids'] or 0
-
-        deaths = Goat.objects.filter(
-            mortality__death_date__year=year,
-            mortality__death_date__month=month
-        ).count()
-
-        sales = Sale.objects.filter(
-            sale_type='G', date__year=year, date__month=month
-        ).count()
+    births = monthly_totals(
+        BreedingRecord.objects.filter(status='D'), 'actual_delivery_date', start, end,
+        kids=Sum('number_of_kids'),
+    )
+    deaths = monthly_totals(MortalityRecord.objects.all(), 'death_date', start, end, n=Count('id'))
+    sales = monthly_totals(Sale.objects.filter(sale_type='G'), 'date', start, end, n=Count('id'))
+    purchases = monthly_totals(Goat.objects.all(), 'purchase_date', start, end, n=Count('id'))
 
-        purchases = Goat.objects.filter(
-            purchase_date__year=year, purchase_date__month=month
-        ).count()
+    result = []
+    for year, month in keys:
+        key = (year, month)
+        kids = int(births.get(key, {}).get('kids') or 0)
+        died = deaths.get(key, {}).get('n', 0)
+        sold = sales.get(key, {}).get('n', 0)
+        bought = purchases.get(key, {}).get('n', 0)
 
         result.append({
             'year': year,
             'month': month,
             'month_name': date(year, month, 1).strftime('%b %Y'),
-            'births': int(births),
-            'deaths': deaths,
-            'sales': sales,
-            'purchases': purchases,
-            'net_change': int(births) + purchases - deaths - sales,
+            'births': kids,
+            'deaths': died,
+            'sales': sold,
+            'purchases': bought,
+            'net_change': kids + bought - died - sold,
         })
 
     return result
@@ -226,63 +287,73 @@ def get_herd_growth(months: int = 12):
 
 # ==================== Top Performing Goats ====================
 
+@analytics_reads()
 def get_top_performers(category: str = 'milk', limit: int = 10):
     """
     Top goats by category: 'milk', 'weight_gain', 'health'
     """
     if category == 'milk':
-        data = MilkProduction.objects.values('goat_id').annotate(
+        data = MilkProduction.objects.values(
+            'goat_id', 'goat__tag_number', 'goat__name', 'goat__breed',
+        ).annotate(
             total_milk=Sum('quantity')
         ).order_by('-total_milk')[:limit]
 
-        result = []
-        for d in data:
-            try:
-                goat = Goat.objects.get(pk=d['goat_id'])
-                result.append({
-                    'goat_id': goat.id,
-                    'tag_number': goat.tag_number,
-                    'name': goat.name,
-                    'breed': goat.breed,
-                    'value': round(float(d['total_milk']), 2),
-                    'unit': 'Liters',
-                })
-            except Goat.DoesNotExist:
-                pass
-        return result
+        return [
+            {
+                'goat_id': d['goat_id'],
+                'tag_number': d['goat__tag_number'],
+                'name': d['goat__name'],
+                'breed': d['goat__breed'],
+                'value': round(float(d['total_milk']), 2),
+                'unit': 'Liters',
+            }
+            for d in data
+        ]
 
     elif category == 'weight_gain':
+        records = WeightRecord.objects.filter(goat=OuterRef('pk'))
+        first = records.order_by('date', 'pk')
+        last = records.order_by('-date', '-pk')
+        goats = Goat.objects.filter(status__in=['A', 'P']).annotate(
+            record_count=Count('weight_records'),
+            first_weight=Subquery(first.values('weight')[:1]),
+            first_date=Subquery(first.values('date')[:1]),
+            last_weight=Subquery(last.values('weight')[:1]),
+            last_date=Subquery(last.values('date')[:1]),
+        ).filter(record_count__gte=2).order_by(*Goat._meta.ordering)
+
         result = []
-        for goat in Goat.objects.filter(status__in=['A', 'P']):
-            records = goat.weight_records.order_by('date')
-            if records.count() >= 2:
-                gain = records.last().weight - records.first().weight
-                days = (records.last().date - records.first().date).days or 1
-                result.append({
-                    'goat_id': goat.id,
-                    'tag_number': goat.tag_number,
-                    'name': goat.name,
-                    'breed': goat.breed,
-                    'value': round(gain, 2),
-                    'unit': 'kg gain',
-                    'daily_gain': round(gain / days * 30, 2),  # per month
-                })
+        for goat in goats:
+            gain = goat.last_weight - goat.first_weight
+            days = (goat.last_date - goat.first_date).days or 1
+            result.append({
+                'goat_id': goat.id,
+                'tag_number': goat.tag_number,
+                'name': goat.name,
+                'breed': goat.breed,
+                'value': round(gain, 2),
+                'unit': 'kg gain',
+                'daily_gain': round(gain / days * 30, 2),  # per month
+            })
         return sorted(result, key=lambda x: x['value'], reverse=True)[:limit]
 
     elif category == 'health':
         # Fewest health issues = best health
+        goats = Goat.objects.filter(status__in=['A', 'P']).annotate(
+            treatment_count=Count('health_records', filter=Q(health_records__record_type='T')),
+            total_health_cost=Sum('health_records__cost'),
+        ).order_by(*Goat._meta.ordering)  # GROUP BY mein Meta.ordering drop hota hai — ties ka order same rakho
         result = []
-        for goat in Goat.objects.filter(status__in=['A', 'P']):
-            treatment_count = goat.health_records.filter(record_type='T').count()
-            health_cost = goat.health_records.aggregate(total=Sum('cost'))['total'] or 0
+        for goat in goats:
             result.append({
                 'goat_id': goat.id,
                 'tag_number': goat.tag_number,
                 'name': goat.name,
                 'breed': goat.breed,
-                'value': treatment_count,
+                'value': goat.treatment_count,
                 'unit': 'treatments',
-                'total_health_cost': round(float(health_cost), 2),
+                'total_health_cost': round(float(goat.total_health_cost or 0), 2),
             })
         return sorted(result, key=lambda x: x['value'])[:limit]
 
@@ -291,29 +362,20 @@ def get_top_performers(category: str = 'milk', limit: int = 10):
 
 # ==================== Feed Efficiency ====================
 
+@analytics_reads()
 def get_feed_efficiency():
     """
     Feed cost per liter of milk.
     Monthly breakdown.
     """
-    today = date.today()
+    keys, start, end = _last_n_months(6)
+    feed = monthly_totals(Expense.objects.filter(expense_type='F'), 'date', start, end, total=Sum('amount'))
+    milk = monthly_totals(MilkProduction.objects.all(), 'date', start, end, total=Sum('quantity'))
     result = []
 
-    for i in range(5, -1, -1):
-        year = today.year
-        month = today.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-
-        feed_cost = Expense.objects.filter(
-            expense_type='F',
-            date__year=year, date__month=month
-        ).aggregate(total=Sum('amount'))['total'] or 0
-
-        milk_produced = MilkProduction.objects.filter(
-            date__year=year, date__month=month
-        ).aggregate(total=Sum('quantity'))['total'] or 0
+    for year, month in keys:
+        feed_cost = feed.get((year, month), {}).get('total') or 0
+        milk_produced = milk.get((year, month), {}).get('total') or 0
 
         cost_per_liter = (
             round(float(feed_cost) / float(milk_produced), 2)
@@ -332,6 +394,7 @@ def get_feed_efficiency():
 
 # ==================== Dashboard Summary ====================
 
+@analytics_reads()
 def get_analytics_summary():
     """Quick summary for analytics dashboard cards."""
     today = date.today()
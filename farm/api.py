@@ -21,13 +21,18 @@ Fixes applied:
   - FIX #21: list_milk → date_from/date_to filter + ordered by -date
 """
 
+import asyncio
+
+from asgiref.sync import sync_to_async
 from ninja import NinjaAPI, Schema
+from ninja.decorators import decorate_view
 from ninja.pagination import paginate, PageNumberPagination
 from ninja.security import SessionAuth
 from typing import List, Optional
 from datetime import date, time, datetime
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Sum, Count
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib.auth.models import User
 from django.conf import settings
@@ -41,6 +46,9 @@ from .models import (
     VaccinationSchedule, BudgetPlanning, ActivityLog, VetVisit,
 )
 from .weather_api import weather_api
+from .jobs_api import jobs_api
+from .watermarks import conditional_resource, touch
+from .search import matching_ids, search as search_index, INDEXED as SEARCH_KINDS
 
 
 # ==================== AUTHENTICATION ====================
@@ -59,6 +67,8 @@ api = NinjaAPI(
 
 # Weather router — auth=None (router-level pe set hai)
 api.add_router("/weather/", weather_api)
+# Background jobs — status / progress / download (farm/jobs.py)
+api.add_router("/jobs/", jobs_api)
 
 
 # ==================== API ROOT ====================
@@ -342,6 +352,15 @@ class WeightOut(Schema):
     date: date
     weight: float
 
+# --- Feed consumption (bulk) ---
+class FeedUseIn(Schema):
+    feed_id: int
+    quantity: float
+
+class FeedDayIn(Schema):
+    date: date
+    items: List[FeedUseIn]
+
 # --- Performance ---
 class PerformanceIn(Schema):
     goat_id: int
@@ -485,13 +504,15 @@ class ReminderOut(Schema):
 # ==================== GOAT ENDPOINTS ====================
 
 @api.get("/goats/", response=List[GoatOut], tags=["Goats"])
+@decorate_view(conditional_resource(Goat))
 @paginate(PageNumberPagination)
-def list_goats(request, search: str = None, status: str = None, breed: str = None, ordering: str = "-created_at"):
+async def list_goats(request, search: str = None, status: str = None, breed: str = None, ordering: str = "-created_at"):
     """सभी बकरियों की सूची — ordering: tag_number, name, -created_at, date_of_birth"""
     qs = Goat.objects.select_related('mother', 'father')
     
     if search:
-        qs = qs.filter(Q(tag_number__icontains=search) | Q(name__icontains=search))
+        # FTS5 index (farm/search.py) — icontains full scan nahi; FTS na ho to fallback
+        qs = qs.filter(pk__in=await sync_to_async(matching_ids)('goat', search))
     if status:
         qs = qs.filter(status=status)
     if breed:
@@ -514,12 +535,12 @@ def create_goat(request, payload: GoatIn):
     """नई बकरी जोड़ें"""
     return Goat.objects.create(**payload.dict())
 
-@api.get("/goats/{goat_id}/", response=GoatOut, tags=["Goats"])
+@api.get("/goats/{int:goat_id}/", response=GoatOut, tags=["Goats"])
 def get_goat(request, goat_id: int):
     """बकरी की विस्तृत जानकारी"""
     return get_object_or_404(Goat, id=goat_id)
 
-@api.put("/goats/{goat_id}/", response=GoatOut, tags=["Goats"])
+@api.put("/goats/{int:goat_id}/", response=GoatOut, tags=["Goats"])
 def update_goat(request, goat_id: int, payload: GoatIn):
     """बकरी की जानकारी अपडेट करें (full update)"""
     goat = get_object_or_404(Goat, id=goat_id)
@@ -528,7 +549,7 @@ def update_goat(request, goat_id: int, payload: GoatIn):
     goat.save()
     return goat
 
-@api.patch("/goats/{goat_id}/", response=GoatOut, tags=["Goats"])
+@api.patch("/goats/{int:goat_id}/", response=GoatOut, tags=["Goats"])
 def partial_update_goat(request, goat_id: int, payload: GoatPatch):
     """बकरी की जानकारी आंशिक रूप से अपडेट करें (partial update — sirf jo fields bhejo)"""
     goat = get_object_or_404(Goat, id=goat_id)
@@ -539,7 +560,7 @@ def partial_update_goat(request, goat_id: int, payload: GoatPatch):
     goat.save()
     return goat
 
-@api.delete("/goats/{goat_id}/", tags=["Goats"])
+@api.delete("/goats/{int:goat_id}/", tags=["Goats"])
 def delete_goat(request, goat_id: int):
     """बकरी रिकॉर्ड हटाएं"""
     goat = get_object_or_404(Goat, id=goat_id)
@@ -550,8 +571,9 @@ def delete_goat(request, goat_id: int):
 # ==================== BREEDING ENDPOINTS ====================
 
 @api.get("/breeding/", response=List[BreedingOut], tags=["Breeding"])
+@decorate_view(conditional_resource(BreedingRecord))
 @paginate(PageNumberPagination)
-def list_breeding(request, status: str = None):
+async def list_breeding(request, status: str = None):
     qs = BreedingRecord.objects.select_related('mother', 'father')
     if status:
         qs = qs.filter(status=status)
@@ -586,8 +608,9 @@ def delete_breeding(request, record_id: int):
 # ==================== HEALTH ENDPOINTS ====================
 
 @api.get("/health/", response=List[HealthOut], tags=["Health"])
+@decorate_view(conditional_resource(HealthRecord))
 @paginate(PageNumberPagination)
-def list_health(request, goat_id: int = None, record_type: str = None):
+async def list_health(request, goat_id: int = None, record_type: str = None):
     qs = HealthRecord.objects.select_related('goat').order_by('-date')
     if goat_id:
         qs = qs.filter(goat_id=goat_id)
@@ -621,8 +644,9 @@ def delete_health(request, record_id: int):
 # ==================== MILK ENDPOINTS ====================
 
 @api.get("/milk/", response=List[MilkOut], tags=["Milk"])
+@decorate_view(conditional_resource(MilkProduction))
 @paginate(PageNumberPagination)
-def list_milk(request, goat_id: int = None, date_from: date = None, date_to: date = None):
+async def list_milk(request, goat_id: int = None, date_from: date = None, date_to: date = None):
     qs = MilkProduction.objects.select_related('goat').order_by('-date')
     if goat_id:
         qs = qs.filter(goat_id=goat_id)
@@ -663,8 +687,9 @@ def delete_milk(request, record_id: int):
 # ==================== SALES ENDPOINTS ====================
 
 @api.get("/sales/", response=List[SaleOut], tags=["Sales"])
+@decorate_view(conditional_resource(Sale))
 @paginate(PageNumberPagination)
-def list_sales(request, goat_id: int = None, payment_status: str = None):
+async def list_sales(request, goat_id: int = None, payment_status: str = None):
     qs = Sale.objects.select_related('goat')
     if goat_id:
         qs = qs.filter(goat_id=goat_id)
@@ -699,8 +724,9 @@ def delete_sale(request, sale_id: int):
 # ==================== EXPENSE ENDPOINTS ====================
 
 @api.get("/expenses/", response=List[ExpenseOut], tags=["Expenses"])
+@decorate_view(conditional_resource(Expense))
 @paginate(PageNumberPagination)
-def list_expenses(request, expense_type: str = None, date_from: date = None, date_to: date = None):
+async def list_expenses(request, expense_type: str = None, date_from: date = None, date_to: date = None):
     qs = Expense.objects.order_by('-date')  # FIX: latest first ordering add kiya
     if expense_type:
         qs = qs.filter(expense_type=expense_type)
@@ -737,28 +763,45 @@ def delete_expense(request, expense_id: int):
 # ==================== WEIGHT ENDPOINTS ====================
 
 @api.get("/weight/", response=List[WeightOut], tags=["Weight"])
+@decorate_view(conditional_resource(WeightRecord))
 @paginate(PageNumberPagination)
-def list_weight(request, goat_id: int = None):
+async def list_weight(request, goat_id: int = None):
     qs = WeightRecord.objects.select_related('goat')
     if goat_id:
         qs = qs.filter(goat_id=goat_id)
     return qs
 
-@api.post("/weight/", response=WeightOut, tags=["Weight"])
+def _weight_conflict(payload):
+    return 409, {"detail": f"Is goat ka {payload.date} ka weight pehle se hai. Edit karne ke liye PUT use karein."}
+
+@api.post("/weight/", response={200: WeightOut, 409: dict}, tags=["Weight"])
 def create_weight(request, payload: WeightIn):
-    return WeightRecord.objects.create(**payload.dict())
+    """वजन रिकॉर्ड — ek goat, ek date pe sirf ek record (unique_together)"""
+    if WeightRecord.objects.filter(goat_id=payload.goat_id, date=payload.date).exists():
+        return _weight_conflict(payload)
+    try:
+        with transaction.atomic():   # exists() aur create() ke beech doosri request ne bana diya ho to
+            return 200, WeightRecord.objects.create(**payload.dict())
+    except IntegrityError:
+        return _weight_conflict(payload)
 
 @api.get("/weight/{record_id}/", response=WeightOut, tags=["Weight"])
 def get_weight(request, record_id: int):
     return get_object_or_404(WeightRecord, id=record_id)
 
-@api.put("/weight/{record_id}/", response=WeightOut, tags=["Weight"])
+@api.put("/weight/{record_id}/", response={200: WeightOut, 409: dict}, tags=["Weight"])
 def update_weight(request, record_id: int, payload: WeightIn):
     record = get_object_or_404(WeightRecord, id=record_id)
+    if WeightRecord.objects.filter(goat_id=payload.goat_id, date=payload.date).exclude(id=record_id).exists():
+        return _weight_conflict(payload)
     for attr, value in payload.dict(exclude_unset=False).items():
         setattr(record, attr, value)
-    record.save()
-    return record
+    try:
+        with transaction.atomic():
+            record.save()
+    except IntegrityError:
+        return _weight_conflict(payload)
+    return 200, record
 
 @api.delete("/weight/{record_id}/", tags=["Weight"])
 def delete_weight(request, record_id: int):
@@ -770,8 +813,9 @@ def delete_weight(request, record_id: int):
 # ==================== PERFORMANCE ENDPOINTS ====================
 
 @api.get("/performance/", response=List[PerformanceOut], tags=["Performance"])
+@decorate_view(conditional_resource(PerformanceEvaluation))
 @paginate(PageNumberPagination)
-def list_performance(request, goat_id: int = None):
+async def list_performance(request, goat_id: int = None):
     qs = PerformanceEvaluation.objects.select_related('goat')
     if goat_id:
         qs = qs.filter(goat_id=goat_id)
@@ -795,8 +839,9 @@ def delete_performance(request, record_id: int):
 # ==================== MARKET PRICE ENDPOINTS ====================
 
 @api.get("/market-prices/", response=List[MarketPriceOut], tags=["Market"])
+@decorate_view(conditional_resource(MarketPrice))
 @paginate(PageNumberPagination)
-def list_prices(request, item: str = None):
+async def list_prices(request, item: str = None):
     qs = MarketPrice.objects.all()
     if item:
         qs = qs.filter(item=item)
@@ -822,8 +867,9 @@ def delete_price(request, price_id: int):
 # Stored WeatherRecord CRUD is at /weather-records/
 
 @api.get("/weather-records/", response=List[WeatherOut], tags=["Weather Records"])
+@decorate_view(conditional_resource(WeatherRecord))
 @paginate(PageNumberPagination)
-def list_weather(request, date_from: date = None, date_to: date = None):
+async def list_weather(request, date_from: date = None, date_to: date = None):
     """Database mein store kiye hue historical weather records"""
     qs = WeatherRecord.objects.all()
     if date_from:
@@ -841,8 +887,9 @@ def create_weather(request, payload: WeatherIn):
 # ==================== BREEDING PLAN ENDPOINTS ====================
 
 @api.get("/breeding-plans/", response=List[BreedingPlanOut], tags=["Breeding Plans"])
+@decorate_view(conditional_resource(BreedingPlan))
 @paginate(PageNumberPagination)
-def list_plans(request, status: str = None):
+async def list_plans(request, status: str = None):
     qs = BreedingPlan.objects.all()
     if status:
         qs = qs.filter(status=status)
@@ -856,8 +903,9 @@ def create_plan(request, payload: BreedingPlanIn):
 # ==================== FARM EVENTS ENDPOINTS ====================
 
 @api.get("/events/", response=List[FarmEventOut], tags=["Events"])
+@decorate_view(conditional_resource(FarmEvent))
 @paginate(PageNumberPagination)
-def list_events(request, event_type: str = None):
+async def list_events(request, event_type: str = None):
     qs = FarmEvent.objects.all()
     if event_type:
         qs = qs.filter(event_type=event_type)
@@ -871,8 +919,9 @@ def create_event(request, payload: FarmEventIn):
 # ==================== REMINDERS ENDPOINTS ====================
 
 @api.get("/reminders/", response=List[ReminderOut], tags=["Reminders"])
+@decorate_view(conditional_resource(CustomReminder))
 @paginate(PageNumberPagination)
-def list_reminders(request, is_active: bool = True):
+async def list_reminders(request, is_active: bool = True):
     return CustomReminder.objects.filter(is_active=is_active)
 
 @api.post("/reminders/", response=ReminderOut, tags=["Reminders"])
@@ -883,92 +932,36 @@ def create_reminder(request, payload: ReminderIn):
 # ==================== STATS ENDPOINTS ====================
 
 @api.get("/stats/dashboard/", tags=["Stats"])
-def get_dashboard_stats(request):
+@decorate_view(conditional_resource(
+    Goat, Sale, Expense, MilkProduction, VaccinationSchedule, BreedingRecord, Task,
+    per_day=True,
+))
+async def get_dashboard_stats(request):
     """
     FIX #3: N+1 query problem fix —
-    aggregate(Sum()) use kiya, sab records loop mein nahi chalate
+    Shared stats service (farm/stats.py): har section ek conditional-aggregate
+    query (herd / finance / alerts) + per-section cache; sections concurrently await.
     """
-    today = date.today()
-
-    total_milk = MilkProduction.objects.aggregate(
-        total=Sum('quantity')
-    )['total'] or 0
-
-    total_revenue = Sale.objects.aggregate(
-        total=Sum('total_amount')
-    )['total'] or 0
-
-    total_expenses = Expense.objects.aggregate(
-        total=Sum('amount')
-    )['total'] or 0
-
-    # This month stats
-    this_month_revenue = Sale.objects.filter(
-        date__year=today.year, date__month=today.month
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
-
-    this_month_expenses = Expense.objects.filter(
-        date__year=today.year, date__month=today.month
-    ).aggregate(total=Sum('amount'))['total'] or 0
-
-    # Upcoming: due vaccinations and deliveries
-    upcoming_vaccinations = VaccinationSchedule.objects.filter(
-        due_date__gte=today, completed=False
-    ).count()
-
-    upcoming_deliveries = BreedingRecord.objects.filter(
-        expected_delivery_date__gte=today, status__in=['P', 'C']
-    ).count()
-
-    overdue_tasks = Task.objects.filter(
-        due_date__lt=today, status__in=['P', 'IP']
-    ).count()
-
-    # FIX: 5 alag Goat queries → ek hi query mein sab counts (DB round-trips reduce)
-    from django.db.models import Case, When, IntegerField
-    goat_stats = Goat.objects.aggregate(
-        total=Count('id'),
-        active=Count(Case(When(status='A', then=1), output_field=IntegerField())),
-        pregnant=Count(Case(When(status='P', then=1), output_field=IntegerField())),
-        sold=Count(Case(When(status='S', then=1), output_field=IntegerField())),
-        dead=Count(Case(When(status='D', then=1), output_field=IntegerField())),
-    )
+    from .stats import aget_dashboard_stats
+    return await aget_dashboard_stats()
 
-    return {
-        # Goat counts — single optimized query
-        "total_goats": goat_stats['total'],
-        "active_goats": goat_stats['active'],
-        "pregnant_goats": goat_stats['pregnant'],
-        "sold_goats": goat_stats['sold'],
-        "dead_goats": goat_stats['dead'],
-        # Sales & expenses
-        "total_sales_count": Sale.objects.count(),
-        "total_expenses_count": Expense.objects.count(),
-        "total_milk_production_liters": round(total_milk, 2),
-        "total_revenue": round(total_revenue, 2),
-        "total_expenses": round(total_expenses, 2),
-        "net_profit": round(total_revenue - total_expenses, 2),
-        # This month
-        "this_month_revenue": round(this_month_revenue, 2),
-        "this_month_expenses": round(this_month_expenses, 2),
-        "this_month_profit": round(this_month_revenue - this_month_expenses, 2),
-        # Alerts
-        "upcoming_vaccinations": upcoming_vaccinations,
-        "upcoming_deliveries": upcoming_deliveries,
-        "overdue_tasks": overdue_tasks,
-        "unpaid_sales": Sale.objects.filter(payment_status='UP').count(),
-    }
 
-@api.get("/stats/monthly-income/", tags=["Stats"])
-def get_monthly_income(request, year: int, month: int):
-    """मासिक आय — aggregate use kiya"""
-    income = Sale.objects.filter(
+async def _month_total(model, field, year, month):
+    """Ek mahine ka Sum(field) — async ORM (aaggregate)."""
+    result = await model.objects.filter(
         date__year=year, date__month=month
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
+    ).aaggregate(total=Sum(field))
+    return result['total'] or 0
 
-    additional = AdditionalIncome.objects.filter(
-        date__year=year, date__month=month
-    ).aggregate(total=Sum('amount'))['total'] or 0
+
+@api.get("/stats/monthly-income/", tags=["Stats"])
+@decorate_view(conditional_resource(Sale, AdditionalIncome))
+async def get_monthly_income(request, year: int, month: int):
+    """मासिक आय — dono aggregates concurrently"""
+    income, additional = await asyncio.gather(
+        _month_total(Sale, 'total_amount', year, month),
+        _month_total(AdditionalIncome, 'amount', year, month),
+    )
 
     return {
         "year": year,
@@ -979,11 +972,10 @@ def get_monthly_income(request, year: int, month: int):
     }
 
 @api.get("/stats/monthly-expense/", tags=["Stats"])
-def get_monthly_expense(request, year: int, month: int):
+@decorate_view(conditional_resource(Expense))
+async def get_monthly_expense(request, year: int, month: int):
     """मासिक खर्च — aggregate use kiya"""
-    total = Expense.objects.filter(
-        date__year=year, date__month=month
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    total = await _month_total(Expense, 'amount', year, month)
 
     return {
         "year": year,
@@ -992,19 +984,14 @@ def get_monthly_expense(request, year: int, month: int):
     }
 
 @api.get("/stats/profit-loss/", tags=["Stats"])
-def get_profit_loss(request, year: int, month: int):
+@decorate_view(conditional_resource(Sale, AdditionalIncome, Expense))
+async def get_profit_loss(request, year: int, month: int):
     """Monthly Profit/Loss statement"""
-    income = Sale.objects.filter(
-        date__year=year, date__month=month
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
-
-    additional = AdditionalIncome.objects.filter(
-        date__year=year, date__month=month
-    ).aggregate(total=Sum('amount'))['total'] or 0
-
-    expense = Expense.objects.filter(
-        date__year=year, date__month=month
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    income, additional, expense = await asyncio.gather(
+        _month_total(Sale, 'total_amount', year, month),
+        _month_total(AdditionalIncome, 'amount', year, month),
+        _month_total(Expense, 'amount', year, month),
+    )
 
     total_income = income + additional
     profit = total_income - expense
@@ -1060,6 +1047,26 @@ def get_goat_stats(request, goat_id: int):
     }
 
 
+# ==================== SEARCH ENDPOINT ====================
+
+class SearchHitOut(Schema):
+    kind: str
+    id: int
+    title: str
+    snippet: str
+    score: float
+
+@api.get("/search/", response=List[SearchHitOut], tags=["Search"])
+@decorate_view(conditional_resource(*(spec[0] for spec in SEARCH_KINDS.values())))
+def global_search(request, q: str, kinds: str = None, limit: int = 20):
+    """
+    Type-ahead search — goats, customers, health records, documents.
+    kinds=goat,customer se filter karo. Prefix match: 'G-0' → G-001, G-002...
+    """
+    kind_list = [k.strip() for k in kinds.split(',')] if kinds else None
+    return search_index(q, kinds=kind_list, limit=max(1, min(limit, 100)))
+
+
 # ==================== NOTIFICATIONS ENDPOINTS ====================
 
 class NotificationOut(Schema):
@@ -1070,8 +1077,9 @@ class NotificationOut(Schema):
     created_at: datetime
 
 @api.get("/notifications/", response=List[NotificationOut], tags=["Notifications"])
+@decorate_view(conditional_resource(Notification))
 @paginate(PageNumberPagination)
-def list_notifications(request, unread_only: bool = False):
+async def list_notifications(request, unread_only: bool = False):
     """सूचनाएं — unread_only=true से सिर्फ न पढ़ी हुई"""
     qs = Notification.objects.all()
     if unread_only:
@@ -1090,6 +1098,7 @@ def mark_notification_read(request, notif_id: int):
 def mark_all_read(request):
     """सभी notifications को पढ़ा हुआ mark करें"""
     count = Notification.objects.filter(is_read=False).update(is_read=True)
+    touch(Notification)  # update() signal nahi bhejta — ETag invalidate karo
     return {"marked_read": count}
 
 
@@ -1215,49 +1224,107 @@ def get_goat_qr(request, goat_id: int):
     response['Content-Disposition'] = f'inline; filename="qr_{goat.tag_number}.png"'
     return response
 
-@api.get("/goats/qr-batch-pdf/", tags=["QR Code v6"])
-def get_batch_qr_pdf(request):
-    """Sab active goats ke QR codes ek PDF mein."""
-    from .qr_utils import generate_batch_qr_pdf, QR_AVAILABLE
-    from django.http import HttpResponse
-    
+@api.get("/goats/qr-batch-pdf/", response={202: dict, 400: dict}, tags=["QR Code v6"])
+def get_batch_qr_pdf(request, mode: str = None):
+    """
+    Sab active goats ke QR codes ek PDF mein.
+    Default: background job (run_worker) — turant job id, /api/jobs/{id}/ poll karo, DONE par download_url.
+    ?mode=stream: seedha PDF (bina JS wala link / worker nahi chal raha) — request ke andar banta hai.
+    """
+    from .qr_utils import QR_AVAILABLE
+    from .jobs import enqueue, job_payload
+
     if not QR_AVAILABLE:
-        return {"error": "qrcode install nahi hai. Run: pip install qrcode[pil]"}
-    
-    goats = Goat.objects.filter(status__in=['A', 'P']).order_by('tag_number')
+        return 400, {"error": "qrcode install nahi hai. Run: pip install qrcode[pil]"}
+
     base_url = request.build_absolute_uri('/').rstrip('/')
-    pdf_bytes = generate_batch_qr_pdf(list(goats), base_url)
-    
-    response = HttpResponse(pdf_bytes, content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="goat_qr_tags.pdf"'
-    return response
+    if mode == 'stream':
+        from django.http import HttpResponse
+        from .qr_utils import generate_batch_qr_pdf
+
+        goats = list(Goat.objects.filter(status__in=['A', 'P']).order_by('tag_number'))
+        response = HttpResponse(generate_batch_qr_pdf(goats, base_url), content_type='application/pdf')
+        response['Content-Disposition'] = 'attachment; filename="goat_qr_tags.pdf"'
+        return response
+    return 202, job_payload(enqueue('qr_batch_pdf', {'base_url': base_url}, request.user))
 
 
 # ==================== NOTIFICATION ENDPOINTS (v6.0 Batch 2) ====================
 
-@api.post("/notifications/send-vaccination-reminders/", tags=["Alerts v6"])
+# WhatsApp bhejna (Twilio, har customer ek HTTP call) lamba hai — job enqueue, result /api/jobs/{id}/ par
+# Outbox (farm/outbox.py) — ek hi din dobara trigger kiya to wahi alerts dobara nahi jaate
+
+@api.post("/notifications/send-vaccination-reminders/", response={202: dict}, tags=["Alerts v6"])
 def trigger_vaccination_reminders(request, days_ahead: int = 3):
-    """Vaccination due reminders bhejo (WhatsApp)."""
-    from .notifications import send_vaccination_reminders
-    results = send_vaccination_reminders(days_ahead)
-    return {"sent": len(results), "results": results}
+    """Vaccination due reminders bhejo (WhatsApp) — background job."""
+    from .jobs import enqueue, job_payload
+    return 202, job_payload(enqueue('reminders', {'reminder': 'vaccination', 'days_ahead': days_ahead}, request.user))
 
-@api.post("/notifications/send-delivery-reminders/", tags=["Alerts v6"])
+@api.post("/notifications/send-delivery-reminders/", response={202: dict}, tags=["Alerts v6"])
 def trigger_delivery_reminders(request, days_ahead: int = 2):
-    """Expected delivery reminders bhejo."""
-    from .notifications import send_delivery_reminders
-    results = send_delivery_reminders(days_ahead)
-    return {"sent": len(results), "results": results}
+    """Expected delivery reminders bhejo — background job."""
+    from .jobs import enqueue, job_payload
+    return 202, job_payload(enqueue('reminders', {'reminder': 'delivery', 'days_ahead': days_ahead}, request.user))
 
-@api.post("/notifications/send-payment-reminders/", tags=["Alerts v6"])
+@api.post("/notifications/send-payment-reminders/", response={202: dict}, tags=["Alerts v6"])
 def trigger_payment_reminders(request):
-    """Overdue payment reminders customers ko bhejo."""
-    from .notifications import send_overdue_payment_reminders
-    results = send_overdue_payment_reminders()
-    return {"sent": len(results), "results": results}
+    """Overdue payment reminders customers ko bhejo — background job."""
+    from .jobs import enqueue, job_payload
+    return 202, job_payload(enqueue('reminders', {'reminder': 'payment'}, request.user))
+
+@api.post("/notifications/send-daily-summary/", response={202: dict}, tags=["Alerts v6"])
+def trigger_daily_summary(request):
+    """Daily summary owner ko bhejo — background job (scheduler roz subah khud bhejta hai)."""
+    from .jobs import enqueue, job_payload
+    return 202, job_payload(enqueue('reminders', {'reminder': 'daily_summary'}, request.user))
 
 @api.get("/notifications/daily-summary/", tags=["Alerts v6"])
 def get_daily_summary(request):
-    """Daily farm summary."""
-    from .notifications import send_daily_summary
-    return send_daily_summary()
+    """Daily farm summary — sirf dekhna; bhejna POST send-daily-summary/ ya scheduler. status = aaj ka outbox status."""
+    from .notifications import build_daily_summary
+    from .outbox import statuses
+    summary, message = build_daily_summary()
+    row = statuses('daily_summary', [0]).get(0)
+    return {'summary': summary, 'message': message, 'status': row.status if row else None}
+
+
+# ==================== FEED STOCK ENDPOINTS ====================
+
+@api.get("/feed/stock-projection/", tags=["Feed Stock"])
+@decorate_view(conditional_resource(FeedInventory, FeedConsumption, per_day=True))
+def feed_stock_projection(request, threshold_days: int = None, cover_days: int = None):
+    """
+    Har feed: 7/30 din ka daily burn rate, stock kitne din chalega, stockout date, reorder quantity.
+    Ek grouped query (farm/feed_stock.py) — low-feed alerts bhi yahi use karte hain.
+    Defaults: settings.FEED_LOW_STOCK_DAYS / FEED_REORDER_COVER_DAYS.
+    """
+    from .feed_stock import project_stock
+    threshold_days = threshold_days or getattr(settings, 'FEED_LOW_STOCK_DAYS', 7)
+    cover_days = cover_days or getattr(settings, 'FEED_REORDER_COVER_DAYS', 30)
+    feeds = project_stock(threshold_days, cover_days)
+    return {
+        'as_of': date.today(),
+        'threshold_days': threshold_days,
+        'cover_days': cover_days,
+        'low_count': sum(1 for f in feeds if f['status'] in ('critical', 'low')),
+        'feeds': feeds,
+    }
+
+
+@api.post("/feed/consumption/bulk/", response={201: dict, 409: dict, 400: dict}, tags=["Feed Stock"])
+def record_feed_day(request, payload: FeedDayIn):
+    """
+    Poore din ki feeding ek saath — ek transaction, har feed ka ek conditional UPDATE (stock >= quantity).
+    Koi bhi feed kam pada to kuch save nahi hota, 409 mein sab shortfalls.
+    """
+    from django.core.exceptions import ValidationError
+    from .feed_stock import record_day
+    if not payload.items:
+        return 400, {"detail": "items khaali hai"}
+    if any(item.quantity <= 0 for item in payload.items):
+        return 400, {"detail": "Har item ki quantity 0 se zyada honi chahiye"}
+    try:
+        feeds = record_day(payload.date, [(item.feed_id, item.quantity) for item in payload.items])
+    except ValidationError as e:
+        return 409, {"detail": "Stock kam hai — kuch save nahi hua", "errors": e.messages}
+    return 201, {'date': payload.date, 'records': len(payload.items), 'feeds': feeds}
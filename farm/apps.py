@@ -4,3 +4,20 @@ class FarmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'farm'
     verbose_name = '🐐 Farm Management'
+
+    def ready(self):
+        # Table watermarks (ETag / Last-Modified) — save/delete signals se bump
+        from .watermarks import connect_signals
+        connect_signals()
+
+        # FTS5 search index sync (farm/search.py)
+        from .search import connect_signals as connect_search_signals
+        connect_search_signals()
+
+        # FeedConsumption delete → stock wapas (farm/feed_stock.py ledger)
+        from .feed_stock import connect_signals as connect_feed_stock_signals
+        connect_feed_stock_signals()
+
+        # SQLite pragmas (WAL, busy_timeout, ...) — har nayi connection par
+        from .sqlite_tuning import connect_signals as connect_sqlite_signals
+        connect_sqlite_signals()
@@ -0,0 +1,215 @@
+"""
+🐐 Streaming Backup Writer — v6.1
+Poora database RAM mein liye bina JSON / NDJSON backup seedha socket (ya file) par likho.
+
+Features:
+- iter_json_backup   → {"data": {...}, "meta": {...}} — purane backup jaisa format, restore compatible
+- iter_ndjson_backup → har line ek object (Django 'jsonl' jaisa) + pehli/aakhri line meta
+- streaming_response → StreamingHttpResponse; ASGI par async iterator (Django 4.2 sync iterator ko
+                       poora list() karke bhejta — memory flat nahi rehti)
+- iter_zip           → ZIP members generators se ek-ek karke — pehle bytes turant, memory bounded
+- write_backup_file  → same chunks seedha BACKUP_DIR ki file mein (scheduled backups) + prune_backups
+- Har model `.iterator(chunk_size=...)` se padha jaata hai — MilkProduction kitna bhi bada ho,
+  peak memory ek chunk jitni
+
+Querysets view mein hi DB alias par pin karo (analytics_reads response return hone ke baad
+khatam ho jaata hai, generator baad mein chalta hai):
+
+    querysets = pinned_querysets(ALL_MODELS)
+"""
+
+import os
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.core import serializers
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+BACKUP_VERSION = '6.1'
+DEFAULT_CHUNK_SIZE = 2000
+ZIP_FLUSH_BYTES = 256 * 1024  # itna compressed data jama ho to response mein bhej do
+
+json_encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+
+def pinned_querysets(models):
+    """
+    [(key, Model)] → [(key, queryset)] — abhi ke router decision (analytics / default) par pinned.
+    M2M fields prefetch hote hain, taaki serializer har object par alag query na kare.
+    """
+    result = []
+    for key, Model in models:
+        qs = Model.objects.all()
+        m2m = [f.name for f in Model._meta.many_to_many]
+        result.append((key, qs.using(qs.db).order_by('pk').prefetch_related(*m2m)))
+    return result
+
+
+def serialized_chunks(qs, chunk_size):
+    """Queryset → list-of-dicts chunks (Django 'python' serializer, jsonl/json jaisa shape)."""
+    batch = []
+    for obj in qs.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            yield serializers.serialize('python', batch)
+            batch = []
+    if batch:
+        yield serializers.serialize('python', batch)
+
+
+def _meta(querysets):
+    return {
+        'version': BACKUP_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'total_models': len(querysets),
+        'models': [key for key, _ in querysets],  # restore isi order se khaali models pehchanta hai
+    }
+
+
+def iter_json_backup(querysets, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Incremental JSON — str chunks yield karta hai.
+    Counts pehle pata nahi hote, isliye "meta" object "data" ke baad aata hai
+    (JSON mein key order matter nahi karta; restore sirf "data" padhta hai).
+    """
+    meta = _meta(querysets)
+    yield '{"data": {'
+    for i, (key, qs) in enumerate(querysets):
+        yield f'{"," if i else ""}\n{json_encoder.encode(key)}: ['
+        count = 0
+        try:
+            for rows in serialized_chunks(qs, chunk_size):
+                yield ('\n' if not count else ',\n') + ',\n'.join(json_encoder.encode(r) for r in rows)
+                count += len(rows)
+            meta[f'{key}_count'] = count
+        except Exception as e:
+            # Aadha model likha ja chuka hai — array band karo, error meta mein
+            meta[f'{key}_count'] = count
+            meta[f'{key}_error'] = str(e)
+        yield ']'
+    yield '\n},\n"meta": ' + json_encoder.encode(meta) + '}\n'
+
+
+def iter_ndjson_backup(querysets, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    NDJSON — pehli line {"meta": ...}, phir har object ek line
+    ({"model": "farm.goat", "pk": 1, "fields": {...}}), aakhri line {"meta": ...counts}.
+    """
+    meta = _meta(querysets)
+    yield json_encoder.encode({'meta': meta}) + '\n'
+    for key, qs in querysets:
+        count = 0
+        try:
+            for rows in serialized_chunks(qs, chunk_size):
+                yield ''.join(json_encoder.encode(r) + '\n' for r in rows)
+                count += len(rows)
+        except Exception as e:
+            meta[f'{key}_error'] = str(e)
+        meta[f'{key}_count'] = count
+    meta['complete'] = True
+    yield json_encoder.encode({'meta': meta}) + '\n'
+
+
+class _ZipSink:
+    """Non-seekable write target — zipfile data descriptors use karta hai, hum bytes nikaalte rehte hain."""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write(self, data):
+        self._buf += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pending(self) -> int:
+        return len(self._buf)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+def iter_zip(members, compression=zipfile.ZIP_DEFLATED):
+    """
+    [(name, chunks)] → ZIP bytes chunks. Har member ka `chunks` (str / bytes iterable)
+    tabhi padha jaata hai jab pichla member likh chuka ho.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', compression) as zf:
+        for name, chunks in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = compression
+            info.external_attr = 0o644 << 16
+            # Size pehle pata nahi — zip64 header taaki 2 GB se bade members bhi chal jaayein
+            with zf.open(info, 'w', force_zip64=True) as dest:
+                for chunk in chunks:
+                    dest.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                    if sink.pending() >= ZIP_FLUSH_BYTES:
+                        yield sink.drain()
+            if sink.pending():
+                yield sink.drain()
+    yield sink.drain()  # central directory
+
+
+def write_backup_file(chunks, path) -> int:
+    """
+    Chunks ko file mein likho (.tmp → os.replace, aadhi file kabhi backup jaisi na dikhe).
+    Returns: bytes written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    size = 0
+    try:
+        with open(tmp, 'wb') as fh:
+            for chunk in chunks:
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                fh.write(data)
+                size += len(data)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return size
+
+
+def prune_backups(directory, pattern, keep) -> list:
+    """Sirf latest `keep` backups rakho (mtime se). Returns: deleted paths."""
+    files = sorted(Path(directory).glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+    deleted = files[keep:] if keep > 0 else []
+    for old in deleted:
+        old.unlink()
+    return deleted
+
+
+async def _aiter_sync(chunks):
+    """Sync generator ko async iterator banao — har next() DB wale thread par (thread_sensitive)."""
+    sentinel = object()
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, sentinel)
+            if chunk is sentinel:
+                break
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def streaming_response(request, chunks, content_type, filename):
+    """Download response — WSGI par sync, ASGI par async streaming."""
+    content = (s.encode('utf-8') if isinstance(s, str) else s for s in chunks)
+    if isinstance(request, ASGIRequest):
+        content = _aiter_sync(content)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['X-Accel-Buffering'] = 'no'  # nginx proxy buffering band — chunks turant client tak
+    return response
@@ -0,0 +1,717 @@
+"""
+🐐 Bulk Import Engine — v6.1
+Excel / CSV uploads → database, row-by-row create() ke bina. 50k milk rows pehle ~100k queries
+(har row ek Goat.get + ek INSERT) thi — ab goat lookup ek query aur INSERTs BULK_BATCH ke chunks mein.
+
+Features:
+- Vectorised parsing → pandas poore column ek saath: dates (ISO / DD-MM-YYYY / DD/MM/YYYY), numbers
+                       (₹ aur comma hata ke), choices (code ya label — 'M' / 'Morning'), max_length
+- Goat lookup        → GoatResolver: file ke saare tags / naam ek baar mein (→ id map), per-row
+                       Goat.objects.get() nahi; ek naam ki kai bakriyan upfront 'ambiguous' report
+- Row errors         → har galat row ki wajah "Row N: ..." — baaki rows phir bhi import hoti hain
+- Duplicates         → unique keys (tag_number, goat + date + session, goat + date) file ke andar aur DB mein pehle hi pakde
+- Upsert mode        → mode='upsert': natural key par bulk_create(update_conflicts=True) — sudhari hui file
+                       dobara chalao, duplicate nahi banenge; sirf file wale columns update
+- Writes             → bulk_create (BULK_BATCH) ek transaction mein; model save() wale side effects
+                       (Sale total, goat sold) spec ke hooks mein; watermarks + search index baad mein
+- Two layouts        → SPECS (ExcelImporter templates) aur SHEET_SPECS (admin page / hamare exports ke headers)
+- Report             → success / failed / errors + seconds + rows_per_sec (+ ambiguous goat names)
+- Badi files         → import_chunks(): CSV / xlsx stream (chunksize / openpyxl read-only), har chunk
+                       commit + checkpoint; background job ('bulk_import') fail ho to wahin se resume
+
+    report = import_file(request.FILES['file'], 'milk')
+    # {'success': 49980, 'failed': 20, 'errors': ['Row 17: goat_tag 'G999' nahi mila', ...], 'rows_per_sec': ...}
+"""
+
+import gzip
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Goat, MilkProduction, Sale, HealthRecord, Expense, WeightRecord
+
+BULK_BATCH = 2000
+MAX_REPORTED_ERRORS = 200
+LOOKUP_CHUNK = 500          # SQLite ke 999 parameters limit se neeche
+DATE_FORMATS = ('ISO8601', '%d-%m-%Y', '%d/%m/%Y')
+MODES = ('insert', 'upsert')
+
+
+class ImportFileError(Exception):
+    """Poori file hi galat (columns missing, padh nahi paaye) — koi row import nahi hui."""
+
+
+# ==================== SPECS ====================
+
+@dataclass(frozen=True)
+class Field:
+    """
+    Sheet column (lowercase — read_frame headers lowercase karta hai) → model field.
+    kind: str / float / int / date / choice / goat (tag ya naam → goat_id). required=False + khaali cell → default.
+    """
+    column: str
+    attr: str
+    kind: str = 'str'
+    required: bool = True
+    default: object = None
+    choices: tuple = ()
+    min_value: Optional[float] = None
+    by_name: bool = False       # kind='goat': tag na mile to naam se bhi (admin sheets ka 'Goat' column)
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """
+    Ek model ka import. unique: natural key attrs (duplicate rows pakadne ke liye).
+    derive(frame): computed columns (e.g. Sale.total_amount). after(objs): bulk_create ke baad side effects.
+    """
+    key: str
+    model: type
+    fields: tuple
+    unique: tuple = ()
+    derive: Optional[Callable] = None
+    after: Optional[Callable] = None
+    label: str = ''
+
+
+def _sale_totals(frame):
+    # Sale.save() jaisa — total_amount hamesha quantity × price_per_unit
+    frame['total_amount'] = (frame['quantity'] * frame['price_per_unit']).round(2)
+
+
+def _mark_goats_sold(objs):
+    """Sale.save() jaisa — goat sale par goat status 'S'."""
+    from .watermarks import touch
+    sold = {o.goat_id for o in objs if o.sale_type == 'G' and o.goat_id}
+    if sold:
+        Goat.objects.filter(pk__in=sold).exclude(status='S').update(status='S')
+        touch(Goat)
+
+
+def _name_from_tag(frame):
+    # Admin sheet mein Name khaali → tag hi naam (purana importer bhi yahi karta tha)
+    frame['name'] = frame['name'].where(frame['name'].notna(), frame['tag_number'])
+
+
+SPECS = {spec.key: spec for spec in (
+    ImportSpec('goats', Goat, (
+        Field('tag_number', 'tag_number'),
+        Field('name', 'name'),
+        Field('breed', 'breed', 'choice', choices=tuple(Goat.BREED_CHOICES)),
+        Field('gender', 'gender', 'choice', choices=tuple(Goat.GENDER_CHOICES)),
+        Field('color', 'color'),
+        Field('date_of_birth', 'date_of_birth', 'date'),
+        Field('weight', 'weight', 'float', min_value=0),
+        Field('purchase_date', 'purchase_date', 'date'),
+        Field('purchase_price', 'purchase_price', 'float', min_value=0),
+        Field('status', 'status', 'choice', required=False, default='A', choices=tuple(Goat.STATUS_CHOICES)),
+    ), unique=('tag_number',), label='goats'),
+    ImportSpec('milk', MilkProduction, (
+        Field('goat_tag', 'goat_id', 'goat'),
+        Field('date', 'date', 'date'),
+        Field('session', 'session', 'choice', choices=tuple(MilkProduction.SESSION_CHOICES)),
+        Field('quantity', 'quantity', 'float', min_value=0),
+        Field('fat_percentage', 'fat_percentage', 'float', required=False, min_value=0),
+    ), unique=('goat_id', 'date', 'session'), label='milk records'),
+    ImportSpec('weight', WeightRecord, (
+        Field('goat_tag', 'goat_id', 'goat'),
+        Field('date', 'date', 'date'),
+        Field('weight', 'weight', 'float', min_value=0),
+    ), unique=('goat_id', 'date'), label='weight records'),
+    ImportSpec('sales', Sale, (
+        Field('sale_type', 'sale_type', 'choice', choices=tuple(Sale.SALE_TYPE_CHOICES)),
+        Field('goat_tag', 'goat_id', 'goat', required=False),
+        Field('date', 'date', 'date'),
+        Field('quantity', 'quantity', 'float', min_value=0),
+        Field('unit', 'unit'),
+        Field('price_per_unit', 'price_per_unit', 'float', min_value=0),
+        Field('buyer_name', 'buyer_name'),
+        Field('buyer_contact', 'buyer_contact', required=False, default=''),
+        Field('payment_status', 'payment_status', 'choice', required=False, default='P',
+              choices=tuple(Sale.PAYMENT_STATUS_CHOICES)),
+    ), derive=_sale_totals, after=_mark_goats_sold, label='sales records'),
+    ImportSpec('health', HealthRecord, (
+        Field('goat_tag', 'goat_id', 'goat'),
+        Field('record_type', 'record_type', 'choice', choices=tuple(HealthRecord.RECORD_TYPE_CHOICES)),
+        Field('date', 'date', 'date'),
+        Field('description', 'description'),
+        Field('medicine_used', 'medicine_used', required=False, default=''),
+        Field('dosage', 'dosage', required=False, default=''),
+        Field('cost', 'cost', 'float', required=False, default=0, min_value=0),
+        Field('veterinarian', 'veterinarian', required=False, default=''),
+        Field('next_due_date', 'next_due_date', 'date', required=False),
+    ), label='health records'),
+    ImportSpec('expenses', Expense, (
+        Field('date', 'date', 'date'),
+        Field('expense_type', 'expense_type', 'choice', choices=tuple(Expense.EXPENSE_TYPE_CHOICES)),
+        Field('description', 'description'),
+        Field('amount', 'amount', 'float', min_value=0),
+        Field('paid_to', 'paid_to'),
+        Field('payment_method', 'payment_method', 'choice', required=False, default='C',
+              choices=tuple(Expense.PAYMENT_METHOD_CHOICES)),
+    ), label='expense records'),
+)}
+
+# Admin import page — hamare export / complete workbook ke headers (lowercase). 'Goat' column mein naam
+# aata hai (tag bhi chalega); purane admin importer wale defaults yahan bhi.
+SHEET_SPECS = {spec.key: spec for spec in (
+    ImportSpec('goats', Goat, (
+        Field('tag number', 'tag_number'),
+        Field('name', 'name', required=False),
+        Field('breed', 'breed', 'choice', required=False, default='local', choices=tuple(Goat.BREED_CHOICES)),
+        Field('gender', 'gender', 'choice', choices=tuple(Goat.GENDER_CHOICES)),
+        Field('color', 'color', required=False, default='Brown'),
+        Field('dob', 'date_of_birth', 'date'),
+        Field('weight (kg)', 'weight', 'float', required=False, default=0, min_value=0),
+        Field('purchase date', 'purchase_date', 'date'),
+        Field('purchase price (₹)', 'purchase_price', 'float', required=False, default=0, min_value=0),
+        Field('status', 'status', 'choice', required=False, default='A', choices=tuple(Goat.STATUS_CHOICES)),
+    ), unique=('tag_number',), derive=_name_from_tag, label='goats'),
+    ImportSpec('health', HealthRecord, (
+        Field('goat', 'goat_id', 'goat', by_name=True),
+        Field('type', 'record_type', 'choice', choices=tuple(HealthRecord.RECORD_TYPE_CHOICES)),
+        Field('date', 'date', 'date'),
+        Field('description', 'description', required=False, default=''),
+        Field('medicine', 'medicine_used', required=False, default=''),
+        Field('dosage', 'dosage', required=False, default=''),
+        Field('cost (₹)', 'cost', 'float', required=False, default=0, min_value=0),
+        Field('veterinarian', 'veterinarian', required=False, default=''),
+        Field('next due date', 'next_due_date', 'date', required=False),
+    ), label='health records'),
+    ImportSpec('milk', MilkProduction, (
+        Field('goat', 'goat_id', 'goat', by_name=True),
+        Field('date', 'date', 'date'),
+        Field('session', 'session', 'choice', required=False, default='M',
+              choices=tuple(MilkProduction.SESSION_CHOICES)),
+        Field('quantity (l)', 'quantity', 'float', min_value=0),
+        Field('fat %', 'fat_percentage', 'float', required=False, min_value=0),
+    ), unique=('goat_id', 'date', 'session'), label='milk records'),
+    ImportSpec('weight', WeightRecord, (
+        Field('tag number', 'goat_id', 'goat'),
+        Field('date', 'date', 'date'),
+        Field('weight (kg)', 'weight', 'float', min_value=0),
+    ), unique=('goat_id', 'date'), label='weight records'),
+    ImportSpec('sales', Sale, (
+        Field('type', 'sale_type', 'choice', required=False, default='M', choices=tuple(Sale.SALE_TYPE_CHOICES)),
+        Field('goat', 'goat_id', 'goat', required=False, by_name=True),
+        Field('date', 'date', 'date'),
+        Field('quantity', 'quantity', 'float', min_value=0),
+        Field('unit', 'unit', required=False, default='L'),
+        Field('price per unit (₹)', 'price_per_unit', 'float', min_value=0),
+        Field('buyer', 'buyer_name', required=False, default='Unknown'),
+        Field('contact', 'buyer_contact', required=False, default=''),
+        Field('payment status', 'payment_status', 'choice', required=False, default='P',
+              choices=tuple(Sale.PAYMENT_STATUS_CHOICES)),
+    ), derive=_sale_totals, after=_mark_goats_sold, label='sales records'),
+    ImportSpec('expenses', Expense, (
+        Field('date', 'date', 'date'),
+        Field('type', 'expense_type', 'choice', required=False, default='F',
+              choices=tuple(Expense.EXPENSE_TYPE_CHOICES)),
+        Field('description', 'description', required=False, default=''),
+        Field('amount (₹)', 'amount', 'float', min_value=0),
+        Field('paid to', 'paid_to', required=False, default='Unknown'),
+        Field('payment method', 'payment_method', 'choice', required=False, default='C',
+              choices=tuple(Expense.PAYMENT_METHOD_CHOICES)),
+    ), label='expense records'),
+)}
+
+LAYOUTS = {'template': SPECS, 'sheet': SHEET_SPECS}
+
+
+# ==================== READING ====================
+
+IMPORT_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.csv.gz', '.parquet')
+
+
+def file_format(name) -> str:
+    """Filename → 'csv' / 'csv.gz' / 'parquet' / 'xlsx' (baaki sab Excel maana jaata hai)."""
+    name = str(name or '').lower()
+    if name.endswith('.csv.gz') or name.endswith('.gz'):
+        return 'csv.gz'
+    for fmt in ('csv', 'parquet'):
+        if name.endswith(f'.{fmt}'):
+            return fmt
+    return 'xlsx'
+
+
+def _lower_columns(df):
+    df.columns = [str(c).strip().lower() if c is not None else '' for c in df.columns]
+    return df
+
+
+def _as_text(df):
+    # read_excel(dtype=str) jaisa — dates '2024-01-31 00:00:00', numbers text; khaali None hi
+    return df.apply(lambda col: col.astype(object).where(col.notna(), None).map(str, na_action='ignore'))
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportFileError('Parquet ke liye pyarrow chahiye. Run: pip install pyarrow')
+    return pq
+
+
+def read_frame(file) -> pd.DataFrame:
+    """Upload → DataFrame (sab columns text; parsing engine karta hai). xlsx / csv / csv.gz / parquet."""
+    fmt = file_format(getattr(file, 'name', ''))
+    try:
+        if fmt in ('csv', 'csv.gz'):
+            source = gzip.GzipFile(fileobj=file) if fmt == 'csv.gz' else file
+            df = pd.read_csv(source, dtype=str, keep_default_na=False, na_values=[''], encoding='utf-8-sig')
+        elif fmt == 'parquet':
+            df = _as_text(_parquet().read_table(file).to_pandas())
+        else:
+            df = pd.read_excel(file, dtype=str)
+    except ImportFileError:
+        raise
+    except Exception as e:
+        raise ImportFileError(f"File padh nahi paaye: {e}")
+    return _lower_columns(df)
+
+
+def count_rows(path) -> Optional[int]:
+    """Data rows (header chhod ke) — progress % ke liye. xlsx mein dimension na likha ho to None."""
+    fmt = file_format(path)
+    if fmt in ('csv', 'csv.gz'):
+        lines, last = 0, b'\n'
+        with (gzip.open(path, 'rb') if fmt == 'csv.gz' else open(path, 'rb')) as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                lines += block.count(b'\n')
+                last = block[-1:]
+        return max(0, lines + (last != b'\n') - 1)
+    if fmt == 'parquet':
+        return _parquet().ParquetFile(path).metadata.num_rows
+    from openpyxl import load_workbook
+    book = load_workbook(path, read_only=True)
+    try:
+        rows = book.active.max_row
+        return None if rows is None else max(0, rows - 1)
+    finally:
+        book.close()
+
+
+def iter_frames(path, chunk_rows, skip=0):
+    """
+    Badi file → chunk_rows ke DataFrames (columns lowercase, cells text) — poori file memory mein nahi.
+    skip: itni data rows pehle hi ho chuki (resume). CSV / csv.gz: pandas chunksize; parquet: row batches;
+    xlsx: openpyxl read-only.
+    """
+    fmt = file_format(path)
+    try:
+        if fmt in ('csv', 'csv.gz'):
+            reader = pd.read_csv(
+                path, dtype=str, keep_default_na=False, na_values=[''], encoding='utf-8-sig',
+                chunksize=chunk_rows, skiprows=range(1, skip + 1),
+            )
+            for df in reader:
+                yield _lower_columns(df)
+        elif fmt == 'parquet':
+            yield from _parquet_frames(path, chunk_rows, skip)
+        else:
+            yield from _xlsx_frames(path, chunk_rows, skip)
+    except ImportFileError:
+        raise
+    except (ValueError, OSError, KeyError, EOFError) as e:
+        raise ImportFileError(f"File padh nahi paaye: {e}")
+
+
+def _parquet_frames(path, chunk_rows, skip):
+    for batch in _parquet().ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        if skip >= batch.num_rows:
+            skip -= batch.num_rows
+            continue
+        df = batch.slice(skip).to_pandas()
+        skip = 0
+        yield _lower_columns(_as_text(df))
+
+
+def _xlsx_frames(path, chunk_rows, skip):
+    from openpyxl import load_workbook
+    book = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = book.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = list(header)
+        for _ in range(skip):
+            if next(rows, None) is None:
+                return
+        while True:
+            batch = [row for _, row in zip(range(chunk_rows), rows)]
+            if not batch:
+                return
+            yield _lower_columns(_as_text(pd.DataFrame(batch, columns=columns, dtype=object)))
+    finally:
+        book.close()
+
+
+# ==================== VECTORISED PARSERS ====================
+
+def _text(series):
+    """Text column — NaN → None, baaki strip."""
+    s = series.astype(object).where(series.notna(), None)
+    stripped = s.str.strip()
+    return stripped.where(stripped != '', None)
+
+
+def _numbers(series):
+    cleaned = _text(series).str.replace(r'[₹,\s]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def _dates(series):
+    """ISO (Excel cells bhi isi roop mein aate hain), phir DD-MM-YYYY (hamara export), phir DD/MM/YYYY."""
+    text = _text(series)
+    parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    for fmt in DATE_FORMATS:
+        missing = parsed.isna() & text.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(text[missing], format=fmt, errors='coerce')
+    return parsed.dt.date.where(parsed.notna(), None)
+
+
+def choice_lookup(options):
+    """{code / label (lowercase): code} — 'M', 'm', 'Morning' sab → 'M'."""
+    lookup = {}
+    for code, label in options:
+        lookup[str(label).strip().lower()] = code
+    for code, _ in options:
+        lookup[str(code).lower()] = code
+    return lookup
+
+
+def _choices(series, options):
+    return _text(series).str.lower().map(choice_lookup(options))
+
+
+def _bad(column, raw, problem):
+    """Error message banane wala — sirf galat rows ke liye chalta hai, value ke saath."""
+    return lambda idx: f"{column} '{str(raw[idx]).strip()}' {problem}"
+
+
+class GoatResolver:
+    """
+    Ek upload ke saare goat references → goat_id, ek hi baar: file ki unique values ke chunks par
+    tag_number__in (by_name ho to | name__in), phir har row sirf dict lookup — per-row Goat.objects.get() nahi.
+    Tag pehle match hota hai. Ek naam ki kai bakriyan → ambiguous: woh rows import nahi, naam upfront report.
+    """
+
+    def __init__(self, values, by_name=False):
+        values = sorted({v for v in values if v})
+        chunk = LOOKUP_CHUNK // 2 if by_name else LOOKUP_CHUNK
+        by_tag, named = {}, {}
+        for i in range(0, len(values), chunk):
+            part = values[i:i + chunk]
+            cond = Q(tag_number__in=part) | Q(name__in=part) if by_name else Q(tag_number__in=part)
+            for pk, tag, name in Goat.objects.filter(cond).values_list('id', 'tag_number', 'name'):
+                by_tag[tag] = pk
+                named.setdefault(name, {})[pk] = tag
+        self.ambiguous = {}     # naam → [tags]
+        self.ids = {}           # tag / naam → goat_id
+        if by_name:
+            for name, goats in named.items():
+                if name in by_tag:
+                    continue
+                if len(goats) > 1:
+                    self.ambiguous[name] = sorted(goats.values())
+                else:
+                    self.ids[name] = next(iter(goats))
+        self.ids.update(by_tag)
+
+    def resolve(self, values: pd.Series) -> pd.Series:
+        return values.map(self.ids).astype('Int64')
+
+
+# ==================== ENGINE ====================
+
+class BulkImporter:
+    """
+    spec ke hisaab se DataFrame → validated columns → bulk_create.
+    prepare() aur write() alag hain taaki chunked import (ek chunk = ek transaction) bhi yahi use kare.
+    """
+
+    def __init__(self, spec, batch_size=BULK_BATCH, mode='insert'):
+        if mode not in MODES:
+            raise ImportFileError(f"Unknown import mode: {mode} (choose: {', '.join(MODES)})")
+        if mode == 'upsert' and not spec.unique:
+            raise ImportFileError(f"{spec.label} ke liye upsert nahi — natural key nahi hai, sirf insert")
+        self.spec = spec
+        self.batch_size = batch_size
+        self.mode = mode
+        self.ambiguous = {}     # prepare() bharta hai — goat naam → [tags]
+        self.present = set()    # file mein jo columns the (attrs) — upsert sirf inhe update karta hai
+        self.updated = 0        # upsert: DB mein pehle se thi, update hui (saare write() ka total)
+
+    def check_columns(self, columns):
+        missing = [f.column for f in self.spec.fields if f.required and f.column not in columns]
+        if missing:
+            raise ImportFileError(f"Columns missing: {', '.join(missing)}")
+
+    def prepare(self, df, first_row=2):
+        """
+        → (clean DataFrame sirf valid rows, model attrs ke naam se; errors [(row, msg)]).
+        first_row: df ki pehli row sheet mein kaunsi line hai (header = 1).
+        """
+        self.check_columns(df.columns)
+        self.present = {f.attr for f in self.spec.fields if f.column in df.columns}
+        rows = pd.Series(np.arange(first_row, first_row + len(df)), index=df.index)
+        clean = pd.DataFrame(index=df.index)
+        problems = []       # (bad mask, message text / fn(idx))
+        model_fields = {f.attname: f for f in self.spec.model._meta.concrete_fields}
+
+        for f in self.spec.fields:
+            raw = df[f.column] if f.column in df.columns else pd.Series(None, index=df.index, dtype=object)
+            given = _text(raw).notna()
+            if f.kind == 'str':
+                values = _text(raw)
+                limit = getattr(model_fields.get(f.attr), 'max_length', None)
+                if limit:
+                    problems.append((values.str.len() > limit, f"{f.column} {limit} characters se lamba"))
+            elif f.kind in ('float', 'int'):
+                values = _numbers(raw)
+                problems.append((given & values.isna(), _bad(f.column, raw, 'number nahi hai')))
+                if f.min_value is not None:
+                    problems.append((values < f.min_value, f"{f.column} {f.min_value} se kam nahi ho sakta"))
+            elif f.kind == 'date':
+                values = _dates(raw)
+                problems.append((given & values.isna(), _bad(f.column, raw, 'date nahi hai (DD-MM-YYYY ya YYYY-MM-DD)')))
+            elif f.kind == 'choice':
+                values = _choices(raw, f.choices)
+                allowed = '/'.join(code for code, _ in f.choices)
+                problems.append((given & values.isna(), _bad(f.column, raw, f'galat hai ({allowed})')))
+            elif f.kind == 'goat':
+                tags = _text(raw)
+                resolver = GoatResolver(tags.dropna().unique(), by_name=f.by_name)
+                values = resolver.resolve(tags)
+                if resolver.ambiguous:
+                    self.ambiguous.update(resolver.ambiguous)
+                    problems.append((tags.isin(list(resolver.ambiguous)),
+                                     _bad(f.column, tags, 'naam ki ek se zyada bakriyan hain — Tag Number likho')))
+                problems.append((given & values.isna(), _bad(f.column, tags, 'wali bakri nahi mili')))
+            else:
+                raise ValueError(f"Unknown field kind: {f.kind}")
+
+            missing = values.isna() & ~given
+            if f.required:
+                problems.append((missing, f"{f.column} khaali hai"))
+            elif f.default is not None:
+                values = values.astype(object).where(~missing, f.default)
+            clean[f.attr] = values
+
+        errors = {}
+        for mask, message in problems:
+            mask = mask.fillna(False).astype(bool)
+            for idx in mask[mask].index:
+                if idx not in errors:   # pehli galti hi report — ek row ki saari nahi
+                    errors[idx] = message if isinstance(message, str) else message(idx)
+
+        valid = ~df.index.isin(list(errors))
+        clean = clean[valid]
+        if self.spec.unique and len(clean):
+            for idx, message in self._duplicates(clean).items():
+                errors[idx] = message
+            clean = clean[~clean.index.isin(list(errors))]
+        if self.spec.derive and len(clean):
+            clean = clean.copy()
+            self.spec.derive(clean)
+        return clean, sorted((int(rows[i]), msg) for i, msg in errors.items())
+
+    def _duplicates(self, clean):
+        """
+        Unique key — file mein pehle aa chuki ya DB mein pehle se hai.
+        upsert: DB wali rows update hongi (error nahi); file mein dobara ho to aakhri row jeet-ti hai.
+        """
+        keys = list(self.spec.unique)
+        label = '/'.join(f.column for attr in keys for f in self.spec.fields if f.attr == attr)
+        found = {}
+        if self.mode == 'upsert':
+            repeated = clean.duplicated(subset=keys, keep='last')
+            for idx in repeated[repeated].index:
+                found[idx] = f"{label} file mein neeche dobara hai — aakhri row li gayi"
+            return found
+        repeated = clean.duplicated(subset=keys, keep='first')
+        for idx in repeated[repeated].index:
+            found[idx] = f"{label} file mein dobara hai"
+        existing = self._existing_keys(clean, keys)
+        if existing:
+            hit = pd.MultiIndex.from_frame(clean[keys]).isin(existing)
+            for idx in clean.index[hit]:
+                found.setdefault(idx, f"{label} pehle se database mein hai")
+        return found
+
+    def _existing_keys(self, clean, keys):
+        """File ki keys jo DB mein already hain — pehli key ke chunks (+ date range) par filter."""
+        model = self.spec.model
+        first = keys[0]
+        values = sorted(clean[first].dropna().unique().tolist(), key=str)
+        extra = {}
+        if 'date' in keys and 'date' != first:
+            extra = {'date__gte': clean['date'].min(), 'date__lte': clean['date'].max()}
+        existing = set()
+        for i in range(0, len(values), LOOKUP_CHUNK):
+            qs = model.objects.filter(**{f"{first}__in": values[i:i + LOOKUP_CHUNK]}, **extra)
+            existing.update(tuple(row) for row in qs.values_list(*keys))
+        return existing
+
+    def write(self, clean):
+        """
+        Valid rows → bulk_create chunks (ek transaction). Returns: likhi gayi objects.
+        upsert: bulk_create(update_conflicts=True) — natural key (spec.unique) takraye to file wale
+        columns update (INSERT ... ON CONFLICT DO UPDATE), warna naya row.
+        """
+        if not len(clean):
+            return []
+        records = clean.astype(object).where(clean.notna(), None).to_dict('records')
+        model = self.spec.model
+        objs = [model(**record) for record in records]
+        options = {}
+        if self.mode == 'upsert':
+            options = {
+                'update_conflicts': True,
+                'unique_fields': list(self.spec.unique),
+                'update_fields': self._update_fields(clean),
+            }
+            existing = self._existing_keys(clean, list(self.spec.unique))
+            if existing:
+                self.updated += int(pd.MultiIndex.from_frame(clean[list(self.spec.unique)]).isin(existing).sum())
+        with transaction.atomic():
+            created = model.objects.bulk_create(objs, batch_size=self.batch_size, **options)
+            if self.spec.after:
+                self.spec.after(created)
+        return created
+
+    def _update_fields(self, clean):
+        """File mein aaye columns (+ derive wale) — jo column file mein nahi, DB ki value rehti hai."""
+        attrs = {f.attr for f in self.spec.fields}
+        fields = [
+            c for c in clean.columns
+            if c not in self.spec.unique and (c in self.present or c not in attrs)
+        ]
+        if not fields:
+            raise ImportFileError("Upsert ke liye key ke alawa kam se kam ek column chahiye")
+        return fields
+
+    def run(self, df, started=None):
+        """started: perf_counter jab file padhna shuru hua — report ke seconds mein reading bhi aaye."""
+        started = time.perf_counter() if started is None else started
+        clean, errors = self.prepare(df)
+        created = self.write(clean)
+        finish_import(self.spec, created)
+        report = build_report(len(df), len(created), errors, time.perf_counter() - started)
+        report.update(ambiguous=self.ambiguous, updated=self.updated)
+        return report
+
+
+def finish_import(spec, created):
+    """bulk_create signals nahi bhejta — watermark aur search index khud."""
+    from .search import index_queryset
+    from .watermarks import touch
+
+    if not created:
+        return
+    touch(spec.model)
+    kind = {Goat: 'goat', HealthRecord: 'health'}.get(spec.model)
+    if kind:
+        ids = [o.pk for o in created]
+        if None in ids and len(spec.unique) == 1:
+            # update_conflicts par Django 4.2 pk set nahi karta — natural key se dhoondho
+            key = spec.unique[0]
+            values = [getattr(o, key) for o in created]
+            ids = []
+            for i in range(0, len(values), LOOKUP_CHUNK):
+                ids += spec.model.objects.filter(**{f"{key}__in": values[i:i + LOOKUP_CHUNK]}).values_list('pk', flat=True)
+        for i in range(0, len(ids), LOOKUP_CHUNK):
+            index_queryset(kind, spec.model.objects.filter(pk__in=ids[i:i + LOOKUP_CHUNK]))
+
+
+def build_report(total, success, errors, seconds):
+    return {
+        'success': success,
+        'failed': total - success,
+        'errors': [f"Row {row}: {msg}" for row, msg in errors[:MAX_REPORTED_ERRORS]],
+        'error_count': len(errors),
+        'rows': total,
+        'seconds': round(seconds, 2),
+        'rows_per_sec': round(total / seconds) if seconds else total,
+    }
+
+
+# ==================== CHUNKED (RESUMABLE) ====================
+
+def import_chunks(path, key, specs=None, state=None, chunk_rows=None, save=None, mode='insert'):
+    """
+    Badi file (disk par) chunk-by-chunk — har chunk prepare + bulk_create + save(state) ek transaction mein.
+    Beech mein fail ho to pichhle chunks committed rehte hain; state (checkpoint) se dobara wahin se shuru.
+
+    state: {'rows', 'success', 'errors', 'error_count', 'ambiguous', 'seconds'} — pichhla checkpoint ya None.
+    save(state): checkpoint persist karo (job.result) — chunk ke transaction ke andar, rows ke saath commit.
+    """
+    spec = (SPECS if specs is None else specs)[key]
+    chunk_rows = chunk_rows or getattr(settings, 'IMPORT_CHUNK_ROWS', 10000)
+    state = dict(state or {
+        'rows': 0, 'success': 0, 'updated': 0, 'errors': [], 'error_count': 0, 'ambiguous': {}, 'seconds': 0.0,
+    })
+    importer = BulkImporter(spec, mode=mode)
+    started = time.perf_counter()
+    for df in iter_frames(path, chunk_rows, skip=state['rows']):
+        clean, errors = importer.prepare(df, first_row=state['rows'] + 2)
+        with transaction.atomic():
+            importer.updated = 0
+            created = importer.write(clean)
+            state['rows'] += len(df)
+            state['success'] += len(created)
+            state['updated'] = state.get('updated', 0) + importer.updated
+            state['error_count'] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(state['errors'])
+            state['errors'] += [f"Row {row}: {msg}" for row, msg in errors[:max(0, room)]]
+            state['ambiguous'].update(importer.ambiguous)
+            state['seconds'] += time.perf_counter() - started
+            started = time.perf_counter()
+            if save:
+                save(state)
+        finish_import(spec, created)
+    state['seconds'] += time.perf_counter() - started
+    return chunked_report(state)
+
+
+def chunked_report(state):
+    report = build_report(state['rows'], state['success'], [], state['seconds'])
+    report.update(
+        errors=state['errors'], error_count=state['error_count'], ambiguous=state['ambiguous'],
+        updated=state.get('updated', 0),
+    )
+    return report
+
+
+def save_upload(file) -> str:
+    """Upload → MEDIA_ROOT/imports/<random>/<naam> (worker wahan se padhta hai). Returns: absolute path."""
+    name = Path(getattr(file, 'name', '') or 'upload.xlsx').name
+    folder = Path(settings.MEDIA_ROOT) / 'imports' / uuid.uuid4().hex
+    folder.mkdir(parents=True, exist_ok=True)
+    with open(folder / name, 'wb') as out:
+        for chunk in file.chunks():
+            out.write(chunk)
+    return str(folder / name)
+
+
+def import_file(file, key, specs=None, mode='insert'):
+    """
+    Upload (xlsx / csv / csv.gz / parquet) → report dict. File hi galat ho to ImportFileError.
+    specs: SPECS (template columns, default) ya SHEET_SPECS (hamare export / admin sheet headers).
+    mode: 'insert' (DB mein pehle se → row error) ya 'upsert' (natural key par update — sudhari file dobara chalao).
+    """
+    spec = (SPECS if specs is None else specs)[key]
+    started = time.perf_counter()
+    importer = BulkImporter(spec, mode=mode)
+    return importer.run(read_frame(file), started=started)
@@ -0,0 +1,95 @@
+"""
+🐐 Analytics DB Router — v6.1
+Heavy read-only reports (analytics, AI suggestions, backups, Excel exports) ko
+optional `analytics` database par bhejo, taaki milk-entry jaise live writes slow na hon.
+
+Features:
+- analytics_reads       → decorator / context manager; iske andar saare reads `analytics` par
+- AnalyticsRouter       → settings.DATABASE_ROUTERS; writes hamesha `default` par
+- analytics_available() → alias configured nahi / SQLite copy missing ya stale → `default` fallback
+
+`analytics` alias do tarah se (goat_farm/settings.py):
+- ANALYTICS_DATABASE_URL → read replica
+- ANALYTICS_SQLITE_COPY=True → db.sqlite3 ki read-only copy (`manage.py refresh_analytics_db`)
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+ANALYTICS_DB_ALIAS = 'analytics'
+_AVAILABILITY_TTL = 10  # seconds — har query par os.stat nahi
+
+_analytics_reads = ContextVar('farm_analytics_reads', default=False)
+_availability = {'checked_at': 0.0, 'available': False}
+
+
+def analytics_sqlite_path():
+    """SQLite copy ka file path (ANALYTICS_SQLITE_COPY mode mein), warna None."""
+    return getattr(settings, 'ANALYTICS_SQLITE_PATH', None)
+
+
+def analytics_available() -> bool:
+    """Alias configured hai aur (SQLite copy ho to) file maujood + fresh hai?"""
+    now = time.monotonic()
+    if now - _availability['checked_at'] < _AVAILABILITY_TTL:
+        return _availability['available']
+
+    available = ANALYTICS_DB_ALIAS in settings.DATABASES
+    path = analytics_sqlite_path()
+    if available and path:
+        try:
+            age = time.time() - os.path.getmtime(path)
+            available = age < getattr(settings, 'ANALYTICS_DB_MAX_AGE', 6 * 60 * 60)
+        except OSError:
+            available = False
+
+    _availability.update(checked_at=now, available=available)
+    return available
+
+
+def reset_availability():
+    """Copy refresh ke baad turant naya state padho."""
+    _availability['checked_at'] = 0.0
+
+
+@contextmanager
+def analytics_reads():
+    """
+    Decorator ya `with` block — andar ke ORM reads analytics DB par:
+
+        @analytics_reads()
+        def get_monthly_pl(year): ...
+    """
+    token = _analytics_reads.set(True)
+    try:
+        yield
+    finally:
+        _analytics_reads.reset(token)
+
+
+class AnalyticsRouter:
+    """settings.DATABASE_ROUTERS = ['farm.db_router.AnalyticsRouter']"""
+
+    def db_for_read(self, model, **hints):
+        if _analytics_reads.get() and analytics_available():
+            return ANALYTICS_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Analytics se padha object save ho to bhi write default par hi jaaye
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Dono aliases same data hain (replica / copy)
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica / copy ka schema source se aata hai
+        if db == ANALYTICS_DB_ALIAS:
+            return False
+        return None
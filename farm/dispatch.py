@@ -0,0 +1,271 @@
+"""
+🐐 Message Dispatch — v6.1
+WhatsApp / SMS bulk mein bhejna. Pehle har message ek naya Twilio Client (naya HTTP session, naya
+TLS handshake) aur sab ek ke baad ek — 500 payment reminders minutes leti thi.
+
+Features:
+- Shared client     → ek TwilioClient poore process mein; har worker thread ka apna keep-alive
+                       connection (HTTP/1.1), handshake thread ke pehle message par hi
+- Concurrency       → send_many(): bounded ThreadPoolExecutor (DISPATCH_MAX_WORKERS), process bhar ek hi pool
+- Rate limit        → har provider channel (whatsapp / sms) ka token bucket (DISPATCH_RATE_PER_SEC)
+- Retry + backoff   → 429 / 503 + Retry-After / request bhejne se pehle ka connection error (ya stale
+                       keep-alive connection) par exponential backoff + jitter, Retry-After maana jaata hai.
+                       Request jaane ke baad timeout ya baaki 5xx → retry nahi (duplicate message ho sakta hai):
+                       {'success': False, 'uncertain': True}
+- Demo mode         → credentials nahi → message log hota hai, {'demo': True} result (pehle jaisa)
+- Testable          → TWILIO_API_BASE kisi local fake server par point karo —
+                       python manage.py dispatch_benchmark (in-process fake Twilio) throughput dikhata hai
+
+    results = send_many([Message('+919876543210', 'Namaskar ...'), ...])
+    # [{'success': True, 'sid': 'SM...', 'attempts': 1}, ...]  — input ke order mein
+
+Setup in .env (credentials notifications.py wale hi):
+    TWILIO_ACCOUNT_SID / TWILIO_AUTH_TOKEN / TWILIO_WHATSAPP_FROM / TWILIO_SMS_FROM
+    TWILIO_API_BASE=https://api.twilio.com
+"""
+
+import base64
+import http.client
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# POST Messages.json idempotent nahi hai — sirf wahi statuses retry jinme message pakka accept nahi hua:
+# 429 (throttle) hamesha, 503 sirf Retry-After ke saath (overload / maintenance, request li hi nahi).
+# Baaki 5xx (500 / 502 / 504) edge se message accept hone ke baad bhi aa sakte hain → uncertain, retry nahi.
+RETRY_STATUSES = {429}
+RETRY_WITH_HEADER_STATUSES = {503}
+
+
+@dataclass
+class Message:
+    """Ek outgoing message. ref: caller ka apna id (credit / vaccination) — result mein wapas."""
+    to: str
+    body: str
+    channel: str = 'whatsapp'   # whatsapp / sms
+    ref: Optional[object] = None
+
+
+class RetryableError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ==================== RATE LIMIT ====================
+
+class RateLimiter:
+    """Token bucket — rate tokens/sec, burst tak jama. acquire() token milne tak rukta hai (thread-safe)."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# ==================== PROVIDER CLIENTS ====================
+
+class TwilioClient:
+    """
+    Twilio Messages REST API — seedha HTTP, SDK nahi (SDK har Client ke saath naya session banata hai).
+    Ek instance sab threads share karte hain; connection thread-local aur keep-alive.
+    """
+    provider = 'twilio'
+
+    def __init__(self, sid, token, base='https://api.twilio.com', whatsapp_from='', sms_from='', timeout=15):
+        parts = urlsplit(base)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = f"{parts.path.rstrip('/')}/2010-04-01/Accounts/{sid}/Messages.json"
+        self.auth = 'Basic ' + base64.b64encode(f"{sid}:{token}".encode()).decode()
+        self.senders = {'whatsapp': whatsapp_from, 'sms': sms_from}
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conn = self._local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def send(self, message: Message) -> dict:
+        to = message.to
+        if message.channel == 'whatsapp' and not to.startswith('whatsapp:'):
+            to = f"whatsapp:{to}"
+        body = urlencode({'From': self.senders.get(message.channel, ''), 'To': to, 'Body': message.body})
+        headers = {
+            'Authorization': self.auth,
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Accept': 'application/json',
+        }
+        reused = getattr(self._local, 'conn', None) is not None
+        try:
+            conn = self._connection()
+            conn.request('POST', self.path, body=body, headers=headers)
+        except (OSError, http.client.HTTPException) as e:
+            self._reset()   # request poori gayi hi nahi — agla attempt naye connection par, safe
+            raise RetryableError(f"connection: {e}")
+        try:
+            response = conn.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._reset()
+            if reused and isinstance(e, http.client.RemoteDisconnected):
+                # Idle keep-alive connection server pehle hi band kar chuka tha — request process nahi hui
+                raise RetryableError(f"stale connection: {e}")
+            # Request ja chuki (timeout / beech mein toota) — message shayad chala gaya. Dobara bheja to
+            # duplicate WhatsApp, isliye retry nahi: FAILED + uncertain, outbox bhi dobara nahi uthata
+            logger.warning(f"{message.channel} to {message.to}: no response after send: {e!r}")
+            return {'success': False, 'uncertain': True,
+                    'error': f"No response after send ({e!r}) — delivery unknown, not retried"}
+
+        retry_after = response.getheader('Retry-After')
+        if response.status in RETRY_STATUSES or (response.status in RETRY_WITH_HEADER_STATUSES and retry_after):
+            raise RetryableError(
+                f"HTTP {response.status}", float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+        try:
+            data = json.loads(payload or b'{}')
+        except ValueError:
+            data = {}
+        if 200 <= response.status < 300:
+            return {'success': True, 'sid': data.get('sid', '')}
+        error = data.get('message') or f"HTTP {response.status}"
+        if response.status >= 500:
+            return {'success': False, 'uncertain': True, 'error': f"{error} — delivery unknown, not retried"}
+        return {'success': False, 'error': error}
+
+
+class DemoClient:
+    """Credentials nahi — sirf log (purana demo mode)."""
+    provider = 'demo'
+
+    def send(self, message: Message) -> dict:
+        logger.info(f"[DEMO] {message.channel} to {message.to}: {message.body[:100]}...")
+        return {'success': False, 'error': 'Twilio not configured — demo mode', 'demo': True}
+
+
+# ==================== DISPATCHER ====================
+
+class Dispatcher:
+    """Shared client + per-channel rate limit + retry/backoff + bounded thread pool."""
+
+    def __init__(self, client, rate_per_sec=None, max_workers=None, max_retries=None, backoff=None):
+        self.client = client
+        rate = getattr(settings, 'DISPATCH_RATE_PER_SEC', 20) if rate_per_sec is None else rate_per_sec
+        self.limiters = {'whatsapp': RateLimiter(rate), 'sms': RateLimiter(rate)}
+        self.max_workers = max_workers or getattr(settings, 'DISPATCH_MAX_WORKERS', 8)
+        self.max_retries = getattr(settings, 'DISPATCH_MAX_RETRIES', 4) if max_retries is None else max_retries
+        self.backoff = getattr(settings, 'DISPATCH_BACKOFF_SECONDS', 0.5) if backoff is None else backoff
+        self._pool = None       # lazy, process bhar chalta hai — threads ke keep-alive connections bache rehte hain
+        self._pool_lock = threading.Lock()
+
+    def send_one(self, message: Message) -> dict:
+        limiter = self.limiters.get(message.channel) or self.limiters['whatsapp']
+        attempt = 0
+        while True:
+            attempt += 1
+            limiter.acquire()
+            try:
+                result = self.client.send(message)
+            except RetryableError as e:
+                if attempt > self.max_retries:
+                    logger.error(f"{message.channel} failed to {message.to} after {attempt} attempts: {e}")
+                    return {'success': False, 'error': str(e), 'attempts': attempt}
+                delay = e.retry_after if e.retry_after is not None else self.backoff * 2 ** (attempt - 1)
+                time.sleep(delay * random.uniform(0.8, 1.2))
+                continue
+            except Exception as e:
+                logger.error(f"{message.channel} failed to {message.to}: {e}")
+                return {'success': False, 'error': str(e), 'attempts': attempt}
+            result['attempts'] = attempt
+            return result
+
+    def send_many(self, messages) -> list:
+        """Sab messages concurrent — results input ke order mein."""
+        messages = list(messages)
+        if not messages:
+            return []
+        if len(messages) == 1 or isinstance(self.client, DemoClient):
+            return [self.send_one(m) for m in messages]
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='dispatch')
+        return list(self._pool.map(self.send_one, messages))
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def build_client():
+    sid = os.environ.get('TWILIO_ACCOUNT_SID', '')
+    token = os.environ.get('TWILIO_AUTH_TOKEN', '')
+    if not (sid and token):
+        return DemoClient()
+    return TwilioClient(
+        sid, token,
+        base=os.environ.get('TWILIO_API_BASE', 'https://api.twilio.com'),
+        whatsapp_from=os.environ.get('TWILIO_WHATSAPP_FROM', 'whatsapp:+14155238886'),
+        sms_from=os.environ.get('TWILIO_SMS_FROM', ''),
+    )
+
+
+def get_dispatcher() -> Dispatcher:
+    """Process-wide dispatcher (lazy) — ek hi client aur rate limiters sab reminders share karte hain."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = Dispatcher(build_client())
+    return _dispatcher
+
+
+def reset_dispatcher(dispatcher=None):
+    """Env / settings badle (ya benchmark ka fake server) — naya dispatcher."""
+    global _dispatcher
+    with _dispatcher_lock:
+        _dispatcher = dispatcher
+
+
+def send_many(messages) -> list:
+    return get_dispatcher().send_many(messages)
+
+
+def send_one(message: Message) -> dict:
+    return get_dispatcher().send_one(message)
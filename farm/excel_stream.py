@@ -0,0 +1,314 @@
+"""
+🐐 Streaming Excel Writer — v6.1
+Styled .xlsx exports (lakhon rows) seconds mein, memory bounded — poori sheet RAM mein nahi banti.
+
+Features:
+- Skeleton     → openpyxl `Workbook(write_only=True)` — workbook.xml, styles.xml, docProps wahi likhta hai
+- Named styles → har style ek baar register (NamedStyle), har cell sirf uska xf id (s="..") — per-cell
+                 Font / Fill / Border objects nahi
+- Rows         → sheet XML seedha temp file mein stream (openpyxl ka per-cell writer 500k rows par
+                 ~1 min leta hai); strings inline (<is>), shared-strings table memory mein nahi badhti
+- Title first  → title / header pehle likhe jaate hain — insert_rows() se saari cells shift nahi hoti
+- Auto width   → rows stream hote waqt har column ki max length; save par <cols> sheetData se pehle
+                 jod di jaati hai
+
+    book = StreamingWorkbook(FARM_STYLES)
+    ws = book.create_sheet("🥛 Milk")
+    ws.title_row("🥛 MILK — Total: 1234 L", span=6, style='farm_title')
+    ws.header_row(['Goat', 'Date', ...], style='farm_hdr_green')
+    ws.body_rows(rows, ('farm_body_even', 'farm_body_odd'), {4: ('farm_num_even', 'farm_num_odd')})
+    ws.freeze_panes = 'A3'
+    book.save(path_or_fileobj)
+"""
+
+import copy
+import io
+import math
+import shutil
+import tempfile
+import zipfile
+from decimal import Decimal
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+
+FLUSH_ROWS = 1000
+STRING_CACHE = 20000      # escaped string fragments per body_rows() call
+DEFAULT_ROW_HEIGHT = 16
+
+# XML escape + Excel-illegal control characters (openpyxl inhe IllegalCharacterError deta hai) ek pass mein
+_XML_TABLE = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;'}
+_XML_TABLE.update({c: None for c in (*range(0, 9), 11, 12, *range(14, 32))})
+
+
+def _string_fragment(value):
+    """String cell ka `s=".."` ke baad wala hissa + display length. Khaali string → sirf styled cell."""
+    if not value:
+        return '/>', 0
+    text = value.translate(_XML_TABLE)
+    space = ' xml:space="preserve"' if text[:1].isspace() or text[-1:].isspace() else ''
+    return f' t="inlineStr"><is><t{space}>{text}</t></is></c>', len(value)
+
+
+def _cell_xml(ref, sid, value):
+    """Ek cell → (xml, display length). Strings inline; numbers <v>; bool t="b"."""
+    if value is None:
+        return f'<c r="{ref}" s="{sid}"/>', 0
+    if isinstance(value, str):
+        fragment, length = _string_fragment(value)
+        return f'<c r="{ref}" s="{sid}"{fragment}', length
+    if isinstance(value, bool):
+        return f'<c r="{ref}" s="{sid}" t="b"><v>{int(value)}</v></c>', 5
+    if isinstance(value, (int, float, Decimal)) and not (isinstance(value, float) and not math.isfinite(value)):
+        text = str(value)
+        return f'<c r="{ref}" s="{sid}"><v>{text}</v></c>', len(text)
+    return _cell_xml(ref, sid, str(value))
+
+
+class StreamingSheet:
+    """Ek worksheet — rows upar se neeche, ek hi baar (write-only)."""
+
+    def __init__(self, book, ws):
+        self.book = book
+        self.ws = ws
+        self.freeze_panes = None
+        self.min_width, self.max_width = 8, 40
+        self._rows = 0
+        self._max_col = 0
+        self._widths = {}      # col → max display length (auto)
+        self._fixed = {}       # col → width (set_width)
+        self._merges = []
+        self._letters = []
+        self._tmp = tempfile.TemporaryFile()
+        self._pending = []
+
+    @property
+    def title(self):
+        return self.ws.title
+
+    @property
+    def max_row(self):
+        return self._rows
+
+    # ── Low-level ──
+
+    def _letter(self, col):
+        while len(self._letters) < col:
+            self._letters.append(get_column_letter(len(self._letters) + 1))
+        return self._letters[col - 1]
+
+    def _emit(self, xml):
+        self._pending.append(xml)
+        if len(self._pending) >= FLUSH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._tmp.write(''.join(self._pending).encode('utf-8'))
+            self._pending = []
+
+    def row(self, cells, height=None, measure=True):
+        """
+        cells: [(value, style), ...] — style: named style, (name, number_format) ya None (default).
+        Free-form rows (summary, totals).
+        measure=False: auto width mein gino mat (merged titles).
+        """
+        self._rows += 1
+        r = self._rows
+        attrs = f' ht="{height}" customHeight="1"' if height else ''
+        parts = [f'<row r="{r}"{attrs}>']
+        for col, (value, style) in enumerate(cells, 1):
+            if value is None and style is None:
+                continue
+            sid = self.book.style_id(*style) if isinstance(style, tuple) else self.book.style_id(style)
+            xml, length = _cell_xml(f"{self._letter(col)}{r}", sid, value)
+            parts.append(xml)
+            if measure and length > self._widths.get(col, 0):
+                self._widths[col] = length
+        parts.append('</row>')
+        self._max_col = max(self._max_col, len(cells))
+        self._emit(''.join(parts))
+
+    def blank_row(self):
+        self._rows += 1
+
+    def merge(self, ref):
+        self._merges.append(ref)
+
+    def set_width(self, col, width):
+        """Fixed width (auto width ko override karta hai). col: 1-based index ya letter."""
+        self._fixed[col if isinstance(col, int) else column_index_from_string(col)] = width
+
+    # ── Table helpers ──
+
+    def title_row(self, text, span, style, height=26):
+        """Full-width title — span columns par merged."""
+        self.row([(text, style)] + [(None, style)] * (span - 1), height=height, measure=False)
+        self.merge(f"A{self._rows}:{self._letter(span)}{self._rows}")
+
+    def header_row(self, headers, style, height=22):
+        self.row([(h, style) for h in headers], height=height)
+
+    def body_rows(self, rows, styles, column_styles=None) -> int:
+        """
+        Fast path — har row ek list of values. styles: (even, odd) alternating fill,
+        pehli data row 'even'. column_styles: {col (1-based): (even, odd)} e.g. money columns.
+        Returns: likhi gayi rows.
+        """
+        column_styles = column_styles or {}
+        ids = {}
+        for parity, name in enumerate(styles):
+            default = self.book.style_id(name)
+            ids[parity] = [
+                self.book.style_id(column_styles[col][parity]) if col in column_styles else default
+                for col in range(1, max(self._max_col, *column_styles, 1) + 1)
+            ]
+        widths = self._widths
+        strings = {}
+        count = 0
+        letters = self._letters
+        for values in rows:
+            self._rows += 1
+            r = self._rows
+            if len(values) > len(letters):
+                self._letter(len(values))
+            sids = ids[count % 2]
+            if len(values) > len(sids):
+                for parity, name in enumerate(styles):
+                    ids[parity] += [self.book.style_id(name)] * (len(values) - len(ids[parity]))
+            parts = [f'<row r="{r}">']
+            for i, value in enumerate(values):
+                if value.__class__ is str:
+                    # Sabse aam case inline + cache (goat names, sessions, dates baar-baar aate hain)
+                    hit = strings.get(value)
+                    if hit is None:
+                        hit = _string_fragment(value)
+                        if len(strings) < STRING_CACHE:
+                            strings[value] = hit
+                    xml = f'<c r="{letters[i]}{r}" s="{sids[i]}"{hit[0]}'
+                    length = hit[1]
+                else:
+                    xml, length = _cell_xml(f"{letters[i]}{r}", sids[i], value)
+                parts.append(xml)
+                if length > widths.get(i + 1, 0):
+                    widths[i + 1] = length
+            parts.append('</row>')
+            self._emit(''.join(parts))
+            if len(values) > self._max_col:
+                self._max_col = len(values)
+            count += 1
+        return count
+
+    # ── Save ──
+
+    def _head_xml(self):
+        last = f"{self._letter(max(self._max_col, 1))}{max(self._rows, 1)}"
+        pane = ''
+        if self.freeze_panes:
+            col_letter, row = coordinate_from_string(self.freeze_panes)
+            xs, ys = column_index_from_string(col_letter) - 1, row - 1
+            split = (f' xSplit="{xs}"' if xs else '') + (f' ySplit="{ys}"' if ys else '')
+            active = 'bottomRight' if xs and ys else ('bottomLeft' if ys else 'topRight')
+            pane = (f'<pane{split} topLeftCell="{self.freeze_panes}" activePane="{active}" state="frozen"/>'
+                    f'<selection pane="{active}" activeCell="{self.freeze_panes}" sqref="{self.freeze_panes}"/>')
+        cols = []
+        for col in sorted(set(self._widths) | set(self._fixed)):
+            width = self._fixed.get(col)
+            if width is None:
+                width = min(max(self._widths[col] + 3, self.min_width), self.max_width)
+            cols.append(f'<col min="{col}" max="{col}" width="{width}" customWidth="1"/>')
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<dimension ref="A1:{last}"/>'
+            f'<sheetViews><sheetView workbookViewId="0">{pane}</sheetView></sheetViews>'
+            f'<sheetFormatPr defaultRowHeight="{DEFAULT_ROW_HEIGHT}" customHeight="1"/>'
+            + (f'<cols>{"".join(cols)}</cols>' if cols else '')
+            + '<sheetData>'
+        ).encode('utf-8')
+
+    def _tail_xml(self):
+        merges = ''.join(f'<mergeCell ref="{ref}"/>' for ref in self._merges)
+        return (
+            '</sheetData>'
+            + (f'<mergeCells count="{len(self._merges)}">{merges}</mergeCells>' if merges else '')
+            + '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+            '</worksheet>'
+        ).encode('utf-8')
+
+    def write_to(self, out):
+        """Sheet XML: head (cols ke saath) + streamed rows + tail."""
+        self._flush()
+        out.write(self._head_xml())
+        self._tmp.seek(0)
+        shutil.copyfileobj(self._tmp, out, 1024 * 1024)
+        out.write(self._tail_xml())
+
+    def close(self):
+        self._tmp.close()
+
+
+class StreamingWorkbook:
+    """Write-only workbook — create_sheet() → rows → save(). Save sirf ek baar."""
+
+    def __init__(self, named_styles=(), title='', creator=''):
+        self.wb = Workbook(write_only=True)
+        self.wb.properties.title = title
+        self.wb.properties.creator = creator
+        self._named = {}
+        for style in named_styles:
+            style = copy.deepcopy(style)  # NamedStyle ek workbook se bind hota hai — module-level list reuse ho sake
+            self.wb.add_named_style(style)
+            self._named[style.name] = style
+        self._sheets = []
+        self._style_ids = {}
+
+    @property
+    def sheetnames(self):
+        return [s.title for s in self._sheets]
+
+    def create_sheet(self, title, index=None) -> StreamingSheet:
+        ws = self.wb.create_sheet(title, index)
+        sheet = StreamingSheet(self, ws)
+        self._sheets.insert(len(self._sheets) if index is None else index, sheet)
+        return sheet
+
+    def style_id(self, name, number_format=None) -> int:
+        """Named style (+ optional number format) → cellXfs index. Cached — har style ek hi xf."""
+        key = (name, number_format)
+        if key not in self._style_ids:
+            if name is None and number_format is None:
+                self._style_ids[key] = 0
+            else:
+                cell = WriteOnlyCell(self.wb.worksheets[0])
+                if name is not None:
+                    cell.style = name
+                if number_format:
+                    cell.number_format = number_format
+                self._style_ids[key] = cell.style_id
+        return self._style_ids[key]
+
+    def save(self, target, compresslevel=1):
+        """
+        target: path ya binary file object. openpyxl skeleton (khaali sheets) memory mein,
+        phir har sheet ki XML uski jagah — ZIP member stream hota hai (force_zip64, koi size limit nahi).
+        """
+        skeleton = io.BytesIO()
+        self.wb.save(skeleton)
+        paths = {s.ws.path.lstrip('/'): s for s in self._sheets}
+        try:
+            with zipfile.ZipFile(skeleton) as src, \
+                    zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as dst:
+                for info in src.infolist():
+                    sheet = paths.get(info.filename)
+                    if sheet is None:
+                        dst.writestr(info, src.read(info))
+                        continue
+                    with dst.open(info.filename, 'w', force_zip64=True) as out:
+                        sheet.write_to(out)
+        finally:
+            for sheet in self._sheets:
+                sheet.close()
@@ -1,7 +1,6 @@
+import gzip
 import pandas as pd
-from datetime import datetime
-from django.db import transaction
-from .models import Goat, MilkProduction, Sale, HealthRecord, Expense
+from .bulk_import import SPECS, ImportFileError, import_file
 import io
 
 class ExcelImportError(Exception):
@@ -9,236 +8,77 @@ class ExcelImportError(Exception):
     pass
 
 class ExcelImporter:
-    """Handle Excel file imports for various models"""
+    """Handle Excel / CSV file imports for various models — farm/bulk_import.py engine (vectorised + bulk_create)"""
 
     @staticmethod
-    def import_goats(file):
+    def _run(file, key, mode='insert'):
+        try:
+            return import_file(file, key, mode=mode)
+        except ImportFileError as e:
+            raise ExcelImportError(f"Error importing {SPECS[key].label}: {e}")
+
+    @staticmethod
+    def import_goats(file, mode='insert'):
         """
         Import Goats from Excel file
         Expected columns: tag_number, name, breed, gender, color, date_of_birth, 
                         weight, purchase_date, purchase_price, status
+        mode='upsert': tag_number pehle se ho to goat update
         """
-        try:
-            df = pd.read_excel(file)
-            df = df.fillna('')
-            
-            results = {
-                'success': 0,
-                'failed': 0,
-                'errors': []
-            }
-
-            with transaction.atomic():
-                for idx, row in df.iterrows():
-                    try:
-                        goat = Goat.objects.create(
-                            tag_number=str(row['tag_number']).strip(),
-                            name=str(row['name']).strip(),
-                            breed=str(row['breed']).strip(),
-                            gender=str(row['gender']).strip(),
-                            color=str(row['color']).strip(),
-                            date_of_birth=pd.to_datetime(row['date_of_birth']).date(),
-                            weight=float(row['weight']),
-                            purchase_date=pd.to_datetime(row['purchase_date']).date(),
-                            purchase_price=float(row['purchase_price']),
-                            status=str(row.get('status', 'A')).strip()
-                        )
-                        results['success'] += 1
-                    except Exception as e:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: {str(e)}")
-
-            return results
-
-        except Exception as e:
-            raise ExcelImportError(f"Error importing goats: {str(e)}")
+        return ExcelImporter._run(file, 'goats', mode)
 
     @staticmethod
-    def import_milk_production(file):
+    def import_milk_production(file, mode='insert'):
         """
         Import Milk Production records from Excel
         Expected columns: goat_tag, date, session, quantity, fat_percentage
+        mode='upsert': (goat_tag, date, session) pehle se ho to update
         """
-        try:
-            df = pd.read_excel(file)
-            df = df.fillna('')
-            
-            results = {
-                'success': 0,
-                'failed': 0,
-                'errors': []
-            }
-
-            with transaction.atomic():
-                for idx, row in df.iterrows():
-                    try:
-                        goat = Goat.objects.get(tag_number=str(row['goat_tag']).strip())
-                        
-                        MilkProduction.objects.create(
-                            goat=goat,
-                            date=pd.to_datetime(row['date']).date(),
-                            session=str(row['session']).strip().upper()[0],  # M or E
-                            quantity=float(row['quantity']),
-                            fat_percentage=float(row.get('fat_percentage', 0)) or None
-                        )
-                        results['success'] += 1
-                    except Goat.DoesNotExist:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: Goat '{row['goat_tag']}' not found")
-                    except Exception as e:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: {str(e)}")
+        return ExcelImporter._run(file, 'milk', mode)
 
-            return results
-
-        except Exception as e:
-            raise ExcelImportError(f"Error importing milk production: {str(e)}")
+    @staticmethod
+    def import_weight_records(file, mode='insert'):
+        """
+        Import Weight Records from Excel
+        Expected columns: goat_tag, date, weight
+        mode='upsert': (goat_tag, date) pehle se ho to weight update
+        """
+        return ExcelImporter._run(file, 'weight', mode)
 
     @staticmethod
-    def import_sales(file):
+    def import_sales(file, mode='insert'):
         """
         Import Sales records from Excel
-        Expected columns: sale_type, date, quantity, unit, price_per_unit, 
-                        total_amount, buyer_name, buyer_contact, payment_status
+        Expected columns: sale_type, goat_tag, date, quantity, unit, price_per_unit,
+                        buyer_name, buyer_contact, payment_status
+        (total_amount = quantity × price_per_unit, Sale.save() jaisa)
         """
-        try:
-            df = pd.read_excel(file)
-            df = df.fillna('')
-            
-            results = {
-                'success': 0,
-                'failed': 0,
-                'errors': []
-            }
-
-            with transaction.atomic():
-                for idx, row in df.iterrows():
-                    try:
-                        goat_id = None
-                        if row.get('goat_tag'):
-                            try:
-                                goat = Goat.objects.get(tag_number=str(row['goat_tag']).strip())
-                                goat_id = goat.id
-                            except Goat.DoesNotExist:
-                                pass
-
-                        Sale.objects.create(
-                            sale_type=str(row['sale_type']).strip(),
-                            goat_id=goat_id,
-                            date=pd.to_datetime(row['date']).date(),
-                            quantity=float(row['quantity']),
-                            unit=str(row['unit']).strip(),
-                            price_per_unit=float(row['price_per_unit']),
-                            total_amount=float(row['total_amount']),
-                            buyer_name=str(row['buyer_name']).strip(),
-                            buyer_contact=str(row.get('buyer_contact', '')).strip(),
-                            payment_status=str(row.get('payment_status', 'P')).strip()
-                        )
-                        results['success'] += 1
-                    except Exception as e:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: {str(e)}")
-
-            return results
-
-        except Exception as e:
-            raise ExcelImportError(f"Error importing sales: {str(e)}")
+        return ExcelImporter._run(file, 'sales', mode)
 
     @staticmethod
-    def import_health_records(file):
+    def import_health_records(file, mode='insert'):
         """
         Import Health Records from Excel
         Expected columns: goat_tag, record_type, date, description, 
                         medicine_used, dosage, cost, veterinarian, next_due_date
         """
-        try:
-            df = pd.read_excel(file)
-            df = df.fillna('')
-            
-            results = {
-                'success': 0,
-                'failed': 0,
-                'errors': []
-            }
-
-            with transaction.atomic():
-                for idx, row in df.iterrows():
-                    try:
-                        goat = Goat.objects.get(tag_number=str(row['goat_tag']).strip())
-                        
-                        next_due = None
-                        if row.get('next_due_date'):
-                            next_due = pd.to_datetime(row['next_due_date']).date()
-                        
-                        HealthRecord.objects.create(
-                            goat=goat,
-                            record_type=str(row['record_type']).strip()[0].upper(),
-                            date=pd.to_datetime(row['date']).date(),
-                            description=str(row['description']).strip(),
-                            medicine_used=str(row.get('medicine_used', '')).strip(),
-                            dosage=str(row.get('dosage', '')).strip(),
-                            cost=float(row.get('cost', 0)),
-                            veterinarian=str(row.get('veterinarian', '')).strip(),
-                            next_due_date=next_due
-                        )
-                        results['success'] += 1
-                    except Goat.DoesNotExist:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: Goat '{row['goat_tag']}' not found")
-                    except Exception as e:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: {str(e)}")
-
-            return results
-
-        except Exception as e:
-            raise ExcelImportError(f"Error importing health records: {str(e)}")
+        return ExcelImporter._run(file, 'health', mode)
 
     @staticmethod
-    def import_expenses(file):
+    def import_expenses(file, mode='insert'):
         """
         Import Expense records from Excel
         Expected columns: date, expense_type, description, amount, paid_to, payment_method
         """
-        try:
-            df = pd.read_excel(file)
-            df = df.fillna('')
-            
-            results = {
-                'success': 0,
-                'failed': 0,
-                'errors': []
-            }
-
-            with transaction.atomic():
-                for idx, row in df.iterrows():
-                    try:
-                        Expense.objects.create(
-                            date=pd.to_datetime(row['date']).date(),
-                            expense_type=str(row['expense_type']).strip()[0].upper(),
-                            description=str(row['description']).strip(),
-                            amount=float(row['amount']),
-                            paid_to=str(row['paid_to']).strip(),
-                            payment_method=str(row.get('payment_method', 'C')).strip()[0].upper()
-                        )
-                        results['success'] += 1
-                    except Exception as e:
-                        results['failed'] += 1
-                        results['errors'].append(f"Row {idx + 2}: {str(e)}")
-
-            return results
-
-        except Exception as e:
-            raise ExcelImportError(f"Error importing expenses: {str(e)}")
+        return ExcelImporter._run(file, 'expenses', mode)
 
 
 class ExcelExporter:
     """Handle Excel file exports for various models"""
 
-    @staticmethod
-    def export_goats_template():
-        """Export empty Goat template"""
-        data = {
+    # key → (sheet name, sample rows) — import templates (bulk_import.SPECS ke columns)
+    TEMPLATES = {
+        'goats': ('Goats', {
             'tag_number': ['G001', 'G002'],
             'name': ['Laila', 'Nisha'],
             'breed': ['Saanen', 'Alpine'],
@@ -249,33 +89,20 @@ class ExcelExporter:
             'purchase_date': ['2024-01-15', '2023-06-20'],
             'purchase_price': [5000, 4500],
             'status': ['A', 'A']
-        }
-        df = pd.DataFrame(data)
-        output = io.BytesIO()
-        df.to_excel(output, index=False, sheet_name='Goats')
-        output.seek(0)
-        return output
-
-    @staticmethod
-    def export_milk_template():
-        """Export empty Milk Production template"""
-        data = {
+        }),
+        'milk': ('Milk', {
             'goat_tag': ['G001', 'G001'],
             'date': ['2026-02-17', '2026-02-17'],
             'session': ['M', 'E'],
             'quantity': [2.5, 2.0],
             'fat_percentage': [4.2, 4.0]
-        }
-        df = pd.DataFrame(data)
-        output = io.BytesIO()
-        df.to_excel(output, index=False, sheet_name='Milk')
-        output.seek(0)
-        return output
-
-    @staticmethod
-    def export_sales_template():
-        """Export empty Sales template"""
-        data = {
+        }),
+        'weight': ('Weight', {
+            'goat_tag': ['G001', 'G002'],
+            'date': ['2026-02-17', '2026-02-17'],
+            'weight': [46.0, 42.5]
+        }),
+        'sales': ('Sales', {
             'sale_type': ['M', 'G'],
             'goat_tag': ['G001', 'G002'],
             'date': ['2026-02-17', '2026-02-17'],
@@ -286,17 +113,8 @@ class ExcelExporter:
             'buyer_name': ['Dairy Co', 'Buyer'],
             'buyer_contact': ['9876543210', '9876543210'],
             'payment_status': ['P', 'P']
-        }
-        df = pd.DataFrame(data)
-        output = io.BytesIO()
-        df.to_excel(output, index=False, sheet_name='Sales')
-        output.seek(0)
-        return output
-
-    @staticmethod
-    def export_health_template():
-        """Export empty Health Records template"""
-        data = {
+        }),
+        'health': ('Health', {
             'goat_tag': ['G001', 'G002'],
             'record_type': ['V', 'D'],
             'date': ['2026-02-17', '2026-02-17'],
@@ -306,26 +124,72 @@ class ExcelExporter:
             'cost': [200, 150],
             'veterinarian': ['Dr. Sharma', 'Dr. Patel'],
             'next_due_date': ['2026-05-17', '2026-05-17']
-        }
-        df = pd.DataFrame(data)
-        output = io.BytesIO()
-        df.to_excel(output, index=False, sheet_name='Health')
-        output.seek(0)
-        return output
-
-    @staticmethod
-    def export_expenses_template():
-        """Export empty Expenses template"""
-        data = {
+        }),
+        'expenses': ('Expenses', {
             'date': ['2026-02-17', '2026-02-17'],
             'expense_type': ['F', 'M'],
             'description': ['Feed purchase', 'Medicine'],
             'amount': [5000, 1000],
             'paid_to': ['Supplier', 'Vet'],
             'payment_method': ['C', 'B']
-        }
+        }),
+    }
+    TEMPLATE_FORMATS = ('xlsx', 'csv', 'csv.gz', 'parquet')
+
+    @staticmethod
+    def template(key, fmt='xlsx'):
+        """
+        Template file (BytesIO) — xlsx / csv / csv.gz / parquet. Parquet mein columns typed
+        (date / float) taaki integrations seedha wahi schema likh sakein.
+        """
+        sheet, data = ExcelExporter.TEMPLATES[key]
         df = pd.DataFrame(data)
         output = io.BytesIO()
-        df.to_excel(output, index=False, sheet_name='Expenses')
+        if fmt == 'xlsx':
+            df.to_excel(output, index=False, sheet_name=sheet)
+        elif fmt in ('csv', 'csv.gz'):
+            text = df.to_csv(index=False).encode('utf-8-sig')
+            output.write(gzip.compress(text) if fmt == 'csv.gz' else text)
+        elif fmt == 'parquet':
+            for f in SPECS[key].fields:
+                if f.column not in df.columns:
+                    continue
+                if f.kind == 'date':
+                    df[f.column] = pd.to_datetime(df[f.column]).dt.date
+                elif f.kind in ('float', 'int'):
+                    df[f.column] = df[f.column].astype(f.kind)
+            df.to_parquet(output, index=False)
+        else:
+            raise ValueError(f"Unknown template format: {fmt} (choose: {', '.join(ExcelExporter.TEMPLATE_FORMATS)})")
         output.seek(0)
         return output
+
+    @staticmethod
+    def export_goats_template():
+        """Export empty Goat template"""
+        return ExcelExporter.template('goats')
+
+    @staticmethod
+    def export_milk_template():
+        """Export empty Milk Production template"""
+        return ExcelExporter.template('milk')
+
+    @staticmethod
+    def export_weight_template():
+        """Export empty Weight Records template"""
+        return ExcelExporter.template('weight')
+
+    @staticmethod
+    def export_sales_template():
+        """Export empty Sales template"""
+        return ExcelExporter.template('sales')
+
+    @staticmethod
+    def export_health_template():
+        """Export empty Health Records template"""
+        return ExcelExporter.template('health')
+
+    @staticmethod
+    def export_expenses_template():
+        """Export empty Expenses template"""
+        return ExcelExporter.template('expenses')
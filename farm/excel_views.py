@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.shortcuts import render
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
@@ -5,6 +6,26 @@ from django.contrib.auth.decorators import login_required
 from .excel_utils import ExcelImporter, ExcelExporter, ExcelImportError
 import json
 
+def _queue_large_import(request, file, key):
+    """
+    Badi file (IMPORT_ASYNC_BYTES se zyada, ya background=1) → bulk_import job: chunk-wise commit,
+    fail ho to resume. Turant 202 + job — page /api/jobs/{id}/ poll karta hai. Chhoti file → None.
+    """
+    from .bulk_import import save_upload
+    from .jobs import enqueue, job_payload
+
+    if file.size <= getattr(settings, 'IMPORT_ASYNC_BYTES', 2 * 1024 * 1024) and request.POST.get('background') != '1':
+        return None
+    params = {'path': save_upload(file), 'key': key, 'mode': request.POST.get('mode') or 'insert'}
+    job = enqueue('bulk_import', params, request.user)
+    return JsonResponse({
+        'success': True,
+        'queued': True,
+        'message': 'Import background mein shuru',
+        'job': job_payload(job),
+    }, status=202)
+
+
 @require_http_methods(["GET"])
 def excel_import_page(request):
     """Excel Import Page - डेटा import करने का page"""
@@ -18,7 +39,10 @@ def import_goats_from_excel(request):
             return JsonResponse({'error': 'No file uploaded'}, status=400)
         
         file = request.FILES['file']
-        results = ExcelImporter.import_goats(file)
+        queued = _queue_large_import(request, file, 'goats')
+        if queued:
+            return queued
+        results = ExcelImporter.import_goats(file, request.POST.get('mode') or 'insert')
         
         return JsonResponse({
             'success': True,
@@ -38,7 +62,10 @@ def import_milk_from_excel(request):
             return JsonResponse({'error': 'No file uploaded'}, status=400)
         
         file = request.FILES['file']
-        results = ExcelImporter.import_milk_production(file)
+        queued = _queue_large_import(request, file, 'milk')
+        if queued:
+            return queued
+        results = ExcelImporter.import_milk_production(file, request.POST.get('mode') or 'insert')
         
         return JsonResponse({
             'success': True,
@@ -50,6 +77,29 @@ def import_milk_from_excel(request):
     except Exception as e:
         return JsonResponse({'error': f'Error: {str(e)}'}, status=500)
 
+@require_http_methods(["POST"])
+def import_weight_from_excel(request):
+    """Import Weight records from Excel (mode=upsert: same goat + date ka weight update)"""
+    try:
+        if 'file' not in request.FILES:
+            return JsonResponse({'error': 'No file uploaded'}, status=400)
+        
+        file = request.FILES['file']
+        queued = _queue_large_import(request, file, 'weight')
+        if queued:
+            return queued
+        results = ExcelImporter.import_weight_records(file, request.POST.get('mode') or 'insert')
+        
+        return JsonResponse({
+            'success': True,
+            'message': f"Successfully imported {results['success']} weight records",
+            'data': results
+        })
+    except ExcelImportError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': f'Error: {str(e)}'}, status=500)
+
 @require_http_methods(["POST"])
 def import_sales_from_excel(request):
     """Import Sales records from Excel"""
@@ -58,7 +108,10 @@ def import_sales_from_excel(request):
             return JsonResponse({'error': 'No file uploaded'}, status=400)
         
         file = request.FILES['file']
-        results = ExcelImporter.import_sales(file)
+        queued = _queue_large_import(request, file, 'sales')
+        if queued:
+            return queued
+        results = ExcelImporter.import_sales(file, request.POST.get('mode') or 'insert')
         
         return JsonResponse({
             'success': True,
@@ -78,7 +131,10 @@ def import_health_from_excel(request):
             return JsonResponse({'error': 'No file uploaded'}, status=400)
         
         file = request.FILES['file']
-        results = ExcelImporter.import_health_records(file)
+        queued = _queue_large_import(request, file, 'health')
+        if queued:
+            return queued
+        results = ExcelImporter.import_health_records(file, request.POST.get('mode') or 'insert')
         
         return JsonResponse({
             'success': True,
@@ -98,7 +154,10 @@ def import_expenses_from_excel(request):
             return JsonResponse({'error': 'No file uploaded'}, status=400)
         
         file = request.FILES['file']
-        results = ExcelImporter.import_expenses(file)
+        queued = _queue_large_import(request, file, 'expenses')
+        if queued:
+            return queued
+        results = ExcelImporter.import_expenses(file, request.POST.get('mode') or 'insert')
         
         return JsonResponse({
             'success': True,
@@ -112,62 +171,48 @@ def import_expenses_from_excel(request):
 
 # DOWNLOAD TEMPLATES
 
-@require_http_methods(["GET"])
-def download_goats_template(request):
-    """Download Goats Excel template"""
+def _template_response(request, key, label):
+    """Template download — ?format=xlsx (default) / csv / csv.gz / parquet, same columns har format mein."""
+    from .exports import WRITERS
+    fmt = request.GET.get('format', 'xlsx')
+    if fmt not in ExcelExporter.TEMPLATE_FORMATS:
+        return JsonResponse({'error': f"Unknown format: {fmt} (choose: {', '.join(ExcelExporter.TEMPLATE_FORMATS)})"},
+                            status=400)
     try:
-        excel_file = ExcelExporter.export_goats_template()
-        response = HttpResponse(excel_file.getvalue(), 
-                              content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="Goats_Template.xlsx"'
+        output = ExcelExporter.template(key, fmt)
+        response = HttpResponse(output.getvalue(), content_type=WRITERS[fmt].content_type)
+        response['Content-Disposition'] = f'attachment; filename="{label}_Template.{WRITERS[fmt].extension}"'
         return response
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+
+@require_http_methods(["GET"])
+def download_goats_template(request):
+    """Download Goats template (?format=xlsx|csv|csv.gz|parquet)"""
+    return _template_response(request, 'goats', 'Goats')
+
 @require_http_methods(["GET"])
 def download_milk_template(request):
-    """Download Milk Production Excel template"""
-    try:
-        excel_file = ExcelExporter.export_milk_template()
-        response = HttpResponse(excel_file.getvalue(), 
-                              content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="Milk_Template.xlsx"'
-        return response
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    """Download Milk Production template (?format=xlsx|csv|csv.gz|parquet)"""
+    return _template_response(request, 'milk', 'Milk')
+
+@require_http_methods(["GET"])
+def download_weight_template(request):
+    """Download Weight Records template (?format=xlsx|csv|csv.gz|parquet)"""
+    return _template_response(request, 'weight', 'Weight')
 
 @require_http_methods(["GET"])
 def download_sales_template(request):
-    """Download Sales Excel template"""
-    try:
-        excel_file = ExcelExporter.export_sales_template()
-        response = HttpResponse(excel_file.getvalue(), 
-                              content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="Sales_Template.xlsx"'
-        return response
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    """Download Sales template (?format=xlsx|csv|csv.gz|parquet)"""
+    return _template_response(request, 'sales', 'Sales')
 
 @require_http_methods(["GET"])
 def download_health_template(request):
-    """Download Health Records Excel template"""
-    try:
-        excel_file = ExcelExporter.export_health_template()
-        response = HttpResponse(excel_file.getvalue(), 
-                              content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="Health_Template.xlsx"'
-        return response
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    """Download Health Records template (?format=xlsx|csv|csv.gz|parquet)"""
+    return _template_response(request, 'health', 'Health')
 
 @require_http_methods(["GET"])
 def download_expenses_template(request):
-    """Download Expenses Excel template"""
-    try:
-        excel_file = ExcelExporter.export_expenses_template()
-        response = HttpResponse(excel_file.getvalue(), 
-                              content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = 'attachment; filename="Expenses_Template.xlsx"'
-        return response
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    """Download Expenses template (?format=xlsx|csv|csv.gz|parquet)"""
+    return _template_response(request, 'expenses', 'Expenses')
@@ -0,0 +1,605 @@
+"""
+🐐 Export Registry — v6.1
+Har model ka export ek hi jagah declare hota hai — columns, queryset, formatters. Backup page ke Excel,
+/download/*, admin downloads, ZIP backup aur /export/<dataset>/ sab isi pipeline se likhte hain.
+
+Features:
+- Column / Dataset → header, source field(s), formatter, type, xlsx style — ek baar declare (REGISTRY)
+- Querysets        → values_list(...).iterator() — sirf export wale columns, FK naam JOIN se
+                     (select_related + only() se bhi halka: model instances banti hi nahi)
+- Writers          → xlsx (farm/excel_stream.py), csv (UTF-8 BOM — Excel mein ₹ / Hindi theek),
+                     csv.gz (streaming gzip), parquet (pyarrow, typed columns, row groups) — WRITERS registry
+- Layouts (xlsx)   → 'report': title + totals + footer (backup page) · 'table': header row 1 par
+                     (admin import / pandas.read_excel wapas padh sake)
+- Benchmarks       → python manage.py export_benchmark (har writer x dataset, rows/sec)
+
+    chunks, content_type, filename = export_file(['milk', 'sales'], 'csv')   # → ZIP (har dataset ek CSV)
+    return streaming_response(request, chunks, content_type, filename)
+"""
+
+import csv
+import io
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
+from .backup_stream import iter_zip
+from .db_router import analytics_reads
+from .excel_stream import StreamingWorkbook
+from .models import (
+    Goat, BreedingRecord, HealthRecord, MilkProduction, FeedInventory, Sale, Expense,
+    WeightRecord, Task, Customer, Insurance, MortalityRecord, VaccinationSchedule,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+CHUNK = 2000
+PARQUET_ROW_GROUP = 100_000
+XLSX_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+# ==================== XLSX STYLES ====================
+
+HDR_GREEN  = PatternFill("solid", start_color="1F6B35", end_color="1F6B35")
+HDR_BLUE   = PatternFill("solid", start_color="2F4F8F", end_color="2F4F8F")
+HDR_AMBER  = PatternFill("solid", start_color="B8860B", end_color="B8860B")
+HDR_RED    = PatternFill("solid", start_color="8B1A1A", end_color="8B1A1A")
+ROW_EVEN   = PatternFill("solid", start_color="F4FAF6", end_color="F4FAF6")
+ROW_ODD    = PatternFill("solid", start_color="FFFFFF", end_color="FFFFFF")
+TITLE_FILL = PatternFill("solid", start_color="0D4A20", end_color="0D4A20")
+
+HDR_FONT   = Font(bold=True, color="FFFFFF", name="Arial", size=10)
+TITLE_FONT = Font(bold=True, color="FFFFFF", name="Arial", size=11)
+BODY_FONT  = Font(name="Arial", size=9)
+MONEY_FONT = Font(name="Arial", size=9, color="1A5C2A")
+
+THIN_BORDER = Border(
+    left=Side(style='thin', color='CCCCCC'),
+    right=Side(style='thin', color='CCCCCC'),
+    top=Side(style='thin', color='CCCCCC'),
+    bottom=Side(style='thin', color='CCCCCC'),
+)
+
+INR_FORMAT  = '₹#,##0.00'
+NUM_FORMAT  = '#,##0.00'
+
+CENTER = Alignment(horizontal='center', vertical='center')
+BODY_ALIGN = Alignment(vertical='center', wrap_text=False)
+
+
+def _body_styles(suffix, **kwargs):
+    """Even / odd (alternating fill) pair."""
+    base = dict(font=BODY_FONT, border=THIN_BORDER, alignment=BODY_ALIGN)
+    base.update(kwargs)
+    return [
+        NamedStyle(f'farm_{suffix}_even', fill=ROW_EVEN, **base),
+        NamedStyle(f'farm_{suffix}_odd', fill=ROW_ODD, **base),
+    ]
+
+
+def _stat_styles():
+    """Summary sheet: label + value (neutral / good / bad) x (even / odd)."""
+    styles = []
+    for parity, fill in (('even', ROW_EVEN), ('odd', ROW_ODD)):
+        styles.append(NamedStyle(f'farm_stat_label_{parity}', font=Font(name="Arial", size=9), fill=fill,
+                                 border=THIN_BORDER, alignment=Alignment(vertical='center')))
+        for tone, color in (('neutral', '222222'), ('good', '1A5C2A'), ('bad', '8B1A1A')):
+            styles.append(NamedStyle(f'farm_stat_{tone}_{parity}', fill=fill, border=THIN_BORDER,
+                                     font=Font(name="Arial", size=10, bold=True, color=color),
+                                     alignment=Alignment(horizontal='right', vertical='center')))
+    return styles
+
+
+# Shared named styles — workbook mein ek-ek baar, har cell sirf style id (farm/excel_stream.py)
+FARM_STYLES = [
+    NamedStyle('farm_title', font=TITLE_FONT, fill=TITLE_FILL, alignment=CENTER),
+    NamedStyle('farm_banner', font=Font(bold=True, color="FFFFFF", name="Arial", size=14),
+               fill=TITLE_FILL, alignment=CENTER),
+    *[NamedStyle(f'farm_hdr_{name}', font=HDR_FONT, fill=fill, border=THIN_BORDER,
+                 alignment=Alignment(horizontal='center', vertical='center', wrap_text=True))
+      for name, fill in (('green', HDR_GREEN), ('blue', HDR_BLUE), ('amber', HDR_AMBER), ('red', HDR_RED))],
+    *[NamedStyle(f'farm_section_{name}', font=HDR_FONT, fill=fill,
+                 alignment=Alignment(horizontal='left', vertical='center'))
+      for name, fill in (('green', HDR_GREEN), ('blue', HDR_BLUE))],
+    *_body_styles('body'),
+    *_body_styles('money', font=MONEY_FONT, number_format=INR_FORMAT),
+    *_body_styles('inr', number_format=INR_FORMAT),
+    *_body_styles('num', number_format=NUM_FORMAT),
+    NamedStyle('farm_total_label', font=Font(bold=True, name="Arial", size=9)),
+    NamedStyle('farm_total_revenue', font=Font(bold=True, color="1A5C2A", name="Arial", size=9),
+               number_format=INR_FORMAT),
+    NamedStyle('farm_total_cost', font=Font(bold=True, color="8B1A1A", name="Arial", size=9),
+               number_format=INR_FORMAT),
+    NamedStyle('farm_info_label', font=Font(bold=True, name="Arial", size=9, color="555555")),
+    NamedStyle('farm_info_value', font=Font(name="Arial", size=9)),
+    *_stat_styles(),
+]
+
+BODY  = ('farm_body_even', 'farm_body_odd')
+MONEY = ('farm_money_even', 'farm_money_odd')
+INR   = ('farm_inr_even', 'farm_inr_odd')
+NUM   = ('farm_num_even', 'farm_num_odd')
+
+
+# ==================== FORMATTERS ====================
+
+@lru_cache(maxsize=8192)
+def _safe_date(d):
+    return d.strftime('%d-%m-%Y') if d else ''
+
+
+def _safe_dt(dt):
+    # strftime('%d-%m-%Y %H:%M') jaisa — aware datetime par strftime ~2x slow (lakhon created_at)
+    return f"{dt.day:02d}-{dt.month:02d}-{dt.year} {dt.hour:02d}:{dt.minute:02d}" if dt else ''
+
+
+def _yes_no(value):
+    return 'Yes' if value else 'No'
+
+
+# xlsx / csv mein dates text (DD-MM-YYYY) — parquet ko typed values milti hain
+DISPLAY = {'date': _safe_date, 'datetime': _safe_dt, 'bool': _yes_no}
+
+
+def choices(options):
+    """Model choices → code se label (anjaan code jaisa ka taisa)."""
+    labels = dict(options)
+    return lambda code: labels.get(code, code)
+
+
+def _age_years(dob):
+    """Goat.get_age_years() jaisa — date_of_birth se, instance ke bina."""
+    if not dob:
+        return None
+    today = date.today()
+    return max(0, (today.year - dob.year) * 12 + (today.month - dob.month)) // 12
+
+
+def _blank_zero(value):
+    """0 / None → khaali cell (fat %, kids)."""
+    return value or None
+
+
+# ==================== SPECS ====================
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Ek export column. source: values_list field path ('goat__name') ya tuple (fmt ko sab values
+    milti hain). type: str / int / float / date / datetime / bool — parquet schema aur display conversion.
+    """
+    header: str
+    source: object
+    type: str = 'str'
+    fmt: Optional[Callable] = None
+    style: Optional[tuple] = None      # xlsx (even, odd) named styles — MONEY / INR / NUM
+
+    @property
+    def fields(self):
+        return self.source if isinstance(self.source, tuple) else (self.source,)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    Ek model ka export. title (xlsx report layout): format string — {n} (row count) aur totals keys.
+    totals: {'amount': 'total_amount'} → ek aggregate query mein Sum. footer: (label, column, total key, style).
+    """
+    key: str
+    model: type
+    columns: tuple
+    ordering: tuple = ()
+    sheet: str = ''
+    title: str = ''
+    header: str = 'green'
+    totals: dict = field(default_factory=dict)
+    footer: Optional[tuple] = None
+
+    @property
+    def headers(self):
+        return [c.header for c in self.columns]
+
+    def queryset(self):
+        """Abhi ke router decision (analytics / default) par pinned — generator baad mein chale tab bhi."""
+        qs = self.model.objects.order_by(*self.ordering)
+        return qs.using(qs.db)
+
+    def compute_totals(self, qs):
+        result = qs.aggregate(n=Count('pk'), **{k: Sum(v) for k, v in self.totals.items()})
+        return {k: (v or 0) for k, v in result.items()}
+
+    def _plan(self, display):
+        """values_list fields (duplicate ek baar) + har column ka getter."""
+        fields, getters = [], []
+        for col in self.columns:
+            idx = []
+            for name in col.fields:
+                if name not in fields:
+                    fields.append(name)
+                idx.append(fields.index(name))
+            convert = DISPLAY.get(col.type) if display else None
+            fmt = col.fmt
+            if len(idx) > 1:
+                getters.append(lambda r, idx=idx, fmt=fmt: fmt(*(r[i] for i in idx)))
+            elif fmt and convert:
+                getters.append(lambda r, i=idx[0], fmt=fmt, convert=convert: convert(fmt(r[i])))
+            elif fmt or convert:
+                getters.append(lambda r, i=idx[0], f=fmt or convert: f(r[i]))
+            else:
+                getters.append(lambda r, i=idx[0]: r[i])
+        return fields, getters
+
+    def rows(self, qs=None, display=True):
+        """Row lists stream karo. display=False: typed values (dates, bool) — parquet ke liye."""
+        qs = self.queryset() if qs is None else qs
+        fields, getters = self._plan(display)
+        for record in qs.values_list(*fields).iterator(chunk_size=CHUNK):
+            yield [get(record) for get in getters]
+
+
+GOAT_COLUMNS = (
+    Column('Tag Number', 'tag_number'),
+    Column('Name', 'name'),
+    Column('Breed', 'breed', fmt=choices(Goat.BREED_CHOICES)),
+    Column('Gender', 'gender', fmt=choices(Goat.GENDER_CHOICES)),
+    Column('Color', 'color'),
+    Column('DOB', 'date_of_birth', 'date'),
+    Column('Age (Years)', 'date_of_birth', 'int', fmt=_age_years),
+    Column('Weight (kg)', 'weight', 'float'),
+    Column('Purchase Date', 'purchase_date', 'date'),
+    Column('Purchase Price (₹)', 'purchase_price', 'float', style=MONEY),
+    Column('Status', 'status', fmt=choices(Goat.STATUS_CHOICES)),
+    Column('Mother', 'mother__name'),
+    Column('Father', 'father__name'),
+    Column('Created At', 'created_at', 'datetime'),
+)
+
+REGISTRY = {ds.key: ds for ds in (
+    Dataset(
+        'goats', Goat, GOAT_COLUMNS, ('tag_number',),
+        sheet="🐐 Goats", title="🐐  GOAT INVENTORY  —  Total: {n}",
+    ),
+    Dataset(
+        'breeding', BreedingRecord, (
+            Column('Mother', 'mother__name'),
+            Column('Father', 'father__name'),
+            Column('Breeding Date', 'breeding_date', 'date'),
+            Column('Expected Delivery', 'expected_delivery_date', 'date'),
+            Column('Actual Delivery', 'actual_delivery_date', 'date'),
+            Column('Status', 'status', fmt=choices(BreedingRecord.STATUS_CHOICES)),
+            Column('Number of Kids', 'number_of_kids', 'int', fmt=_blank_zero),
+            Column('Notes', 'notes'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-breeding_date',),
+        sheet="🤝 Breeding", title="🤝  BREEDING RECORDS  —  Total: {n}", header='blue',
+    ),
+    Dataset(
+        'health', HealthRecord, (
+            Column('Goat', 'goat__name'),
+            Column('Type', 'record_type', fmt=choices(HealthRecord.RECORD_TYPE_CHOICES)),
+            Column('Date', 'date', 'date'),
+            Column('Description', 'description'),
+            Column('Medicine', 'medicine_used'),
+            Column('Dosage', 'dosage'),
+            Column('Cost (₹)', 'cost', 'float', style=INR),
+            Column('Veterinarian', 'veterinarian'),
+            Column('Next Due Date', 'next_due_date', 'date'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-date',),
+        sheet="🏥 Health", title="🏥  HEALTH RECORDS  —  Total Cost: ₹{cost:,.0f}", header='red',
+        totals={'cost': 'cost'}, footer=("TOTAL HEALTH COST", 7, 'cost', 'farm_total_cost'),
+    ),
+    Dataset(
+        'milk', MilkProduction, (
+            Column('Goat', 'goat__name'),
+            Column('Date', 'date', 'date'),
+            Column('Session', 'session', fmt=choices(MilkProduction.SESSION_CHOICES)),
+            Column('Quantity (L)', 'quantity', 'float', style=NUM),
+            Column('Fat %', 'fat_percentage', 'float', fmt=_blank_zero),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-date',),
+        sheet="🥛 Milk", title="🥛  MILK PRODUCTION  —  Total: {quantity:.1f} Litres",
+        totals={'quantity': 'quantity'}, footer=("TOTAL: {quantity:.1f} L", None, None, None),
+    ),
+    Dataset(
+        'sales', Sale, (
+            Column('Type', 'sale_type', fmt=choices(Sale.SALE_TYPE_CHOICES)),
+            Column('Goat', 'goat__name'),
+            Column('Date', 'date', 'date'),
+            Column('Quantity', 'quantity', 'float'),
+            Column('Unit', 'unit'),
+            Column('Price per Unit (₹)', 'price_per_unit', 'float', style=INR),
+            Column('Total Amount (₹)', 'total_amount', 'float', style=INR),
+            Column('Buyer', 'buyer_name'),
+            Column('Contact', 'buyer_contact'),
+            Column('Payment Status', 'payment_status', fmt=choices(Sale.PAYMENT_STATUS_CHOICES)),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-date',),
+        sheet="💰 Sales", title="💰  SALES  —  Total Revenue: ₹{amount:,.0f}",
+        totals={'amount': 'total_amount'}, footer=("TOTAL REVENUE", 7, 'amount', 'farm_total_revenue'),
+    ),
+    Dataset(
+        'expenses', Expense, (
+            Column('Date', 'date', 'date'),
+            Column('Type', 'expense_type', fmt=choices(Expense.EXPENSE_TYPE_CHOICES)),
+            Column('Description', 'description'),
+            Column('Amount (₹)', 'amount', 'float', style=INR),
+            Column('Paid To', 'paid_to'),
+            Column('Payment Method', 'payment_method', fmt=choices(Expense.PAYMENT_METHOD_CHOICES)),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-date',),
+        sheet="💸 Expenses", title="💸  EXPENSES  —  Total: ₹{amount:,.0f}", header='amber',
+        totals={'amount': 'amount'}, footer=("TOTAL EXPENSES", 4, 'amount', 'farm_total_cost'),
+    ),
+    Dataset(
+        'weight', WeightRecord, (
+            Column('Goat', 'goat__name'),
+            Column('Tag Number', 'goat__tag_number'),
+            Column('Date', 'date', 'date'),
+            Column('Weight (kg)', 'weight', 'float'),
+            Column('Recorded At', 'created_at', 'datetime'),
+        ), ('-date',),
+        sheet="⚖️ Weight", title="⚖️  WEIGHT RECORDS  —  Total: {n}", header='blue',
+    ),
+    Dataset(
+        'tasks', Task, (
+            Column('Title', 'title'),
+            Column('Priority', 'priority', fmt=choices(Task.PRIORITY_CHOICES)),
+            Column('Status', 'status', fmt=choices(Task.STATUS_CHOICES)),
+            Column('Due Date', 'due_date', 'date'),
+            Column('Assigned To', 'assigned_to'),
+            Column('Description', 'description'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('due_date',),
+        sheet="📋 Tasks", title="📋  TASKS  —  Total: {n}", header='blue',
+    ),
+    Dataset(
+        'vaccination', VaccinationSchedule, (
+            Column('Goat', 'goat__name'),
+            Column('Tag Number', 'goat__tag_number'),
+            Column('Vaccine', 'vaccine_name'),
+            Column('Due Date', 'due_date', 'date'),
+            Column('Completed', 'completed', 'bool'),
+            Column('Completion Date', 'completion_date', 'date'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('due_date',),
+        sheet="💉 Vaccination", title="💉  VACCINATION SCHEDULE  —  Total: {n}", header='red',
+    ),
+    Dataset(
+        'insurance', Insurance, (
+            Column('Goat', 'goat__name'),
+            Column('Provider', 'provider'),
+            Column('Policy No.', 'policy_number'),
+            Column('Coverage (₹)', 'coverage_amount', 'float', style=INR),
+            Column('Premium (₹)', 'premium', 'float', style=INR),
+            Column('Start Date', 'start_date', 'date'),
+            Column('End Date', 'end_date', 'date'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('end_date',),
+        sheet="🛡️ Insurance", title="🛡️  INSURANCE  —  Total: {n}", header='blue',
+    ),
+    Dataset(
+        'customers', Customer, (
+            Column('Name', 'name'),
+            Column('Contact', 'contact'),
+            Column('Email', 'email'),
+            Column('Address', 'address'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('name',),
+        sheet="👥 Customers", title="👥  CUSTOMERS  —  Total: {n}",
+    ),
+    Dataset(
+        'feed', FeedInventory, (
+            Column('Feed Name', 'feed_name'),
+            Column('Type', 'feed_type', fmt=choices(FeedInventory.FEED_TYPE_CHOICES)),
+            Column('Qty (kg)', 'quantity', 'float'),
+            Column('Unit Price (₹)', 'unit_price', 'float', style=INR),
+            Column('Total Cost (₹)', ('quantity', 'unit_price'), 'float', fmt=lambda q, p: q * p, style=INR),
+            Column('Purchase Date', 'purchase_date', 'date'),
+            Column('Supplier', 'supplier'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-purchase_date',),
+        sheet="🌾 Feed", title="🌾  FEED INVENTORY  —  Total: {n}",
+    ),
+    Dataset(
+        'mortality', MortalityRecord, (
+            Column('Goat', 'goat__name'),
+            Column('Tag Number', 'goat__tag_number'),
+            Column('Death Date', 'death_date', 'date'),
+            Column('Cause', 'cause'),
+            Column('Age at Death (months)', 'age_at_death', 'int'),
+            Column('Weight at Death (kg)', 'weight_at_death', 'float'),
+            Column('Created At', 'created_at', 'datetime'),
+        ), ('-death_date',),
+        sheet="💀 Mortality", title="💀  MORTALITY RECORDS  —  Total: {n}", header='red',
+    ),
+)}
+
+
+def get_datasets(keys):
+    """'all' / None → poori registry; warna keys ki order mein. Anjaan key → KeyError."""
+    if keys in (None, 'all', ['all']):
+        return list(REGISTRY.values())
+    if isinstance(keys, str):
+        keys = keys.split(',')
+    return [REGISTRY[key.strip()] for key in keys]
+
+
+# ==================== WRITERS ====================
+
+def write_sheet(book, dataset, layout='report', qs=None):
+    """
+    Dataset → StreamingWorkbook ki ek sheet.
+    report: title (totals ke saath, merged) → header → rows → TOTAL footer; table: header row 1 par.
+    """
+    qs = dataset.queryset() if qs is None else qs
+    column_styles = {i: c.style for i, c in enumerate(dataset.columns, 1) if c.style}
+    ws = book.create_sheet(dataset.sheet or dataset.key)
+    totals = None
+    if layout == 'report':
+        # Title ke totals aggregate query se pehle hi — baad mein insert_rows() nahi
+        totals = dataset.compute_totals(qs)
+        ws.title_row(dataset.title.format(**totals), len(dataset.columns), 'farm_title')
+    ws.header_row(dataset.headers, f'farm_hdr_{dataset.header}')
+    ws.body_rows(dataset.rows(qs), BODY, column_styles)
+    ws.freeze_panes = "A3" if layout == 'report' else "A2"
+    if totals and dataset.footer:
+        label, col, key, style = dataset.footer
+        ws.blank_row()
+        cells = [(label.format(**totals), 'farm_total_label')]
+        if col:
+            cells += [(None, None)] * (col - 2) + [(totals[key], style)]
+        ws.row(cells)
+    return ws
+
+
+def build_workbook(datasets, layout='report', title='', querysets=None):
+    book = StreamingWorkbook(FARM_STYLES, title=title, creator="Goat Farm Management System v6.1")
+    for i, dataset in enumerate(datasets):
+        write_sheet(book, dataset, layout, querysets[i] if querysets else None)
+    return book
+
+
+def iter_workbook(build, *args, chunk_size=64 * 1024):
+    """
+    build(*args) → StreamingWorkbook → bytes chunks. Spooled temp file mein save (bada ho to disk par),
+    phir chunks — poori xlsx memory mein nahi.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as tmp:
+        # Generator view ke baad chalta hai — analytics routing yahan dobara (ek hi next() ke andar)
+        with analytics_reads():
+            build(*args).save(tmp)
+        tmp.seek(0)
+        yield from iter(lambda: tmp.read(chunk_size), b'')
+
+
+class XlsxWriter:
+    """Sab datasets ek workbook mein — har dataset ek sheet."""
+    extension = 'xlsx'
+    content_type = XLSX_TYPE
+    multi_dataset = True
+
+    def __init__(self, layout='table'):
+        self.layout = layout
+
+    def chunks(self, datasets, querysets):
+        return iter_workbook(build_workbook, datasets, self.layout, '', querysets)
+
+
+class CsvWriter:
+    """Ek dataset → CSV. UTF-8 BOM taaki Excel ₹ / Hindi sahi dikhaye."""
+    extension = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+    multi_dataset = False
+
+    def chunks(self, dataset, qs):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(dataset.headers)
+        yield ('\ufeff' + buf.getvalue()).encode('utf-8')
+        rows = dataset.rows(qs)
+        while True:
+            batch = list(islice(rows, CHUNK))
+            if not batch:
+                break
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows(batch)
+            yield buf.getvalue().encode('utf-8')
+
+
+class CsvGzWriter(CsvWriter):
+    """CSV → gzip stream (chunk-by-chunk compress, poori file memory mein nahi). Lakhon milk rows ke integrations ke liye."""
+    extension = 'csv.gz'
+    content_type = 'application/gzip'
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def chunks(self, dataset, qs):
+        gz = zlib.compressobj(self.level, zlib.DEFLATED, 31)   # wbits 31 = gzip header + trailer
+        for chunk in super().chunks(dataset, qs):
+            out = gz.compress(chunk)
+            if out:
+                yield out
+        yield gz.flush()
+
+
+PARQUET_TYPES = {
+    'str': 'string', 'int': 'int64', 'float': 'float64', 'date': 'date32', 'bool': 'bool_',
+}
+
+
+class ParquetWriter:
+    """Ek dataset → Parquet (typed columns, PARQUET_ROW_GROUP rows ka row group). pyarrow chahiye."""
+    extension = 'parquet'
+    content_type = 'application/vnd.apache.parquet'
+    multi_dataset = False
+
+    def __init__(self, row_group=PARQUET_ROW_GROUP):
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError('pyarrow install nahi hai. Run: pip install pyarrow')
+        self.row_group = row_group
+
+    @staticmethod
+    def schema(dataset):
+        def arrow_type(col):
+            if col.type == 'datetime':
+                return pa.timestamp('us', tz='UTC' if settings.USE_TZ else None)
+            return getattr(pa, PARQUET_TYPES[col.type])()
+        return pa.schema([(c.header, arrow_type(c)) for c in dataset.columns])
+
+    def chunks(self, dataset, qs, chunk_size=64 * 1024):
+        schema = self.schema(dataset)
+        rows = dataset.rows(qs, display=False)
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as tmp:
+            with pq.ParquetWriter(tmp, schema, compression='zstd') as writer:
+                while True:
+                    batch = list(islice(rows, self.row_group))
+                    if not batch:
+                        break
+                    arrays = [pa.array(values, type=f.type) for values, f in zip(zip(*batch), schema)]
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            tmp.seek(0)
+            yield from iter(lambda: tmp.read(chunk_size), b'')
+
+
+WRITERS = {'xlsx': XlsxWriter, 'csv': CsvWriter, 'csv.gz': CsvGzWriter, 'parquet': ParquetWriter}
+
+
+def export_file(keys='all', fmt='xlsx', **options):
+    """
+    Datasets → (bytes chunks, content_type, filename). Querysets abhi (caller ke analytics_reads
+    context mein) pin hote hain, rows tab padhi jaati hain jab chunks consume hon.
+    Ek-dataset-per-file formats (csv / parquet) mein ek se zyada datasets → ZIP.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt} (choose: {', '.join(WRITERS)})")
+    datasets = get_datasets(keys)
+    writer = WRITERS[fmt](**options)
+    querysets = [ds.queryset() for ds in datasets]
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    name = datasets[0].key if len(datasets) == 1 else 'farm_data'
+
+    if writer.multi_dataset:
+        return writer.chunks(datasets, querysets), writer.content_type, f"{name}_{stamp}.{writer.extension}"
+    if len(datasets) == 1:
+        return writer.chunks(datasets[0], querysets[0]), writer.content_type, f"{name}_{stamp}.{writer.extension}"
+    members = [
+        (f"{ds.key}.{writer.extension}", writer.chunks(ds, qs))
+        for ds, qs in zip(datasets, querysets)
+    ]
+    return iter_zip(members), 'application/zip', f"{name}_{stamp}_{fmt}.zip"
@@ -0,0 +1,214 @@
+"""
+🐐 Feed Stock Projection + Ledger — v6.1
+Har feed ka daily burn rate aur stock kitne din chalega — low-feed alerts (notifications.py),
+GET /api/feed/stock-projection/ aur AI dashboard ka feed planning card teeno yahi use karte hain.
+Stock ghatana / badhana bhi yahin (ledger) — FeedConsumption.save / delete aur bulk consumption API.
+
+Pehle har FeedInventory row par alag Avg('quantity_consumed') query chalti thi, aur average
+per-record tha (din mein do entries → aadha burn dikhta). Ab:
+
+Features:
+- Ek query       → FeedInventory LEFT JOIN FeedConsumption, GROUP BY feed; 7 aur 30 din ke Sum(filter=...)
+                    conditional aggregates + pehli consumption date — feeds kitne bhi hon, ek round-trip
+- Sahi burn rate → window ka total ÷ window ke din (feed naya ho to pehli consumption se aaj tak ke din)
+- Projection     → days_remaining, stockout_date, status (critical / low / ok / idle), reorder_qty
+                    (cover_days tak chalne ke liye kitna mangaana hai). HORIZON_DAYS (10 saal) se aage →
+                    days_remaining = HORIZON_DAYS, stockout_date None
+- Atomic ledger  → consume(): availability check + decrement ek conditional UPDATE
+                    (SET quantity = quantity - n WHERE quantity >= n) — do saath ki entries stock negative
+                    nahi kar sakti, koi SELECT / lock nahi. Delete par stock wapas (post_delete signal;
+                    admin ka bulk delete har feed ka ek UPDATE, feed hi delete ho to kuch nahi).
+                    record_day(): poore din ki feeding ek transaction mein
+
+    rows = project_stock(threshold_days=7, cover_days=30)
+    # [{'feed_id': 3, 'feed_name': 'Bajra', 'burn_rate': 12.5, 'days_remaining': 4.2, 'status': 'low', ...}]
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, FloatField, Min, Q, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete
+
+from .models import FeedConsumption, FeedInventory
+from .watermarks import touch
+
+WINDOWS = (7, 30)
+HORIZON_DAYS = 3650   # isse aage ka projection bematlab (aur date overflow) — days_remaining yahin clamp
+
+
+def _window_days(window, first_used, today) -> int:
+    """Window ke din — par feed window se naya ho to sirf pehli consumption se aaj tak."""
+    if first_used is None:
+        return window
+    return max(1, min(window, (today - first_used).days + 1))
+
+
+def project_stock(threshold_days=None, cover_days=None, today=None) -> list:
+    """
+    Sab feeds ka projection, sabse kam din wale pehle.
+    Burn rate: pichhle 7 din ka (recent trend); 7 din mein kuch nahi to 30 din ka.
+    """
+    threshold_days = getattr(settings, 'FEED_LOW_STOCK_DAYS', 7) if threshold_days is None else threshold_days
+    cover_days = getattr(settings, 'FEED_REORDER_COVER_DAYS', 30) if cover_days is None else cover_days
+    today = today or date.today()
+
+    window_sums = {
+        f"used_{window}": Coalesce(
+            Sum('consumption__quantity_consumed', filter=Q(
+                consumption__date__gt=today - timedelta(days=window), consumption__date__lte=today,
+            )),
+            0.0, output_field=FloatField(),
+        )
+        for window in WINDOWS
+    }
+    feeds = (
+        FeedInventory.objects.order_by()
+        .annotate(first_used=Min('consumption__date'), **window_sums)
+        .values('id', 'feed_name', 'feed_type', 'quantity', 'unit', 'unit_price', 'first_used', *window_sums)
+    )
+
+    rows = []
+    for feed in feeds:
+        rates = {
+            window: feed[f"used_{window}"] / _window_days(window, feed['first_used'], today)
+            for window in WINDOWS
+        }
+        burn = rates[7] or rates[30]
+        quantity = float(feed['quantity'])
+        if burn > 0:
+            days_left = min(quantity / burn, HORIZON_DAYS)
+            status = 'critical' if days_left <= threshold_days / 2 else 'low' if days_left <= threshold_days else 'ok'
+            stockout = today + timedelta(days=int(days_left)) if days_left < HORIZON_DAYS else None
+            reorder = max(0.0, burn * cover_days - quantity)
+        else:
+            days_left, status, stockout, reorder = None, 'idle', None, 0.0
+        rows.append({
+            'feed_id': feed['id'],
+            'feed_name': feed['feed_name'],
+            'feed_type': feed['feed_type'],
+            'unit': feed['unit'],
+            'quantity': quantity,
+            'burn_rate_7d': round(rates[7], 2),
+            'burn_rate_30d': round(rates[30], 2),
+            'burn_rate': round(burn, 2),
+            'days_remaining': round(days_left, 1) if days_left is not None else None,
+            'stockout_date': stockout,
+            'status': status,
+            'reorder_qty': round(reorder, 1),
+            'reorder_cost': round(reorder * float(feed['unit_price']), 2),
+        })
+    rows.sort(key=lambda r: (r['days_remaining'] is None, r['days_remaining'] or 0, r['feed_name']))
+    return rows
+
+
+def low_stock(threshold_days=None, today=None) -> list:
+    """Sirf critical / low — alerts ke liye."""
+    return [r for r in project_stock(threshold_days, today=today) if r['status'] in ('critical', 'low')]
+
+
+# ==================== LEDGER ====================
+
+def _shortfall(feed_id, requested) -> str:
+    """Sirf fail hone par — error message ke liye ek SELECT."""
+    feed = FeedInventory.objects.filter(pk=feed_id).values('feed_name', 'quantity', 'unit').first()
+    if feed is None:
+        return f"Feed #{feed_id} nahi mila"
+    return (
+        f"Insufficient stock: {feed['feed_name']} available {feed['quantity']} {feed['unit']}, "
+        f"requested {requested} {feed['unit']}"
+    )
+
+
+def consume(feed_id, quantity):
+    """Stock ghatao — sirf tab jab itna hai. Ek UPDATE; kam ho to ValidationError (kuch nahi badla)."""
+    if quantity <= 0:
+        return restock(feed_id, -quantity)
+    if not FeedInventory.objects.filter(pk=feed_id, quantity__gte=quantity).update(quantity=F('quantity') - quantity):
+        raise ValidationError(_shortfall(feed_id, quantity))
+
+
+def restock(feed_id, quantity):
+    """Stock wapas / badhao (consumption delete ya kam kiya)."""
+    if quantity:
+        FeedInventory.objects.filter(pk=feed_id).update(quantity=F('quantity') + quantity)
+
+
+def apply_change(old, new):
+    """
+    FeedConsumption edit: old / new = (feed_id, quantity) ya None (naya / delete).
+    Feed badla → purane ko wapas, naye se ghatao; same feed → sirf difference.
+    """
+    if old and new and old[0] == new[0]:
+        consume(new[0], new[1] - old[1])
+        return
+    if new:
+        consume(*new)
+    if old:
+        restock(*old)
+
+
+def restock_totals(totals):
+    """{feed_id: quantity} — bulk delete ke baad har feed ka ek UPDATE."""
+    for feed_id, quantity in totals.items():
+        restock(feed_id, quantity)
+    if totals:
+        touch(FeedInventory)
+
+
+def _on_consumption_delete(sender, instance, origin=None, **kwargs):
+    # FeedInventory delete ka cascade — feed hi nahi bacha, restock kiska
+    if isinstance(origin, FeedInventory) or getattr(origin, 'model', None) is FeedInventory:
+        return
+    pending = getattr(origin, '_restock', None)
+    if pending is not None:   # FeedConsumptionQuerySet.delete() — baad mein ek UPDATE per feed
+        pending[instance.feed_id] += instance.quantity_consumed
+        return
+    restock(instance.feed_id, instance.quantity_consumed)
+    touch(FeedInventory)
+
+
+def connect_signals():
+    """
+    FarmConfig.ready() se — instance.delete() (ek row, ek UPDATE) aur QuerySet.delete() (admin bulk delete —
+    FeedConsumptionQuerySet jodta hai, har feed ka ek UPDATE).
+    """
+    post_delete.connect(_on_consumption_delete, sender=FeedConsumption, dispatch_uid='farm_feed_stock_delete')
+
+
+def record_day(day, items) -> list:
+    """
+    Poore din ki feeding ek transaction mein: items = [(feed_id, quantity), ...] (same feed dobara ho to jud jaata hai).
+    Har feed ka ek conditional UPDATE, phir ek bulk_create. Koi bhi feed kam pade to kuch save nahi hota —
+    ValidationError mein sab shortfalls.
+    Returns: [{'feed_id', 'consumed', 'remaining'}]
+    """
+    items = list(items)
+    totals = defaultdict(float)
+    for feed_id, quantity in items:
+        if quantity <= 0:
+            raise ValidationError(f"Feed #{feed_id}: quantity 0 se zyada honi chahiye")
+        totals[feed_id] += quantity
+
+    with transaction.atomic():
+        problems = []
+        for feed_id, quantity in totals.items():
+            if not FeedInventory.objects.filter(pk=feed_id, quantity__gte=quantity).update(
+                quantity=F('quantity') - quantity
+            ):
+                problems.append(_shortfall(feed_id, quantity))
+        if problems:
+            raise ValidationError(problems)   # atomic() rollback — jo feeds ghat chuke the wo bhi wapas
+        FeedConsumption.objects.bulk_create([
+            FeedConsumption(date=day, feed_id=feed_id, quantity_consumed=quantity) for feed_id, quantity in items
+        ])
+        remaining = dict(FeedInventory.objects.filter(pk__in=totals).values_list('pk', 'quantity'))
+    touch(FeedInventory, FeedConsumption)
+    return [
+        {'feed_id': feed_id, 'consumed': quantity, 'remaining': remaining.get(feed_id)}
+        for feed_id, quantity in totals.items()
+    ]
@@ -0,0 +1,183 @@
+"""
+🐐 Incremental Backups — v6.1
+Nightly backups mein sirf badla hua data — poora database har raat dobara nahi.
+
+Features:
+- Manifest  → har model ki pk blocks (BLOCK_SIZE pks) ke content hashes + high-water mark (max pk)
+- Diff      → parent manifest se compare: naye / badle / delete hue rows wale blocks hi likhe jaate hain
+- Format    → NDJSON; har badla block: {"block": {"model", "lo", "hi"}} + us range ki current rows
+              (replay = range delete + rows insert → insert, update, delete teeno cover)
+- Chain     → full base + incrementals; restore_chain() se replay (farm/restore.py)
+
+Sirf Goat mein updated_at hai, isliye change detection timestamps se nahi, row hashes se hoti hai.
+Append-only tables (milk, weight, ...) mein roz sirf aakhri block(s) badalte hain.
+
+Files (settings.BACKUP_DIR):
+    farm_base_<ts>.ndjson   + farm_base_<ts>.manifest.json     ← full (chain base)
+    farm_incr_<ts>.ndjson   + farm_incr_<ts>.manifest.json     ← incremental (parent → pichla manifest)
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .backup_stream import BACKUP_VERSION, json_encoder, serialized_chunks, DEFAULT_CHUNK_SIZE
+
+BLOCK_SIZE = 500
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+# ==================== MANIFEST ====================
+
+def _m2m_map(qs, field):
+    """{source pk: (sorted target pks)} — M2M changes bhi row hash mein aayein."""
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    links = {}
+    for src, tgt in through.objects.using(qs.db).order_by(source, target).values_list(source, target).iterator():
+        links.setdefault(src, []).append(tgt)
+    return {src: tuple(tgts) for src, tgts in links.items()}
+
+
+def model_manifest(qs, chunk_size=DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Ek model ke block hashes. values_list (serializer nahi) — lakhon rows par bhi seconds mein.
+    Returns: {'hwm': max pk, 'rows': n, 'blocks': {block_no (str): hash}}
+    """
+    Model = qs.model
+    attnames = [f.attname for f in Model._meta.concrete_fields if not f.primary_key]
+    m2m = [_m2m_map(qs, f) for f in Model._meta.many_to_many]
+
+    blocks, rows, hwm = {}, 0, 0
+    block, digest = None, None
+    for row in qs.order_by('pk').values_list('pk', *attnames).iterator(chunk_size=chunk_size):
+        pk = row[0]
+        if pk // BLOCK_SIZE != block:
+            if digest is not None:
+                blocks[str(block)] = digest.hexdigest()
+            block, digest = pk // BLOCK_SIZE, hashlib.blake2b(digest_size=8)
+        digest.update(repr((row, [links.get(pk, ()) for links in m2m])).encode())
+        rows, hwm = rows + 1, pk
+    if digest is not None:
+        blocks[str(block)] = digest.hexdigest()
+    return {'hwm': hwm, 'rows': rows, 'blocks': blocks}
+
+
+def build_manifest(querysets) -> dict:
+    """[(key, queryset)] → {key: model_manifest}"""
+    return {key: model_manifest(qs) for key, qs in querysets}
+
+
+def changed_ranges(parent_models: dict, models: dict) -> dict:
+    """
+    Parent vs current → {key: [(lo, hi), ...]} — lagataar badle blocks ek range mein.
+    Parent mein model hi na ho (naya model) to uske saare blocks.
+    """
+    result = {}
+    for key, current in models.items():
+        old = parent_models.get(key, {}).get('blocks', {})
+        new = current['blocks']
+        changed = sorted(int(b) for b in set(old) | set(new) if old.get(b) != new.get(b))
+        ranges = []
+        for b in changed:
+            lo, hi = b * BLOCK_SIZE, (b + 1) * BLOCK_SIZE
+            if ranges and ranges[-1][1] == lo:
+                ranges[-1] = (ranges[-1][0], hi)
+            else:
+                ranges.append((lo, hi))
+        if ranges:
+            result[key] = ranges
+    return result
+
+
+# ==================== WRITER ====================
+
+def iter_incremental_backup(querysets, ranges, meta, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    NDJSON incremental: header meta, phir har model ke changed ranges (FK order — querysets ka order),
+    har range ke baad us range ki saari current rows.
+    """
+    meta = {**meta, 'kind': 'incremental', 'models': [key for key, _ in querysets]}
+    yield json_encoder.encode({'meta': meta}) + '\n'
+    for key, qs in querysets:
+        count = 0
+        for lo, hi in ranges.get(key, []):
+            yield json_encoder.encode({'block': {'model': qs.model._meta.label_lower, 'lo': lo, 'hi': hi}}) + '\n'
+            for rows in serialized_chunks(qs.filter(pk__gte=lo, pk__lt=hi), chunk_size):
+                yield ''.join(json_encoder.encode(r) + '\n' for r in rows)
+                count += len(rows)
+        meta[f'{key}_count'] = count
+    meta['complete'] = True
+    yield json_encoder.encode({'meta': meta}) + '\n'
+
+
+# ==================== CHAIN ====================
+
+def manifest_path(backup_path) -> Path:
+    backup_path = Path(backup_path)
+    return backup_path.with_name(backup_path.name.replace('.ndjson', MANIFEST_SUFFIX))
+
+
+def write_manifest(backup_path, models, parent=None) -> dict:
+    """Backup file ke saath manifest likho. Chain info: base, parent, chain_length."""
+    manifest = {
+        'version': BACKUP_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'backup': Path(backup_path).name,
+        'kind': 'incremental' if parent else 'full',
+        'parent': parent['backup'] if parent else None,
+        'base': parent['base'] if parent else Path(backup_path).name,
+        'chain_length': parent['chain_length'] + 1 if parent else 0,
+        'block_size': BLOCK_SIZE,
+        'models': models,
+    }
+    path = manifest_path(backup_path)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(manifest), encoding='utf-8')
+    tmp.replace(path)
+    return manifest
+
+
+def load_manifest(path) -> dict:
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def latest_manifest(directory):
+    """BACKUP_DIR ka sabse naya manifest (jiski backup file maujood hai), warna None."""
+    candidates = []
+    for path in Path(directory).glob(f'farm_*{MANIFEST_SUFFIX}'):
+        manifest = load_manifest(path)
+        if (Path(directory) / manifest['backup']).exists():
+            candidates.append(manifest)
+    return max(candidates, key=lambda m: m['created_at'], default=None)
+
+
+def chain_for(backup_path) -> list:
+    """Backup file → [base, ..., yeh file] paths (parent pointers follow karke)."""
+    backup_path = Path(backup_path)
+    chain = [backup_path]
+    manifest = load_manifest(manifest_path(backup_path))
+    while manifest['parent']:
+        parent = backup_path.parent / manifest['parent']
+        if not parent.exists():
+            raise FileNotFoundError(f"Chain toot gayi — parent backup missing: {parent.name}")
+        chain.insert(0, parent)
+        manifest = load_manifest(manifest_path(parent))
+    return chain
+
+
+def prune_chains(directory, keep) -> list:
+    """Sirf latest `keep` chains (full base + uske incrementals) rakho. Returns: deleted paths."""
+    manifests = [load_manifest(p) for p in Path(directory).glob(f'farm_*{MANIFEST_SUFFIX}')]
+    bases = sorted({m['base'] for m in manifests if m['kind'] == 'full'}, reverse=True)
+    stale = set(bases[keep:]) if keep > 0 else set()
+    deleted = []
+    for manifest in manifests:
+        if manifest['base'] in stale:
+            for path in (Path(directory) / manifest['backup'], manifest_path(Path(directory) / manifest['backup'])):
+                if path.exists():
+                    path.unlink()
+                    deleted.append(path)
+    return deleted
@@ -0,0 +1,339 @@
+"""
+🐐 Background Jobs — v6.1
+Lambe kaam (complete Excel, ZIP backup, batch QR PDF, WhatsApp reminders, badi imports) request thread se bahar —
+endpoint job enqueue karke turant job id deta hai, `python manage.py run_worker` use chalata hai.
+
+Features:
+- DB-backed queue   → BackgroundJob table hi queue hai; Redis / Celery broker nahi chahiye
+- Safe claiming     → conditional UPDATE (status='QUEUED' → 'RUNNING'); do workers ek job nahi uthaate
+                       (SQLite aur PostgreSQL dono par)
+- Progress          → ctx.progress(pct, message) → GET /api/jobs/{id}/
+- Artifacts         → MEDIA_ROOT/jobs/<id>/<file> — GET /api/jobs/{id}/download/ (owner / staff)
+- Heartbeat         → worker mar jaaye to job JOB_STALE_SECONDS baad dobara queue (JOB_MAX_ATTEMPTS tak)
+- Retry             → FAILED job POST /api/jobs/{id}/retry/ — checkpoint wale handlers (bulk_import) resume karte hain
+
+Naya job type:
+
+    @job('my_export')
+    def my_export(ctx, year=None):
+        ctx.progress(50, 'aadha ho gaya')
+        ctx.write_artifact('report.xlsx', chunks)
+        return {'rows': 123}     # → job.result
+"""
+
+import logging
+import shutil
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+HEARTBEAT_INTERVAL = 30  # seconds
+
+
+def job(kind):
+    """Handler register karo: fn(ctx, **params) → result dict (ya None)."""
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+# ==================== ENQUEUE / STATUS ====================
+
+def enqueue(kind, params=None, user=None) -> BackgroundJob:
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return BackgroundJob.objects.create(
+        kind=kind,
+        params=params or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def job_payload(job) -> dict:
+    """API / JSON response — status page poll karta hai."""
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.message,
+        'result': job.result,
+        'error': job.error,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'status_url': f"/api/jobs/{job.id}/",
+        'download_url': f"/api/jobs/{job.id}/download/" if job.status == 'DONE' and job.artifact else None,
+    }
+
+
+def retry(job) -> bool:
+    """FAILED job dobara queue — handler apna checkpoint (job.result) dekh ke wahin se shuru kare."""
+    return bool(BackgroundJob.objects.filter(pk=job.pk, status='FAILED').update(
+        status='QUEUED', worker='', attempts=0, finished_at=None, error='', message='Retry queued',
+    ))
+
+
+def can_access(user, job) -> bool:
+    return user.is_staff or (job.created_by_id is not None and job.created_by_id == user.id)
+
+
+# ==================== WORKER SIDE ====================
+
+class JobContext:
+    """Handler ko milta hai — progress aur artifact helpers."""
+
+    def __init__(self, job):
+        self.job = job
+
+    def progress(self, pct, message=''):
+        pct = max(0, min(100, int(pct)))
+        BackgroundJob.objects.filter(pk=self.job.pk).update(
+            progress=pct, message=message[:200], heartbeat_at=timezone.now()
+        )
+        self.job.progress, self.job.message = pct, message[:200]
+
+    def artifact_path(self, filename) -> Path:
+        return Path(settings.MEDIA_ROOT) / 'jobs' / str(self.job.pk) / filename
+
+    def write_artifact(self, filename, chunks) -> int:
+        """str / bytes chunks (ya poora bytes) file mein — job.artifact set hota hai."""
+        from .backup_stream import write_backup_file
+        if isinstance(chunks, (bytes, str)):
+            chunks = [chunks]
+        size = write_backup_file(chunks, self.artifact_path(filename))
+        self.job.artifact.name = f"jobs/{self.job.pk}/{filename}"
+        BackgroundJob.objects.filter(pk=self.job.pk).update(artifact=self.job.artifact.name)
+        return size
+
+
+class _Heartbeat(threading.Thread):
+    """Handler ke lambe steps (workbook save) ke dauraan bhi heartbeat_at update hota rahe."""
+
+    def __init__(self, job_id):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.stop = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stop.wait(HEARTBEAT_INTERVAL):
+                BackgroundJob.objects.filter(pk=self.job_id, status='RUNNING').update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()  # thread ki apni DB connection
+
+
+def claim_next(worker_name):
+    """Sabse purana QUEUED job uthao — conditional UPDATE, isliye race-safe."""
+    now = timezone.now()
+    candidates = BackgroundJob.objects.filter(status='QUEUED').order_by('created_at').values_list('pk', flat=True)[:5]
+    for pk in candidates:
+        claimed = BackgroundJob.objects.filter(pk=pk, status='QUEUED').update(
+            status='RUNNING', worker=worker_name, started_at=now, heartbeat_at=now,
+            attempts=F('attempts') + 1, progress=0,
+        )
+        if claimed:
+            return BackgroundJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Handler chalao, result / error save karo."""
+    handler = HANDLERS.get(job.kind)
+    heartbeat = _Heartbeat(job.pk)
+    heartbeat.start()
+    started = time.monotonic()
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+        result = handler(JobContext(job), **job.params)
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status='DONE', progress=100, result=result, finished_at=timezone.now(),
+            message=f"Done in {time.monotonic() - started:.1f}s",
+        )
+    except Exception as e:
+        logger.exception("Job #%s (%s) fail hua", job.pk, job.kind)
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status='FAILED', finished_at=timezone.now(), message=str(e)[:200],
+            error=traceback.format_exc()[-5000:],
+        )
+    finally:
+        heartbeat.stop.set()
+        heartbeat.join()
+    job.refresh_from_db()
+    return job
+
+
+def requeue_stale() -> int:
+    """Heartbeat purana → worker mar gaya. Attempts bache hain to QUEUED, warna FAILED."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOB_STALE_SECONDS', 600))
+    max_attempts = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+    stale = BackgroundJob.objects.filter(status='RUNNING', heartbeat_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status='FAILED', finished_at=timezone.now(), message='Worker lost — max attempts ho gaye',
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(status='QUEUED', worker='', message='Worker lost — requeued')
+    return requeued + failed
+
+
+def prune_artifacts(days=None) -> int:
+    """Purane finished jobs ki files (MEDIA_ROOT/jobs/<id>/) hatao; job rows history ke liye rehti hain."""
+    days = getattr(settings, 'JOB_ARTIFACT_TTL_DAYS', 7) if days is None else days
+    old = BackgroundJob.objects.filter(
+        status__in=['DONE', 'FAILED'], finished_at__lt=timezone.now() - timedelta(days=days),
+    ).exclude(artifact='')
+    count = 0
+    for pk in old.values_list('pk', flat=True):
+        shutil.rmtree(Path(settings.MEDIA_ROOT) / 'jobs' / str(pk), ignore_errors=True)
+        count += 1
+    old.update(artifact='')
+    # Fail hue imports ki uploads (retry ke liye rakhi thi) — TTL ke baad
+    failed_imports = BackgroundJob.objects.filter(
+        kind='bulk_import', status='FAILED', finished_at__lt=timezone.now() - timedelta(days=days),
+    )
+    for params in failed_imports.values_list('params', flat=True):
+        if params.get('path'):
+            shutil.rmtree(Path(params['path']).parent, ignore_errors=True)
+    return count
+
+
+def work(worker_name, once=False, max_jobs=None, stop=None, poll=None) -> int:
+    """
+    Worker loop — run_worker command yahi chalata hai.
+    once=True: queue khaali hote hi return. stop: threading.Event (SIGTERM par set).
+    """
+    poll = getattr(settings, 'JOB_POLL_INTERVAL', 2) if poll is None else poll
+    done, last_maintenance = 0, 0.0
+    while not (stop and stop.is_set()):
+        close_old_connections()
+        if time.monotonic() - last_maintenance > 3600:
+            requeue_stale()
+            prune_artifacts()
+            last_maintenance = time.monotonic()
+        job_obj = claim_next(worker_name)
+        if job_obj is None:
+            if once:
+                break
+            (stop.wait(poll) if stop else time.sleep(poll))
+            continue
+        logger.info("Job #%s %s shuru (%s)", job_obj.pk, job_obj.kind, worker_name)
+        run_job(job_obj)
+        done += 1
+        if max_jobs and done >= max_jobs:
+            break
+    return done
+
+
+# ==================== HANDLERS ====================
+
+@job('backup_zip')
+def backup_zip_job(ctx):
+    """Complete ZIP (JSON + Excel + README) — download_zip_backup."""
+    from .backup_stream import iter_zip
+    from .backup_views import zip_backup_members
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    members = zip_backup_members(timestamp)   # `default` se — analytics copy purani ho sakti hai
+    tracked = []
+    for i, (name, chunks) in enumerate(members):
+        tracked.append((name, _announce(ctx, chunks, 5 + i * 90 // len(members), name.rsplit('/', 1)[-1])))
+    size = ctx.write_artifact(f"farm_backup_{timestamp}.zip", iter_zip(tracked))
+    return {'filename': f"farm_backup_{timestamp}.zip", 'bytes': size}
+
+
+def _announce(ctx, chunks, pct, label):
+    """Member likhna shuru ho tab progress update."""
+    ctx.progress(pct, f"Writing {label}")
+    yield from chunks
+
+
+@job('excel_complete')
+def excel_complete_job(ctx):
+    """Sab sheets wala styled workbook — download_complete_excel."""
+    from .backup_views import _build_complete_workbook
+    from .db_router import analytics_reads
+
+    ctx.progress(5, 'Sheets bana rahe hain')
+    with analytics_reads():
+        book = _build_complete_workbook(datetime.now().strftime('%d-%m-%Y %H:%M:%S'))
+    ctx.progress(80, 'Workbook save ho raha hai')
+    filename = f"farm_complete_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    path = ctx.artifact_path(filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    book.save(path)
+    ctx.job.artifact.name = f"jobs/{ctx.job.pk}/{filename}"
+    BackgroundJob.objects.filter(pk=ctx.job.pk).update(artifact=ctx.job.artifact.name)
+    return {'filename': filename, 'sheets': len(book.sheetnames)}
+
+
+@job('qr_batch_pdf')
+def qr_batch_pdf_job(ctx, base_url='http://localhost:8000'):
+    """Sab active goats ke QR codes ek PDF mein."""
+    from .models import Goat
+    from .qr_utils import generate_batch_qr_pdf, QR_AVAILABLE
+
+    if not QR_AVAILABLE:
+        raise RuntimeError('qrcode install nahi hai. Run: pip install qrcode[pil]')
+    goats = list(Goat.objects.filter(status__in=['A', 'P']).order_by('tag_number'))
+    ctx.progress(10, f"{len(goats)} QR codes")
+    ctx.write_artifact('goat_qr_tags.pdf', generate_batch_qr_pdf(goats, base_url))
+    return {'filename': 'goat_qr_tags.pdf', 'goats': len(goats)}
+
+
+@job('reminders')
+def reminders_job(ctx, reminder='vaccination', days_ahead=None):
+    """WhatsApp reminders — vaccination / delivery / payment / daily_summary. Outbox ki wajah se dobara chalana safe (duplicate skip)."""
+    from . import notifications
+
+    if reminder == 'vaccination':
+        results = notifications.send_vaccination_reminders(3 if days_ahead is None else days_ahead)
+    elif reminder == 'delivery':
+        results = notifications.send_delivery_reminders(2 if days_ahead is None else days_ahead)
+    elif reminder == 'payment':
+        results = notifications.send_overdue_payment_reminders()
+    elif reminder == 'daily_summary':
+        results = [notifications.send_daily_summary()]
+    else:
+        raise ValueError(f"Unknown reminder type: {reminder}")
+    return {
+        'alerts': len(results),
+        'new': sum(1 for r in results if not r['duplicate']),
+        'sent': sum(1 for r in results if r['status'] == 'SENT'),
+        'results': results,
+    }
+
+
+@job('bulk_import')
+def bulk_import_job(ctx, path, key, layout='template', mode='insert'):
+    """
+    Badi Excel / CSV upload — chunk-wise commit. Har chunk ke saath checkpoint job.result mein;
+    worker mare (requeue_stale) ya job fail ho (retry), agli baar pichhle checkpoint se aage.
+    """
+    from .bulk_import import LAYOUTS, count_rows, import_chunks
+
+    checkpoint = ctx.job.result if isinstance(ctx.job.result, dict) and 'rows' in ctx.job.result else None
+    total = count_rows(path)
+    if checkpoint:
+        ctx.progress(checkpoint['rows'] * 99 // total if total else 0, f"Resume: {checkpoint['rows']} rows ho chuki")
+
+    def save(state):
+        BackgroundJob.objects.filter(pk=ctx.job.pk).update(result=state)
+        pct = state['rows'] * 99 // total if total else 50
+        ctx.progress(pct, f"{state['rows']}{f'/{total}' if total else ''} rows — {state['success']} imported")
+
+    report = import_chunks(path, key, LAYOUTS[layout], state=checkpoint, save=save, mode=mode)
+    shutil.rmtree(Path(path).parent, ignore_errors=True)    # upload ka kaam khatam
+    return report
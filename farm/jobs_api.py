@@ -0,0 +1,57 @@
+from ninja import Router
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+
+from .jobs import can_access, job_payload, retry
+from .models import BackgroundJob
+
+# Background jobs ka status / download — enqueue wale endpoints 202 + status_url dete hain,
+# frontend yahan poll karta hai. Auth api-level (SessionAuth) se aata hai.
+jobs_api = Router(tags=["Jobs"])
+
+
+def _get_job(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id)
+    if not can_access(request.user, job):
+        raise Http404("Job nahi mila")
+    return job
+
+
+@jobs_api.get("/")
+def list_jobs(request, status: str = None, limit: int = 20):
+    """Apne recent jobs (staff ko sabke)."""
+    qs = BackgroundJob.objects.all()
+    if not request.user.is_staff:
+        qs = qs.filter(created_by=request.user)
+    if status:
+        qs = qs.filter(status=status.upper())
+    return [job_payload(j) for j in qs[:min(limit, 100)]]
+
+
+@jobs_api.get("/{job_id}/")
+def get_job(request, job_id: int):
+    """Status + progress — DONE hone par download_url."""
+    return job_payload(_get_job(request, job_id))
+
+
+@jobs_api.get("/{job_id}/download/")
+def download_job_artifact(request, job_id: int):
+    """Job ki result file (Excel / ZIP / PDF)."""
+    job = _get_job(request, job_id)
+    if job.status != 'DONE' or not job.artifact:
+        raise Http404("File abhi ready nahi hai")
+    try:
+        handle = job.artifact.open('rb')
+    except FileNotFoundError:
+        raise Http404("File expire ho gayi — job dobara chalao")
+    return FileResponse(handle, as_attachment=True, filename=job.artifact.name.rsplit('/', 1)[-1])
+
+
+@jobs_api.post("/{job_id}/retry/", response={200: dict, 409: dict})
+def retry_job(request, job_id: int):
+    """FAILED job dobara queue — bulk import pichhle checkpoint se resume hota hai."""
+    job = _get_job(request, job_id)
+    if not retry(job):
+        return 409, {'error': f"Sirf FAILED job retry ho sakta hai (abhi {job.status})"}
+    job.refresh_from_db()
+    return 200, job_payload(job)
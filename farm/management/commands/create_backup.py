@@ -0,0 +1,98 @@
+"""
+python manage.py create_backup
+Backup seedha settings.BACKUP_DIR mein likho — cron / scheduler ke liye.
+Download wale hi streaming writers use hote hain, isliye memory database size se nahi badhti.
+Hamesha `default` DB se padhta hai (analytics copy / replica nahi) — backup purana nahi hona chahiye.
+
+    python manage.py create_backup                   # ZIP (JSON + Excel + README)
+    python manage.py create_backup --format ndjson   # sirf data, line-by-line
+    python manage.py create_backup --dir /mnt/backups --keep 30
+    python manage.py create_backup --incremental     # nightly: sirf badle rows (farm/incremental_backup.py)
+
+Latest --keep (default settings.BACKUP_KEEP) backups rakhe jaate hain, purane delete.
+--incremental mein --keep chains ginta hai (full base + uske incrementals); har
+BACKUP_INCREMENTAL_CHAIN incrementals ke baad naya full base banta hai (--full se abhi).
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from farm.backup_stream import (
+    iter_json_backup, iter_ndjson_backup, iter_zip, pinned_querysets, prune_backups, write_backup_file,
+)
+from farm.backup_views import ALL_MODELS, zip_backup_members
+from farm.incremental_backup import (
+    build_manifest, changed_ranges, iter_incremental_backup, latest_manifest, prune_chains, write_manifest,
+)
+
+EXTENSIONS = {'zip': 'zip', 'json': 'json', 'ndjson': 'ndjson'}
+
+
+class Command(BaseCommand):
+    help = 'Write a streaming backup (zip / json / ndjson) into BACKUP_DIR'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXTENSIONS), default='zip')
+        parser.add_argument('--dir', help='default: settings.BACKUP_DIR')
+        parser.add_argument('--keep', type=int, help='kitne latest backups rakhne hain (0 = sab)')
+        parser.add_argument('--incremental', action='store_true',
+                            help='pichle backup ke baad badle rows hi (NDJSON + manifest)')
+        parser.add_argument('--full', action='store_true', help='--incremental ke saath: naya chain base')
+
+    def handle(self, *args, **options):
+        directory = Path(options['dir'] or getattr(settings, 'BACKUP_DIR', Path(settings.BASE_DIR) / 'backups'))
+        keep = options['keep'] if options['keep'] is not None else getattr(settings, 'BACKUP_KEEP', 7)
+        fmt = options['format']
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        started = time.monotonic()
+        if options['incremental']:
+            return self._incremental(directory, keep, timestamp, options['full'], started)
+        # analytics_reads() nahi — ANALYTICS_SQLITE_COPY purani copy ho sakti hai; disk backup hamesha `default` se
+        if fmt == 'zip':
+            chunks = iter_zip(zip_backup_members(timestamp))
+        elif fmt == 'ndjson':
+            chunks = iter_ndjson_backup(pinned_querysets(ALL_MODELS))
+        else:
+            chunks = iter_json_backup(pinned_querysets(ALL_MODELS))
+        pattern = f"farm_backup_*.{EXTENSIONS[fmt]}"
+        path = directory / pattern.replace('*', timestamp)
+        size = write_backup_file(chunks, path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Backup: {path} ({size / (1024 * 1024):.1f} MB, {time.monotonic() - started:.2f}s)"
+        ))
+        for old in prune_backups(directory, pattern, keep):
+            self.stdout.write(f"   🗑️ purana backup hataya: {old.name}")
+
+    def _incremental(self, directory, keep, timestamp, force_full, started):
+        parent = None if force_full else latest_manifest(directory)
+        if parent and parent['chain_length'] >= getattr(settings, 'BACKUP_INCREMENTAL_CHAIN', 7):
+            parent = None
+
+        # `default` se — analytics copy par manifest ke watermarks purane hote, badle rows chhoot jaate
+        querysets = pinned_querysets(ALL_MODELS)
+        # Manifest aur rows ek hi read transaction (snapshot) mein — beech ke writes agli baar pakde jaate hain
+        with transaction.atomic(using=querysets[0][1].db):
+            models = build_manifest(querysets)
+            if parent:
+                ranges = changed_ranges(parent['models'], models)
+                path = directory / f"farm_incr_{timestamp}.ndjson"
+                chunks = iter_incremental_backup(querysets, ranges, {'parent': parent['backup']})
+            else:
+                path = directory / f"farm_base_{timestamp}.ndjson"
+                chunks = iter_ndjson_backup(querysets)
+            size = write_backup_file(chunks, path)
+        write_manifest(path, models, parent)
+
+        kind = f"incremental (parent {parent['backup']})" if parent else 'full (naya chain base)'
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Backup: {path} — {kind}, {size / (1024 * 1024):.2f} MB, {time.monotonic() - started:.2f}s"
+        ))
+        for old in prune_chains(directory, keep):
+            self.stdout.write(f"   🗑️ purana backup hataya: {old.name}")
@@ -0,0 +1,51 @@
+"""
+python manage.py dedupe_weights
+Migration 0008 (WeightRecord (goat, date) unique) se pehle duplicate weight rows saaf karo —
+migrate duplicates dekh ke ruk jaata hai, khud kuch delete nahi karta.
+
+    python manage.py dedupe_weights --dry-run     # sirf dikhao kaunsi rows hategi
+    python manage.py dedupe_weights               # har (goat, date) ki sabse nayi row (max id) rakho, baaki delete
+    python manage.py migrate
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max
+
+from farm.models import WeightRecord
+
+
+class Command(BaseCommand):
+    help = 'Delete duplicate WeightRecord rows per (goat, date), keeping the newest — run before migrating to 0008'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='kuch delete mat karo, sirf list')
+
+    def handle(self, *args, **options):
+        dupes = list(
+            WeightRecord.objects.values('goat_id', 'goat__tag_number', 'date')
+            .annotate(n=Count('id'), keep=Max('id'))
+            .filter(n__gt=1)
+            .order_by('goat_id', 'date')
+        )
+        if not dupes:
+            self.stdout.write(self.style.SUCCESS('✅ Koi duplicate WeightRecord nahi — migrate chala sakte ho'))
+            return
+
+        deleted = 0
+        with transaction.atomic():
+            for row in dupes:
+                extra = WeightRecord.objects.filter(goat_id=row['goat_id'], date=row['date']).exclude(id=row['keep'])
+                removed = list(extra.values_list('id', 'weight'))
+                # Hatayi rows (id, weight) output mein — zaroorat ho to wapas daal sakein
+                self.stdout.write(
+                    f"  {row['goat__tag_number']} (goat #{row['goat_id']}) {row['date']}: kept id={row['keep']}, "
+                    f"{'would delete' if options['dry_run'] else 'deleted'} (id, weight) {removed}"
+                )
+                if not options['dry_run']:
+                    deleted += extra.delete()[0]
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"⚠️ Dry run — {len(dupes)} (goat, date) pairs, kuch delete nahi hua"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {deleted} duplicate WeightRecord row(s) deleted — ab migrate chalao"))
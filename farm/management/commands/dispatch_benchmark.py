@@ -0,0 +1,119 @@
+"""
+python manage.py dispatch_benchmark
+WhatsApp dispatch (farm/dispatch.py) ka benchmark — asli Twilio nahi, process ke andar ek fake
+Twilio HTTP server (Messages.json) chalta hai. Kuch bhi bheja / charge nahi hota.
+
+    python manage.py dispatch_benchmark                          # 500 messages, 150ms latency
+    python manage.py dispatch_benchmark --messages 2000 --latency 0.3 --workers 16 --rate 50
+    python manage.py dispatch_benchmark --throttle-every 25      # har 25va request 429 (retry dikhata hai)
+
+Do run: purana tareeka (har message naya client / connection, ek ke baad ek) aur naya
+Dispatcher (shared client, thread pool, rate limit, retry). Dono ka time, msgs/sec, success.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from farm.dispatch import Dispatcher, Message, RetryableError, TwilioClient
+
+
+class FakeTwilio(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency, throttle_every):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), FakeTwilioHandler)
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive, jaise asli API
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        with self.server.lock:
+            self.server.requests += 1
+            n = self.server.requests
+        time.sleep(self.server.latency)
+        every = self.server.throttle_every
+        if every and n % every == 0:
+            status, body, extra = 429, {'code': 20429, 'message': 'Too Many Requests'}, {'Retry-After': '0'}
+        else:
+            status, body, extra = 201, {'sid': 'SM' + uuid.uuid4().hex, 'status': 'queued'}, {}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in extra.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark bulk WhatsApp dispatch against an in-process fake Twilio server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument('--latency', type=float, default=0.15, help='fake API response time, seconds')
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--rate', type=float, default=0, help='msgs/sec per channel (0 = no limit)')
+        parser.add_argument('--throttle-every', type=int, default=0, help='every Nth request gets HTTP 429')
+        parser.add_argument('--skip-sequential', action='store_true', help='sirf naya Dispatcher chalao')
+
+    def handle(self, *args, **options):
+        server = FakeTwilio(options['latency'], options['throttle_every'])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        messages = [Message(f"+9190000{i:05d}", f"Payment reminder #{i}") for i in range(options['messages'])]
+
+        def client():
+            return TwilioClient('ACfake', 'token', base=base, whatsapp_from='whatsapp:+14155238886')
+
+        try:
+            if not options['skip_sequential']:
+                server.requests = server.connections = 0
+                ok = 0
+                start = time.perf_counter()
+                for msg in messages:
+                    try:
+                        ok += client().send(msg).get('success', False)   # purana: har message naya client
+                    except RetryableError:
+                        pass
+                self._report('sequential, new client each', start, ok, len(messages), server)
+
+            server.requests = server.connections = 0
+            dispatcher = Dispatcher(client(), rate_per_sec=options['rate'], max_workers=options['workers'],
+                                    max_retries=4, backoff=0.05)
+            start = time.perf_counter()
+            results = dispatcher.send_many(messages)
+            ok = sum(1 for r in results if r.get('success'))
+            retried = sum(1 for r in results if r.get('attempts', 1) > 1)
+            self._report(f"dispatcher ({options['workers']} workers)", start, ok, len(messages), server,
+                         f", {retried} retried")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _report(self, label, start, ok, total, server, extra=''):
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:32} {seconds:7.2f}s  {total / seconds:7.1f} msgs/sec  "
+            f"{ok}/{total} sent, {server.requests} requests, {server.connections} connections{extra}"
+        )
@@ -0,0 +1,76 @@
+"""
+python manage.py export_benchmark
+Export pipeline (farm/exports.py) ka benchmark — har writer x dataset: rows, time, rows/sec, file size.
+Farm database se sirf padhta hai (analytics copy ho to wahi); output temp files mein, baad mein delete.
+
+    python manage.py export_benchmark
+    python manage.py export_benchmark --datasets milk,sales --formats xlsx,csv --repeat 3
+    python manage.py export_benchmark --layout report     # backup page wala styled xlsx
+
+Har combination --repeat baar chalta hai, sabse tez run report hota hai.
+"""
+
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from farm.db_router import analytics_reads
+from farm.exports import PARQUET_AVAILABLE, WRITERS, get_datasets
+
+
+class Command(BaseCommand):
+    help = 'Benchmark export writers (xlsx / csv / parquet) per registry dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--datasets', default='all', help="comma-separated registry keys (default: all)")
+        parser.add_argument('--formats', default=','.join(WRITERS))
+        parser.add_argument('--layout', choices=['table', 'report'], default='table', help='xlsx layout')
+        parser.add_argument('--repeat', type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            datasets = get_datasets(options['datasets'])
+        except KeyError as e:
+            raise CommandError(f'Unknown dataset: {e}')
+        formats = [f.strip() for f in options['formats'].split(',')]
+        for fmt in formats:
+            if fmt not in WRITERS:
+                raise CommandError(f"Unknown format: {fmt} (choose: {', '.join(WRITERS)})")
+        if 'parquet' in formats and not PARQUET_AVAILABLE:
+            self.stdout.write(self.style.WARNING('⚠️ pyarrow install nahi hai — parquet skip'))
+            formats.remove('parquet')
+
+        self.stdout.write(f"{'dataset':<13}{'format':<9}{'rows':>9}{'seconds':>10}{'rows/sec':>12}{'size':>11}")
+        totals = {fmt: [0, 0.0] for fmt in formats}
+        with analytics_reads():
+            for dataset in datasets:
+                rows = dataset.queryset().count()
+                for fmt in formats:
+                    seconds, size = min(
+                        self._run(dataset, fmt, options['layout']) for _ in range(max(1, options['repeat']))
+                    )
+                    totals[fmt][0] += rows
+                    totals[fmt][1] += seconds
+                    self.stdout.write(
+                        f"{dataset.key:<13}{fmt:<9}{rows:>9}{seconds:>10.2f}"
+                        f"{rows / seconds if seconds else 0:>12,.0f}{size / 1024:>9.0f}KB"
+                    )
+        for fmt, (rows, seconds) in totals.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {fmt}: {rows} rows, {seconds:.2f}s ({rows / seconds if seconds else 0:,.0f} rows/sec)"
+            ))
+
+    def _run(self, dataset, fmt, layout):
+        writer = WRITERS[fmt](layout=layout) if fmt == 'xlsx' else WRITERS[fmt]()
+        qs = dataset.queryset()
+        started = time.perf_counter()
+        with tempfile.TemporaryFile() as out:
+            if writer.multi_dataset:
+                chunks = writer.chunks([dataset], [qs])
+            else:
+                chunks = writer.chunks(dataset, qs)
+            for chunk in chunks:
+                out.write(chunk)
+            size = out.tell()
+        return time.perf_counter() - started, size
@@ -0,0 +1,111 @@
+"""
+python manage.py loadtest
+Simple HTTP load test — runserver vs `manage.py serve` throughput compare karne ke liye.
+
+    # Terminal 1:  python manage.py runserver 8000         (ya)  python manage.py serve --bind 127.0.0.1:8000
+    # Terminal 2:  python manage.py loadtest --url http://127.0.0.1:8000 --user admin
+
+Scenario (dashboard page jaisa mix): goats list, dashboard stats, notifications,
+static file. Har worker thread ek keep-alive connection reuse karta hai.
+--user diya ho to us user ka session directly bana ke cookie bhejte hain (password nahi chahiye).
+"""
+
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_SCENARIO = [
+    '/api/goats/?page_size=50',
+    '/api/stats/dashboard/',
+    '/api/notifications/?unread_only=true',
+    '/static/admin/css/base.css',
+]
+
+
+class Command(BaseCommand):
+    help = 'Run an HTTP load test against a running server and report throughput / latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--duration', type=int, default=15, help='seconds')
+        parser.add_argument('--user', help='is username ka session cookie bhejo (API auth ke liye)')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='scenario path (repeatable); default: dashboard mix')
+
+    def handle(self, *args, **options):
+        target = urlsplit(options['url'])
+        if target.scheme not in ('http', 'https'):
+            raise CommandError('--url http(s):// se shuru hona chahiye')
+        paths = options['paths'] or DEFAULT_SCENARIO
+        headers = {'Accept-Encoding': 'gzip, br'}
+        if options['user']:
+            headers['Cookie'] = f"{settings.SESSION_COOKIE_NAME}={self._session_for(options['user'])}"
+
+        deadline = time.monotonic() + options['duration']
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def worker(n):
+            conn_cls = http.client.HTTPSConnection if target.scheme == 'https' else http.client.HTTPConnection
+            conn = conn_cls(target.hostname, target.port, timeout=30)
+            local_lat, local_err, i = [], 0, n
+            while time.monotonic() < deadline:
+                path = paths[i % len(paths)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers=headers)
+                    resp = conn.getresponse()
+                    resp.read()
+                    if resp.status >= 400:
+                        local_err += 1
+                    local_lat.append(time.perf_counter() - start)
+                except (OSError, http.client.HTTPException):
+                    local_err += 1
+                    conn.close()
+                    conn = conn_cls(target.hostname, target.port, timeout=30)
+            conn.close()
+            with lock:
+                latencies.extend(local_lat)
+                errors.append(local_err)
+
+        self.stdout.write(
+            f"🔥 {options['url']}  concurrency={options['concurrency']}  duration={options['duration']}s"
+        )
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(worker, range(options['concurrency'])))
+        elapsed = time.monotonic() - started
+
+        if not latencies:
+            raise CommandError('Koi request complete nahi hui — server chal raha hai?')
+        latencies.sort()
+        pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        self.stdout.write(f"  requests      {len(latencies)}  (errors: {sum(errors)})")
+        self.stdout.write(self.style.SUCCESS(f"  throughput    {len(latencies) / elapsed:.1f} req/s"))
+        self.stdout.write(
+            f"  latency ms    mean {statistics.mean(latencies) * 1000:.1f}  "
+            f"p50 {pct(0.50):.1f}  p95 {pct(0.95):.1f}  p99 {pct(0.99):.1f}"
+        )
+
+    def _session_for(self, username):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{username}' nahi mila")
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        return session.session_key
@@ -0,0 +1,23 @@
+"""
+python manage.py rebuild_search_index
+Bulk imports / restore ke baad FTS5 search index dobara banao.
+"""
+
+from django.core.management.base import BaseCommand
+
+from farm.search import rebuild_index, search_available
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 search index (goats, customers, health records, documents)'
+
+    def handle(self, *args, **options):
+        if not search_available():
+            self.stdout.write(self.style.WARNING(
+                '⚠️ FTS5 search index available nahi hai (non-SQLite ya FTS5 missing) — icontains fallback use hoga'
+            ))
+            return
+        counts = rebuild_index()
+        for kind, count in counts.items():
+            self.stdout.write(f"  {kind:<10} {count}")
+        self.stdout.write(self.style.SUCCESS('✅ Search index rebuilt'))
@@ -0,0 +1,51 @@
+"""
+python manage.py refresh_analytics_db
+`default` SQLite database ki read-only analytics copy banao / refresh karo
+(ANALYTICS_SQLITE_COPY=True mode). Cron / scheduler se har kuch ghante chalao —
+ANALYTICS_DB_MAX_AGE se purani copy par router wapas `default` use karta hai.
+
+SQLite online backup API use hota hai — WAL mode mein live writes block nahi hote.
+Copy pehle temp file mein banti hai, phir atomic rename; open connections purani file padhte rehte hain.
+"""
+
+import os
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from farm.db_router import analytics_sqlite_path, reset_availability
+
+
+class Command(BaseCommand):
+    help = 'Refresh the read-only SQLite analytics copy using the SQLite backup API'
+
+    def handle(self, *args, **options):
+        target = analytics_sqlite_path()
+        if not target:
+            raise CommandError(
+                'ANALYTICS_SQLITE_COPY=True set nahi hai — replica ke liye ANALYTICS_DATABASE_URL use karo'
+            )
+        source = connections['default']
+        if source.vendor != 'sqlite':
+            raise CommandError('default database SQLite nahi hai — analytics ke liye read replica configure karo')
+
+        started = time.monotonic()
+        tmp_path = f"{target}.tmp"
+        source.ensure_connection()
+        dest = sqlite3.connect(tmp_path)
+        try:
+            source.connection.backup(dest)
+            # Copy self-contained rahe (-wal / -shm files ke bina read-only open ho sake)
+            dest.execute("PRAGMA journal_mode=DELETE")
+            dest.execute("PRAGMA optimize")
+        finally:
+            dest.close()
+        os.replace(tmp_path, target)
+        reset_availability()
+
+        size_mb = os.path.getsize(target) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Analytics copy refreshed: {target} ({size_mb:.1f} MB, {time.monotonic() - started:.2f}s)"
+        ))
@@ -0,0 +1,58 @@
+"""
+python manage.py restore_backup <file>
+JSON / NDJSON backup (create_backup ya download wala) restore karo — bade backups jo
+upload limit se bade hain unke liye. WARNING: existing data DELETE hota hai.
+
+    python manage.py restore_backup backups/farm_backup_20260101_020000.ndjson
+    python manage.py restore_backup backup.json --noinput --batch-size 5000
+    python manage.py restore_backup backups/farm_incr_20260107_020000.ndjson   # poori chain replay
+"""
+
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from farm.backup_views import ALL_MODELS
+from farm.incremental_backup import chain_for, manifest_path
+from farm.restore import BackupFormatError, restore_chain, DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Restore a JSON / NDJSON backup (replaces all farm data)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--noinput', action='store_true', help='confirmation mat poochho')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if not options['noinput']:
+            answer = input('⚠️ Saara farm data DELETE hokar backup se restore hoga. Continue? [y/N] ')
+            if answer.strip().lower() not in ('y', 'yes'):
+                raise CommandError('Restore cancel kiya')
+
+        try:
+            # Manifest wali file (create_backup --incremental) → base se is file tak poori chain
+            paths = chain_for(options['path']) if manifest_path(options['path']).exists() else [options['path']]
+            if len(paths) > 1:
+                self.stdout.write(f"🔗 Chain: {' → '.join(str(p).rsplit('/', 1)[-1] for p in paths)}")
+            with ExitStack() as stack:
+                files = [stack.enter_context(open(p, 'rb')) for p in paths]
+                report = restore_chain(files, ALL_MODELS, batch_size=options['batch_size'])
+        except OSError as e:
+            raise CommandError(f'File nahi khuli: {e}')
+        except (BackupFormatError, IntegrityError) as e:
+            raise CommandError(f'Restore fail (koi change nahi hua): {e}')
+
+        for key, result in report['results'].items():
+            if result['restored'] or result['deleted']:
+                self.stdout.write(
+                    f"  {key:<22} deleted {result['deleted']:>7}  restored {result['restored']:>7}  "
+                    f"{result['seconds']:.2f}s"
+                )
+        for key, error in report['errors'].items():
+            self.stdout.write(self.style.ERROR(f"  ❌ {key}: {error['restore_error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {report['rows']} rows, {report['seconds']}s ({report['rows_per_sec']} rows/sec)"
+        ))
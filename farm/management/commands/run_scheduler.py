@@ -0,0 +1,108 @@
+"""
+python manage.py run_scheduler
+Periodic kaam (farm/scheduler.py) — reminders, daily summary, custom reminders, weather refresh,
+dashboard cache warmup. Schedules DB mein (admin → Scheduled Tasks), pehli baar defaults bante hain.
+
+    python manage.py run_scheduler                  # hamesha chalta rahe (systemd / docker-compose scheduler)
+    python manage.py run_scheduler --once           # jo due hai chalao, phir exit (system cron se har minute)
+    python manage.py run_scheduler --list           # tasks, agla run, last status
+    python manage.py run_scheduler --run daily-summary   # abhi chalao (history mein likha jaata hai)
+
+Kai processes chalao to bhi ek hi leader (SchedulerLease) tasks chalata hai; baaki standby.
+SIGTERM / Ctrl+C par current task poora karke lease chhod ke exit.
+"""
+
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from farm.models import ScheduledTask
+from farm.scheduler import acquire_lease, ensure_defaults, prune_history, release_lease, run_due, run_task
+
+
+class Command(BaseCommand):
+    help = 'Run the periodic task scheduler (DB-defined cron schedules, single leader via DB lease)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='due tasks chalao, phir exit')
+        parser.add_argument('--list', action='store_true', help='scheduled tasks dikhao')
+        parser.add_argument('--run', metavar='NAME', help='ek task abhi chalao (schedule ignore)')
+        parser.add_argument('--tick', type=float, help='seconds (default: settings.SCHEDULER_TICK_SECONDS)')
+
+    def handle(self, *args, **options):
+        created = ensure_defaults()
+        if created:
+            self.stdout.write(self.style.SUCCESS(f"🗓️ {created} default schedule(s) banaye"))
+        if options['list']:
+            return self._list()
+
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        if options['run']:
+            scheduled = ScheduledTask.objects.filter(name=options['run']).first()
+            if scheduled is None:
+                raise CommandError(f"Unknown scheduled task: {options['run']}")
+            return self._report(run_task(scheduled, name, timezone.now()))
+
+        if options['once']:
+            if not acquire_lease(name):
+                self.stdout.write(self.style.WARNING("⏸️ Doosra scheduler leader hai — kuch nahi kiya"))
+                return
+            try:
+                for run in run_due(name):
+                    self._report(run)
+            finally:
+                release_lease(name)
+            return
+
+        stop = threading.Event()
+
+        def shutdown(signum, frame):
+            self.stdout.write(f"🛑 Signal {signum} — current task ke baad band")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        tick = options['tick'] or getattr(settings, 'SCHEDULER_TICK_SECONDS', 15)
+        self.stdout.write(self.style.SUCCESS(f"🗓️ Scheduler {name} shuru (tick {tick}s)"))
+        leader, last_prune = False, 0.0
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                if acquire_lease(name):
+                    if not leader:
+                        self.stdout.write(self.style.SUCCESS("👑 Lease mili — tasks yahi process chalayega"))
+                        leader = True
+                    for run in run_due(name):
+                        self._report(run)
+                    if time.monotonic() - last_prune > 3600:
+                        prune_history()
+                        last_prune = time.monotonic()
+                elif leader:
+                    self.stdout.write(self.style.WARNING("⏸️ Lease gayi — standby"))
+                    leader = False
+                stop.wait(tick)
+        finally:
+            release_lease(name)
+        self.stdout.write(self.style.SUCCESS("✅ Scheduler band"))
+
+    def _report(self, run):
+        line = f"{'✅' if run.status == 'DONE' else '❌'} {run.task.name} — {run.status}"
+        if run.finished_at:
+            line += f" ({(run.finished_at - run.started_at).total_seconds():.1f}s)"
+        self.stdout.write(line if run.status == 'DONE' else self.style.ERROR(line + f"\n{run.error[-500:]}"))
+
+    def _list(self):
+        for t in ScheduledTask.objects.all():
+            next_run = timezone.localtime(t.next_run_at).strftime('%Y-%m-%d %H:%M:%S') if t.next_run_at else '—'
+            self.stdout.write(
+                f"{'●' if t.enabled else '○'} {t.name:24} {t.schedule:16} next {next_run:19}  "
+                f"last {t.last_status or '—'}"
+            )
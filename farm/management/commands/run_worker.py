@@ -0,0 +1,47 @@
+"""
+python manage.py run_worker
+Background jobs (farm/jobs.py) chalao — Excel / ZIP exports, QR PDF, WhatsApp reminders.
+Queue BackgroundJob table hai, koi broker nahi; ek se zyada workers safe hain.
+
+    python manage.py run_worker                  # hamesha chalta rahe (systemd / docker-compose worker)
+    python manage.py run_worker --once           # queue khaali hone tak, phir exit (cron)
+    python manage.py run_worker --poll 5 --max-jobs 100
+
+SIGTERM / Ctrl+C par current job poora karke exit hota hai.
+"""
+
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+
+from farm.jobs import requeue_stale, work
+
+
+class Command(BaseCommand):
+    help = 'Run the background job worker (DB-backed queue)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='queue khaali hote hi exit')
+        parser.add_argument('--poll', type=float, help='seconds (default: settings.JOB_POLL_INTERVAL)')
+        parser.add_argument('--max-jobs', type=int, help='itne jobs ke baad exit (memory leaks se bachne ke liye)')
+
+    def handle(self, *args, **options):
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        stop = threading.Event()
+
+        def shutdown(signum, frame):
+            self.stdout.write(f"🛑 Signal {signum} — current job ke baad band")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        recovered = requeue_stale()
+        if recovered:
+            self.stdout.write(self.style.WARNING(f"♻️ {recovered} stale job(s) requeue / fail kiye"))
+        self.stdout.write(self.style.SUCCESS(f"👷 Worker {name} shuru"))
+        done = work(name, once=options['once'], max_jobs=options['max_jobs'], stop=stop, poll=options['poll'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {done} job(s) complete"))
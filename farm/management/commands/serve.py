@@ -0,0 +1,97 @@
+"""
+python manage.py serve
+Production server — gunicorn + uvicorn workers (goat_farm/gunicorn.conf.py).
+
+    python manage.py serve                       # config defaults (CPU count se workers)
+    python manage.py serve --workers 4 --bind 0.0.0.0:9000
+    python manage.py serve --collectstatic       # pehle static files collect + compress
+    python manage.py serve --no-worker           # job worker alag chal raha hai (docker-compose worker service)
+
+Saath mein ek background job worker (run_worker) bhi chalta hai — exports / reminders ke jobs
+warna QUEUED hi rehte. Alag worker process / service ho to --no-worker (ya SERVE_JOB_WORKER=0).
+
+Windows par gunicorn nahi chalta — wahan uvicorn multi-process mode use hota hai.
+Process exec() se replace hota hai, taaki signals (SIGTERM) seedhe server ko milein.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+ASGI_APP = 'goat_farm.asgi:application'
+GUNICORN_CONF = Path(settings.BASE_DIR) / 'goat_farm' / 'gunicorn.conf.py'
+
+
+class Command(BaseCommand):
+    help = 'Run the production ASGI server (gunicorn + uvicorn workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', help='host:port (default: config / $PORT)')
+        parser.add_argument('--workers', type=int, help='worker processes (default: 2 x CPU + 1)')
+        parser.add_argument('--collectstatic', action='store_true',
+                            help='start se pehle collectstatic --noinput chalao')
+        parser.add_argument('--no-worker', action='store_true',
+                            help='background job worker (run_worker) saath mein mat chalao')
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ DEBUG=True hai — production ke liye DJANGO_SETTINGS_MODULE=goat_farm.settings_production set karo'
+            ))
+        if options['collectstatic']:
+            call_command('collectstatic', interactive=False, verbosity=1)
+
+        # Worker processes naye interpreter hain — settings module env se hi milega
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'goat_farm.settings')
+        if options['workers']:
+            os.environ['WEB_CONCURRENCY'] = str(options['workers'])
+        if options['bind']:
+            os.environ['GUNICORN_BIND'] = options['bind']
+        if options['no_worker']:
+            os.environ['SERVE_JOB_WORKER'] = '0'
+
+        argv = self._gunicorn_argv() if os.name != 'nt' else None
+        if argv is None:
+            argv = self._uvicorn_argv(options)
+            self._spawn_worker()
+
+        self.stdout.write(self.style.SUCCESS(f"🚀 {' '.join(argv)}"))
+        sys.stdout.flush()
+        os.execvp(argv[0], argv)
+
+    def _gunicorn_argv(self):
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:
+            return None
+        return [sys.executable, '-m', 'gunicorn', '-c', str(GUNICORN_CONF), ASGI_APP]
+
+    def _spawn_worker(self):
+        """
+        uvicorn fallback: gunicorn.conf.py wala hook nahi hai, to exec se pehle worker child start karo.
+        Server band hone par ye apne aap nahi rukta — Windows / dev ke liye hi hai.
+        """
+        if os.environ.get('SERVE_JOB_WORKER', '1') == '0':
+            return
+        worker = subprocess.Popen([sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'run_worker'])
+        self.stdout.write(f"👷 Job worker pid {worker.pid}")
+
+    def _uvicorn_argv(self, options):
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise CommandError('gunicorn / uvicorn installed nahi hain — pip install -r requirements.txt')
+        host, _, port = (options['bind'] or f"0.0.0.0:{os.environ.get('PORT', '8000')}").rpartition(':')
+        workers = options['workers'] or os.cpu_count() or 1
+        return [
+            sys.executable, '-m', 'uvicorn', ASGI_APP,
+            '--host', host or '0.0.0.0', '--port', port,
+            '--workers', str(workers),
+            '--timeout-keep-alive', os.environ.get('GUNICORN_KEEPALIVE', '5'),
+            '--limit-max-requests', os.environ.get('GUNICORN_MAX_REQUESTS', '1000'),
+        ]
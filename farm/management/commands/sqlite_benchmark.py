@@ -0,0 +1,128 @@
+"""
+python manage.py sqlite_benchmark
+Concurrency benchmark — saath chalte readers (analytics jaisi GROUP BY) aur writers
+(milk entry jaise single-row INSERT). Temp database file par chalta hai, asli data ko
+touch nahi karta.
+
+    python manage.py sqlite_benchmark --readers 4 --writers 4 --duration 10
+
+Do rounds chalte hain:
+- default → aaj ka Django setup (rollback journal, synchronous=FULL, 5s timeout)
+- tuned   → settings.SQLITE_PRAGMAS (WAL, NORMAL, busy_timeout, ...)
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from farm.sqlite_tuning import apply_pragmas, get_pragmas
+
+SCHEMA = """
+CREATE TABLE milk (id INTEGER PRIMARY KEY, goat_id INTEGER, date TEXT, quantity REAL);
+CREATE INDEX milk_goat_date ON milk (goat_id, date);
+"""
+READ_SQL = "SELECT goat_id, COUNT(*), SUM(quantity), AVG(quantity) FROM milk GROUP BY goat_id"
+WRITE_SQL = "INSERT INTO milk (goat_id, date, quantity) VALUES (?, date('now'), ?)"
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent SQLite readers/writers with default vs tuned pragmas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--duration', type=int, default=10, help='seconds per round')
+        parser.add_argument('--rows', type=int, default=50000, help='seed rows')
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode, pragmas in (('default', {}), ('tuned', get_pragmas())):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'bench.sqlite3')
+                self._seed(path, options['rows'])
+                results[mode] = self._round(path, pragmas, options)
+            self._report(mode, results[mode])
+
+        base, tuned = results['default'], results['tuned']
+        if base['writes'] and base['reads']:
+            self.stdout.write(self.style.SUCCESS(
+                f"⚡ tuned vs default — writes x{tuned['writes'] / base['writes']:.1f}, "
+                f"reads x{tuned['reads'] / base['reads']:.1f}, "
+                f"locked errors {base['errors']} → {tuned['errors']}"
+            ))
+
+    def _seed(self, path, rows):
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO milk (goat_id, date, quantity) VALUES (?, date('now', ?), ?)",
+            ((random.randint(1, 500), f"-{random.randint(0, 365)} days", random.uniform(0.5, 4))
+             for _ in range(rows)),
+        )
+        conn.commit()
+        conn.close()
+
+    def _round(self, path, pragmas, options):
+        deadline = time.monotonic() + options['duration']
+        stats = {'reads': 0, 'writes': 0, 'errors': 0, 'write_ms': []}
+        lock = threading.Lock()
+
+        def connect():
+            # timeout=5 — Django ki default sqlite3 connection jaisa; tuned round mein busy_timeout override
+            conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+            apply_pragmas(conn, pragmas)
+            return conn
+
+        def reader():
+            conn, reads, errors = connect(), 0, 0
+            while time.monotonic() < deadline:
+                try:
+                    conn.execute(READ_SQL).fetchall()
+                    reads += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+            conn.close()
+            with lock:
+                stats['reads'] += reads
+                stats['errors'] += errors
+
+        def writer():
+            conn, writes, errors, lat = connect(), 0, 0, []
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    conn.execute(WRITE_SQL, (random.randint(1, 500), random.uniform(0.5, 4)))
+                    writes += 1
+                    lat.append((time.perf_counter() - start) * 1000)
+                except sqlite3.OperationalError:
+                    errors += 1
+            conn.close()
+            with lock:
+                stats['writes'] += writes
+                stats['errors'] += errors
+                stats['write_ms'].extend(lat)
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer) for _ in range(options['writers'])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats['duration'] = options['duration']
+        return stats
+
+    def _report(self, mode, stats):
+        lat = sorted(stats['write_ms']) or [0]
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        self.stdout.write(
+            f"{mode:<8} reads {stats['reads'] / stats['duration']:>8.1f}/s   "
+            f"writes {stats['writes'] / stats['duration']:>8.1f}/s   "
+            f"write p50 {statistics.median(lat):.2f} ms  p95 {p95:.2f} ms   "
+            f"locked errors {stats['errors']}"
+        )
@@ -0,0 +1,62 @@
+"""
+python manage.py sqlite_maintenance
+Periodic SQLite upkeep — cron / scheduler se roz (ya har kuch ghante) chalao.
+
+    python manage.py sqlite_maintenance                 # PRAGMA optimize + WAL checkpoint(TRUNCATE)
+    python manage.py sqlite_maintenance --analyze       # poora ANALYZE bhi
+    python manage.py sqlite_maintenance --vacuum        # file compact (exclusive lock — off-hours mein)
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+
+def _size_kb(path):
+    return round(os.path.getsize(path) / 1024, 1) if os.path.exists(path) else 0
+
+
+class Command(BaseCommand):
+    help = 'Run PRAGMA optimize and a WAL checkpoint on the SQLite database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--checkpoint', default='TRUNCATE', choices=CHECKPOINT_MODES)
+        parser.add_argument('--analyze', action='store_true', help='poora ANALYZE chalao')
+        parser.add_argument('--vacuum', action='store_true', help='VACUUM — file compact karo')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"'{options['database']}' SQLite database nahi hai")
+
+        db_path = str(connection.settings_dict['NAME'])
+        wal_path = f"{db_path}-wal"
+        self.stdout.write(f"📦 {db_path}  db={_size_kb(db_path)} KB  wal={_size_kb(wal_path)} KB")
+
+        with connection.cursor() as cursor:
+            if options['analyze']:
+                cursor.execute("ANALYZE")
+                self.stdout.write("  ANALYZE done")
+            cursor.execute("PRAGMA optimize")
+            self.stdout.write("  PRAGMA optimize done")
+
+            cursor.execute(f"PRAGMA wal_checkpoint({options['checkpoint']})")
+            busy, log_frames, checkpointed = cursor.fetchone()
+            if busy:
+                self.stdout.write(self.style.WARNING(
+                    f"  ⚠️ checkpoint busy — {checkpointed}/{log_frames} frames (readers active, baad mein dobara chalao)"
+                ))
+            else:
+                self.stdout.write(f"  wal_checkpoint({options['checkpoint']}) — {checkpointed}/{log_frames} frames")
+
+            if options['vacuum']:
+                cursor.execute("VACUUM")
+                self.stdout.write("  VACUUM done")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ db={_size_kb(db_path)} KB  wal={_size_kb(wal_path)} KB"
+        ))
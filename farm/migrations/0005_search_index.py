@@ -0,0 +1,61 @@
+# FTS5 search index — sirf SQLite par; baaki backends par no-op (icontains fallback)
+
+from django.db import migrations
+
+CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS farm_search_index USING fts5(
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+POPULATE_SQL = [
+    """INSERT INTO farm_search_index (kind, object_id, title, body)
+       SELECT 'goat', id, tag_number || ' ' || name, breed || ' ' || color || ' ' || notes
+       FROM farm_goat""",
+    """INSERT INTO farm_search_index (kind, object_id, title, body)
+       SELECT 'customer', id, name, contact || ' ' || email || ' ' || address
+       FROM farm_customer""",
+    """INSERT INTO farm_search_index (kind, object_id, title, body)
+       SELECT 'health', h.id, g.tag_number || ' ' || g.name,
+              h.description || ' ' || h.medicine_used || ' ' || h.veterinarian
+       FROM farm_healthrecord h JOIN farm_goat g ON g.id = h.goat_id""",
+    """INSERT INTO farm_search_index (kind, object_id, title, body)
+       SELECT 'document', id, title, tags || ' ' || document_number
+       FROM farm_document""",
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_SQL)
+        except Exception:
+            # SQLite FTS5 ke bina compiled hai — search icontains par chalega
+            return
+        for sql in POPULATE_SQL:
+            cursor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS farm_search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm', '0004_alter_credit_status_alter_goat_breed'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
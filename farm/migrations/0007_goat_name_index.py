@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm', '0006_background_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='goat',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# WeightRecord (goat, date) unique — upsert import ki natural key.
+# Pehle se duplicate rows ho to migration ruk jaati hai aur (goat, date) pairs dikhati hai — kaunsi row
+# rakhni hai ye operator tay kare: `python manage.py dedupe_weights --dry-run`, phir bina --dry-run, phir migrate.
+
+from django.core.management.base import CommandError
+from django.db import migrations
+from django.db.models import Count
+
+SHOWN = 20
+
+
+def check_duplicate_weights(apps, schema_editor):
+    WeightRecord = apps.get_model('farm', 'WeightRecord')
+    dupes = list(
+        WeightRecord.objects.values('goat_id', 'goat__tag_number', 'date')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .order_by('goat_id', 'date')
+    )
+    if not dupes:
+        return
+    pairs = '\n'.join(
+        f"  {row['goat__tag_number']} (goat #{row['goat_id']}) {row['date']}: {row['n']} rows" for row in dupes[:SHOWN]
+    )
+    more = f"\n  … aur {len(dupes) - SHOWN}" if len(dupes) > SHOWN else ''
+    raise CommandError(
+        f"WeightRecord mein {len(dupes)} duplicate (goat, date) pair(s) — (goat, date) unique nahi ban sakta:\n"
+        f"{pairs}{more}\n"
+        "Pehle `python manage.py dedupe_weights --dry-run` se dekho, phir `python manage.py dedupe_weights` "
+        "(har pair ki sabse nayi row rehti hai) ya admin se khud theek karo — phir migrate dobara chalao."
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm', '0007_goat_name_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_weights, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='weightrecord',
+            unique_together={('goat', 'date')},
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.28 on 2026-10-19 04:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm', '0009_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('task', models.CharField(max_length=50)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('schedule', models.CharField(help_text="cron: minute hour day month weekday — e.g. '0 7 * * *'", max_length=100)),
+                ('jitter_seconds', models.PositiveIntegerField(default=0)),
+                ('enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, max_length=10)),
+            ],
+            options={
+                'verbose_name_plural': 'Scheduled Tasks (अनुसूचित कार्य)',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SchedulerLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('holder', models.CharField(max_length=100)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScheduledTaskRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='RUNNING', max_length=10)),
+                ('scheduled_for', models.DateTimeField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('holder', models.CharField(blank=True, max_length=100)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='farm.scheduledtask')),
+            ],
+            options={
+                'verbose_name_plural': 'Scheduler Runs (कार्य इतिहास)',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['task', 'started_at'], name='farm_schedu_task_id_132653_idx')],
+            },
+        ),
+    ]
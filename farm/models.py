@@ -32,7 +32,7 @@ class Goat(models.Model):
     STATUS_CHOICES = [('A', 'Active'), ('P', 'Pregnant'), ('S', 'Sold'), ('D', 'Dead')]
     
     tag_number = models.CharField(max_length=50, unique=True)
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)  # admin sheets goat ko naam se dhoondhti hain
     breed = models.CharField(max_length=20, choices=BREED_CHOICES)
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES)
     color = models.CharField(max_length=100)
@@ -192,6 +192,20 @@ class FeedInventory(models.Model):
         verbose_name_plural = "Feed Inventory (चारा इन्वेंटरी)"
 
 
+class FeedConsumptionQuerySet(models.QuerySet):
+    def delete(self):
+        # Bulk delete (admin / API): post_delete receiver quantities yahan jodta hai (origin=self),
+        # phir har feed ka ek restock UPDATE — row-by-row nahi (farm/feed_stock.py)
+        from collections import defaultdict
+        from django.db import router, transaction
+        from .feed_stock import restock_totals
+        self._restock = defaultdict(float)
+        with transaction.atomic(using=self._db or router.db_for_write(self.model)):
+            result = super().delete()
+            restock_totals(self._restock)
+        return result
+
+
 class FeedConsumption(models.Model):
     """चारा खपत - Feed Consumption"""
     date = models.DateField()
@@ -199,34 +213,31 @@ class FeedConsumption(models.Model):
     quantity_consumed = models.FloatField(validators=[MinValueValidator(0)])
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = FeedConsumptionQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # DB wali (feed, quantity) yaad rakho — edit par stock difference ke liye dobara get() nahi
+        instance = super().from_db(db, field_names, values)
+        instance._stock_state = (instance.__dict__.get('feed_id'), instance.__dict__.get('quantity_consumed'))
+        return instance
+
     def save(self, *args, **kwargs):
-        from django.core.exceptions import ValidationError
-        if not self.pk:
-            # NEW record: stock check karo aur deduct karo
-            feed = FeedInventory.objects.get(pk=self.feed_id)
-            if self.quantity_consumed > feed.quantity:
-                raise ValidationError(
-                    f"Insufficient stock: available {feed.quantity} {feed.unit}, "
-                    f"requested {self.quantity_consumed} {feed.unit}"
-                )
-            FeedInventory.objects.filter(pk=self.feed_id).update(
-                quantity=models.F('quantity') - self.quantity_consumed
-            )
-        else:
-            # EDIT: purana record fetch karo, difference adjust karo
-            old_record = FeedConsumption.objects.get(pk=self.pk)
-            diff = self.quantity_consumed - old_record.quantity_consumed
-            if diff != 0:
-                feed = FeedInventory.objects.get(pk=self.feed_id)
-                if diff > 0 and diff > feed.quantity:
-                    raise ValidationError(
-                        f"Insufficient stock: available {feed.quantity} {feed.unit}, "
-                        f"additional requested {diff} {feed.unit}"
-                    )
-                FeedInventory.objects.filter(pk=self.feed_id).update(
-                    quantity=models.F('quantity') - diff
-                )
-        super().save(*args, **kwargs)
+        # Stock ledger (farm/feed_stock.py): check + decrement ek conditional UPDATE, race-free
+        from django.db import transaction
+        from .feed_stock import apply_change
+        from .watermarks import touch
+        old = None
+        if not self._state.adding:
+            old = getattr(self, '_stock_state', (None, None))
+            if None in old:   # deferred fields / bina from_db ke bana instance
+                old = FeedConsumption.objects.filter(pk=self.pk).values_list('feed_id', 'quantity_consumed').first()
+        new = (self.feed_id, self.quantity_consumed)
+        with transaction.atomic():
+            apply_change(old, new)
+            super().save(*args, **kwargs)
+        self._stock_state = new
+        touch(FeedInventory)  # update() signal nahi bhejta — watermark khud bump karo
 
     def __str__(self):
         return f"{self.feed.feed_name} - {self.date} ({self.quantity_consumed} {self.feed.unit})"
@@ -264,7 +275,9 @@ class Sale(models.Model):
         super().save(*args, **kwargs)
         # Auto-update goat status to 'S' (Sold) when a goat sale is recorded
         if self.sale_type == 'G' and self.goat and self.goat.status != 'S':
+            from .watermarks import touch
             Goat.objects.filter(pk=self.goat_id).update(status='S')
+            touch(Goat)
 
     def __str__(self):
         return f"{self.get_sale_type_display()} - {self.total_amount}"
@@ -321,6 +334,7 @@ class WeightRecord(models.Model):
 
     class Meta:
         ordering = ['-date']
+        unique_together = ['goat', 'date']     # natural key — upsert import isi par
         verbose_name_plural = "Weight Records (वजन रिकॉर्ड)"
 
 
@@ -449,7 +463,9 @@ class MortalityRecord(models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         # Auto-update goat status to 'D' (Dead)
+        from .watermarks import touch
         Goat.objects.filter(pk=self.goat_id).update(status='D')
+        touch(Goat)
 
     def __str__(self):
         return f"{self.goat.name} — died {self.death_date} ({self.cause[:50]})"
@@ -788,3 +804,141 @@ class BreedingPlan(models.Model):
     class Meta:
         ordering = ['-start_date']
         verbose_name_plural = "Breeding Plans (प्रजनन योजना)"
+
+
+class BackgroundJob(models.Model):
+    """पृष्ठभूमि कार्य - Background Jobs (exports, backups, reminders — `manage.py run_worker`)"""
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, db_index=True)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='QUEUED')
+    progress = models.PositiveSmallIntegerField(default=0)
+    message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    artifact = models.FileField(upload_to='jobs/', blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(
+        'auth.User', related_name='farm_jobs', on_delete=models.SET_NULL, null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} — {self.get_status_display()} ({self.progress}%)"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+        verbose_name_plural = "Background Jobs (पृष्ठभूमि कार्य)"
+
+
+class OutboxMessage(models.Model):
+    """सूचना आउटबॉक्स - Notification Outbox (reminders ek baar per subject per din — farm/outbox.py)"""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+        ('SKIPPED', 'Skipped'),   # phone nahi / demo mode — sirf log hua
+    ]
+
+    kind = models.CharField(max_length=30)                    # vaccination / delivery / payment / low_feed / daily_summary
+    subject_id = models.PositiveBigIntegerField(default=0)   # VaccinationSchedule / BreedingRecord / Credit / FeedInventory id
+    for_date = models.DateField()
+    recipient = models.CharField(max_length=30, blank=True)
+    channel = models.CharField(max_length=10, default='whatsapp')
+    title = models.CharField(max_length=200)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    provider_sid = models.CharField(max_length=64, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    batch = models.CharField(max_length=32, blank=True)      # drain ka claim token
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind}#{self.subject_id} {self.for_date} — {self.get_status_display()}"
+
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['kind', 'subject_id', 'for_date']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+        verbose_name_plural = "Notification Outbox (सूचना आउटबॉक्स)"
+
+
+class ScheduledTask(models.Model):
+    """अनुसूचित कार्य - Scheduled Tasks (cron-jaisa, `manage.py run_scheduler` — farm/scheduler.py)"""
+    name = models.CharField(max_length=100, unique=True)
+    task = models.CharField(max_length=50)                    # farm/scheduler.py TASKS registry key
+    params = models.JSONField(default=dict, blank=True)
+    schedule = models.CharField(max_length=100, help_text="cron: minute hour day month weekday — e.g. '0 7 * * *'")
+    jitter_seconds = models.PositiveIntegerField(default=0)
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=10, blank=True)
+
+    def __str__(self):
+        return f"{self.name} [{self.schedule}]{'' if self.enabled else ' (disabled)'}"
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        from .scheduler import TASKS, Cron
+        try:
+            Cron(self.schedule)
+        except ValueError as e:
+            raise ValidationError({'schedule': str(e)})
+        if self.task not in TASKS:
+            raise ValidationError({'task': f"Unknown task — choose: {', '.join(sorted(TASKS))}"})
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = "Scheduled Tasks (अनुसूचित कार्य)"
+
+
+class ScheduledTaskRun(models.Model):
+    """कार्य इतिहास - Scheduler Run History"""
+    STATUS_CHOICES = [
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    task = models.ForeignKey(ScheduledTask, related_name='runs', on_delete=models.CASCADE)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='RUNNING')
+    scheduled_for = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    holder = models.CharField(max_length=100, blank=True)
+
+    def __str__(self):
+        return f"{self.task.name} @ {self.started_at:%Y-%m-%d %H:%M} — {self.get_status_display()}"
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [models.Index(fields=['task', 'started_at'])]
+        verbose_name_plural = "Scheduler Runs (कार्य इतिहास)"
+
+
+class SchedulerLease(models.Model):
+    """Scheduler lock — ek waqt mein ek hi run_scheduler process tasks chalata hai."""
+    name = models.CharField(max_length=50, unique=True)
+    holder = models.CharField(max_length=100)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} → {self.holder} (till {self.expires_at:%H:%M:%S})"
@@ -9,6 +9,9 @@ Features:
 - Overdue payment reminders
 - Low feed stock alerts
 - Daily farm summary
+- Custom reminders (CustomReminder.scheduled_time / last_sent) — run_scheduler har minute dekhta hai
+- Bulk sending → farm/dispatch.py (shared client, concurrent, rate limit + retry) — har reminder run ek batch
+- Idempotent   → farm/outbox.py — har alert (kind, subject, din) ek hi baar; dobara trigger = duplicate, resend nahi
 
 Setup in .env:
     TWILIO_ACCOUNT_SID=your_sid
@@ -23,53 +26,28 @@ from datetime import date, timedelta
 from django.conf import settings
 from django.db.models import Sum
 
-logger = logging.getLogger(__name__)
-
+from .outbox import alert, drain, enqueue, statuses
 
-# ==================== TWILIO SETUP ====================
+logger = logging.getLogger(__name__)
 
-def _get_twilio_client():
-    """Twilio client return karo — not available hai to None."""
-    try:
-        from twilio.rest import Client
-        sid = os.environ.get('TWILIO_ACCOUNT_SID', '')
-        token = os.environ.get('TWILIO_AUTH_TOKEN', '')
-        if sid and token:
-            return Client(sid, token)
-    except ImportError:
-        logger.warning("Twilio install nahi hai. pip install twilio")
-    return None
 
+# ==================== OUTBOX ====================
 
-def _send_whatsapp(to_phone: str, message: str) -> dict:
+def _send_alerts(kind: str, pending: list) -> list:
     """
-    WhatsApp message bhejo.
-    Returns: {'success': True/False, 'sid': '...', 'error': '...'}
+    [(result dict, outbox alert)] → outbox mein (aaj ka same subject dobara nahi), drain, aur har
+    result mein delivery status: {'status': 'SENT' / 'FAILED' / 'SKIPPED', 'duplicate': True/False}.
     """
-    client = _get_twilio_client()
-    if not client:
-        logger.info(f"[DEMO] WhatsApp to {to_phone}: {message[:100]}...")
-        return {'success': False, 'error': 'Twilio not configured — demo mode', 'demo': True}
-
-    from_number = os.environ.get('TWILIO_WHATSAPP_FROM', 'whatsapp:+14155238886')
-    to_number = f"whatsapp:{to_phone}" if not to_phone.startswith('whatsapp:') else to_phone
-
-    try:
-        msg = client.messages.create(body=message, from_=from_number, to=to_number)
-        logger.info(f"WhatsApp sent to {to_phone}: SID={msg.sid}")
-        return {'success': True, 'sid': msg.sid}
-    except Exception as e:
-        logger.error(f"WhatsApp failed to {to_phone}: {e}")
-        return {'success': False, 'error': str(e)}
-
-
-def _log_notification(title: str, message: str, sent_to: str = ''):
-    """Notification log karo database mein."""
-    from .models import Notification
-    Notification.objects.create(
-        title=title,
-        message=f"[Auto] {message}" + (f" | Sent to: {sent_to}" if sent_to else "")
-    )
+    new = enqueue(msg for _, msg in pending)
+    drain()
+    rows = statuses(kind, [msg.subject_id for _, msg in pending])
+    for result, msg in pending:
+        row = rows.get(msg.subject_id)
+        result['duplicate'] = (msg.kind, msg.subject_id, msg.for_date) not in new
+        result['status'] = row.status if row else 'PENDING'
+        if row is not None and row.error:
+            result['error'] = row.error
+    return [result for result, _ in pending]
 
 
 # ==================== REMINDER FUNCTIONS ====================
@@ -90,7 +68,7 @@ def send_vaccination_reminders(days_ahead: int = 3) -> list:
         completed=False
     ).select_related('goat')
 
-    results = []
+    pending = []
     for vacc in due_vaccinations:
         days_left = (vacc.due_date - date.today()).days
         message = (
@@ -103,15 +81,11 @@ def send_vaccination_reminders(days_ahead: int = 3) -> list:
         )
 
         result = {'vaccination_id': vacc.id, 'goat': vacc.goat.name, 'vaccine': vacc.vaccine_name}
-        if owner_phone:
-            result['whatsapp'] = _send_whatsapp(owner_phone, message)
-
-        _log_notification(
-            f"Vaccination Due: {vacc.goat.name} — {vacc.vaccine_name}",
-            message
-        )
-        results.append(result)
+        pending.append((result, alert(
+            'vaccination', vacc.id, f"Vaccination Due: {vacc.goat.name} — {vacc.vaccine_name}", message, owner_phone,
+        )))
 
+    results = _send_alerts('vaccination', pending)
     logger.info(f"Sent {len(results)} vaccination reminders")
     return results
 
@@ -129,7 +103,7 @@ def send_delivery_reminders(days_ahead: int = 2) -> list:
         status__in=['P', 'C']
     ).select_related('mother', 'father')
 
-    results = []
+    pending = []
     for breeding in upcoming:
         days_left = (breeding.expected_delivery_date - date.today()).days
         message = (
@@ -142,20 +116,18 @@ def send_delivery_reminders(days_ahead: int = 2) -> list:
         )
 
         result = {'breeding_id': breeding.id, 'mother': breeding.mother.name}
-        if owner_phone:
-            result['whatsapp'] = _send_whatsapp(owner_phone, message)
+        pending.append((result, alert(
+            'delivery', breeding.id, f"Delivery Expected: {breeding.mother.name}", message, owner_phone,
+        )))
 
-        _log_notification(f"Delivery Expected: {breeding.mother.name}", message)
-        results.append(result)
-
-    return results
+    return _send_alerts('delivery', pending)
 
 
 def send_overdue_payment_reminders() -> list:
     """Overdue credit customers ko reminder bhejo."""
     from .models import Credit
 
-    results = []
+    pending = []
     overdue_credits = Credit.objects.filter(
         status__in=['Pending', 'Partial', 'Overdue'],
         due_date__lt=date.today()
@@ -180,69 +152,97 @@ def send_overdue_payment_reminders() -> list:
         result = {'credit_id': credit.id, 'customer': credit.customer.name,
                   'remaining': credit.remaining_amount()}
 
-        if customer_phone:
-            result['whatsapp'] = _send_whatsapp(customer_phone, message)
+        pending.append((result, alert(
+            'payment', credit.id, f"Payment Reminder: {credit.customer.name}", message, customer_phone,
+        )))
 
-        _log_notification(f"Payment Reminder: {credit.customer.name}", message, customer_phone)
-        results.append(result)
+    return _send_alerts('payment', pending)
 
-    return results
 
+def send_low_feed_alerts(threshold_days: int = None) -> list:
+    """Low feed stock alerts — N din (default FEED_LOW_STOCK_DAYS) ka stock bache to alert; burn rate farm/feed_stock.py se."""
+    from .feed_stock import low_stock
+
+    owner_phone = os.environ.get('FARM_OWNER_PHONE', '')
+    pending = []
+    for feed in low_stock(threshold_days):
+        message = (
+            f"🐐 *Goat Farm Alert*\n\n"
+            f"🌾 *Low Feed Stock Warning!*\n\n"
+            f"Feed: *{feed['feed_name']}*\n"
+            f"Current Stock: *{feed['quantity']} {feed['unit']}*\n"
+            f"Daily Use: *{feed['burn_rate']} {feed['unit']}/day*\n"
+            f"Estimated Days Remaining: *{int(feed['days_remaining'])} days*\n\n"
+            f"Kripya jald reorder karein!"
+        )
+
+        result = {
+            'feed_id': feed['feed_id'],
+            'feed_name': feed['feed_name'],
+            'quantity': feed['quantity'],
+            'burn_rate': feed['burn_rate'],
+            'days_remaining': feed['days_remaining'],
+        }
+        pending.append((result, alert('low_feed', feed['feed_id'], f"Low Feed: {feed['feed_name']}", message, owner_phone)))
 
-def send_low_feed_alerts(threshold_days: int = 7) -> list:
-    """Low feed stock alerts — N din ka stock bache to alert."""
-    from .models import FeedInventory
+    return _send_alerts('low_feed', pending)
 
+
+def _custom_due(reminder, today) -> bool:
+    """Is period (din / hafta / mahina / saal) mein abhi tak gaya nahi? One-Time sirf ek baar."""
+    from django.utils import timezone
+
+    if reminder.last_sent is None:
+        return True
+    last = timezone.localtime(reminder.last_sent).date()
+    return {
+        'OT': False,
+        'D': last < today,
+        'W': (today - last).days >= 7,
+        'M': (last.year, last.month) < (today.year, today.month),
+        'Y': last.year < today.year,
+    }.get(reminder.reminder_type, False)
+
+
+def send_custom_reminders(now=None) -> list:
+    """
+    CustomReminder jinka scheduled_time aaj guzar chuka aur jo is period mein nahi gaye — owner ko bhejo,
+    last_sent set karo. Scheduler har minute chalata hai; outbox ki wajah se dobara chalna safe.
+    """
+    from django.utils import timezone
+    from .models import CustomReminder
+    from .watermarks import touch
+
+    now = timezone.localtime(now)
     owner_phone = os.environ.get('FARM_OWNER_PHONE', '')
-    results = []
-
-    # Daily feed consumption (last 7 days average)
-    from .models import FeedConsumption
-    from django.db.models import Avg
-
-    for feed in FeedInventory.objects.all():
-        # Average daily consumption
-        avg_daily = FeedConsumption.objects.filter(
-            feed=feed,
-            date__gte=date.today() - timedelta(days=7)
-        ).aggregate(avg=Avg('quantity_consumed'))['avg'] or 0
-
-        if avg_daily > 0:
-            days_remaining = feed.quantity / float(avg_daily)
-        else:
-            days_remaining = 999  # Unknown
-
-        if days_remaining <= threshold_days:
-            message = (
-                f"🐐 *Goat Farm Alert*\n\n"
-                f"🌾 *Low Feed Stock Warning!*\n\n"
-                f"Feed: *{feed.feed_name}*\n"
-                f"Current Stock: *{feed.quantity} {feed.unit}*\n"
-                f"Estimated Days Remaining: *{int(days_remaining)} days*\n\n"
-                f"Kripya jald reorder karein!"
-            )
-
-            result = {
-                'feed_id': feed.id,
-                'feed_name': feed.feed_name,
-                'quantity': feed.quantity,
-                'days_remaining': round(days_remaining, 1)
-            }
-            if owner_phone:
-                result['whatsapp'] = _send_whatsapp(owner_phone, message)
-
-            _log_notification(f"Low Feed: {feed.feed_name}", message)
-            results.append(result)
+    due = CustomReminder.objects.filter(is_active=True, scheduled_time__lte=now.time()).select_related('goat')
 
+    pending = []
+    for reminder in due:
+        if not _custom_due(reminder, now.date()):
+            continue
+        goat_line = f"Goat: *{reminder.goat.name}* ({reminder.goat.tag_number})\n" if reminder.goat else ""
+        message = (
+            f"🐐 *Goat Farm Reminder*\n\n"
+            f"⏰ *{reminder.title}*\n"
+            f"{goat_line}\n"
+            f"{reminder.description}"
+        )
+        result = {'reminder_id': reminder.id, 'title': reminder.title}
+        pending.append((result, alert('custom', reminder.id, f"Reminder: {reminder.title}", message, owner_phone)))
+
+    results = _send_alerts('custom', pending)
+    if results:
+        CustomReminder.objects.filter(pk__in=[r['reminder_id'] for r in results]).update(last_sent=timezone.now())
+        touch(CustomReminder)
     return results
 
 
-def send_daily_summary() -> dict:
-    """Farm owner ko daily morning summary bhejo."""
+def build_daily_summary() -> tuple:
+    """Aaj ka summary (counts) aur WhatsApp message — sirf padhta hai, kuch bhejta nahi. Returns: (summary, message)."""
     from .models import (Goat, MilkProduction, Sale, BreedingRecord,
                          VaccinationSchedule, Task)
 
-    owner_phone = os.environ.get('FARM_OWNER_PHONE', '')
     today = date.today()
 
     total_milk = MilkProduction.objects.filter(date=today).aggregate(
@@ -274,17 +274,19 @@ def send_daily_summary() -> dict:
         f"Have a productive day! 🌾"
     )
 
-    result = {
-        'summary': {
-            'total_milk': float(total_milk),
-            'today_sales': float(today_sales),
-            'upcoming_deliveries': upcoming_deliveries,
-            'due_vaccinations': due_vaccinations,
-        }
+    summary = {
+        'total_milk': float(total_milk),
+        'today_sales': float(today_sales),
+        'upcoming_deliveries': upcoming_deliveries,
+        'due_vaccinations': due_vaccinations,
     }
+    return summary, message
 
-    if owner_phone:
-        result['whatsapp'] = _send_whatsapp(owner_phone, message)
 
-    _log_notification("Daily Farm Summary", message)
+def send_daily_summary() -> dict:
+    """Farm owner ko daily morning summary bhejo (outbox — din mein ek hi baar jaata hai)."""
+    owner_phone = os.environ.get('FARM_OWNER_PHONE', '')
+    summary, message = build_daily_summary()
+    result = {'summary': summary}
+    _send_alerts('daily_summary', [(result, alert('daily_summary', 0, "Daily Farm Summary", message, owner_phone))])
     return result
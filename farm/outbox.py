@@ -0,0 +1,136 @@
+"""
+🐐 Notification Outbox — v6.1
+Reminders pehle seedha bheje jaate the aur har ek ka alag Notification.objects.create — endpoint do baar
+dabao to wahi WhatsApp dobara jaata aur log dobara banta. Ab har alert pehle outbox mein, phir bheja jaata hai.
+
+Features:
+- Dedup            → OutboxMessage (kind, subject_id, for_date) unique; enqueue() = ek bulk_create(ignore_conflicts)
+                      — aaj ka vaccination #12 reminder kitni baar bhi trigger ho, ek hi row, ek hi message
+- Batched drain    → drain() PENDING rows OUTBOX_BATCH_SIZE ke batch mein claim karta hai (conditional UPDATE,
+                      do drainers ek row nahi uthaate), dispatch.send_many() se ek saath bhejta hai
+- Delivery status  → SENT (provider sid) / FAILED (error, OUTBOX_MAX_ATTEMPTS tak agle drain mein retry) /
+                      SKIPPED (phone nahi ya demo mode). Request jaane ke baad response nahi aaya (uncertain) →
+                      FAILED par retry nahi — message shayad pahunch chuka, error mein "delivery unknown"
+- Bulk log         → har batch ke Notification rows ek bulk_create mein
+- Crash safe       → SENDING row OUTBOX_STALE_SECONDS se purani → wapas PENDING
+
+    new = enqueue([alert('payment', credit.id, title, body, recipient=phone), ...])
+    counts = drain()     # {'sent': 480, 'failed': 2, 'skipped': 18}
+"""
+
+import logging
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .dispatch import Message, send_many
+from .models import Notification, OutboxMessage
+from .watermarks import touch
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== ENQUEUE ====================
+
+def alert(kind, subject_id, title, body, recipient='', channel='whatsapp', for_date=None) -> OutboxMessage:
+    """Unsaved outbox row — enqueue() ko list mein do."""
+    return OutboxMessage(
+        kind=kind, subject_id=subject_id or 0, for_date=for_date or date.today(),
+        recipient=(recipient or '').strip()[:30], channel=channel, title=title[:200], body=body,
+    )
+
+
+def enqueue(messages) -> set:
+    """
+    Ek bulk_create(ignore_conflicts) — pehle se maujood (kind, subject_id, for_date) chup-chaap skip.
+    Returns: naye (kind, subject_id, for_date) keys (report ke liye; dedup DB constraint karta hai).
+    """
+    messages = list(messages)
+    if not messages:
+        return set()
+    keys = {(m.kind, m.subject_id, m.for_date) for m in messages}
+    existing = set(OutboxMessage.objects.filter(
+        kind__in={k[0] for k in keys}, subject_id__in={k[1] for k in keys}, for_date__in={k[2] for k in keys},
+    ).values_list('kind', 'subject_id', 'for_date'))
+    OutboxMessage.objects.bulk_create(messages, ignore_conflicts=True)
+    return keys - existing
+
+
+def statuses(kind, subject_ids, for_date=None) -> dict:
+    """{subject_id: OutboxMessage} — reminder run ke results mein delivery status."""
+    return {
+        m.subject_id: m for m in OutboxMessage.objects.filter(
+            kind=kind, for_date=for_date or date.today(), subject_id__in=list(subject_ids),
+        ).only('subject_id', 'status', 'provider_sid', 'error', 'attempts')
+    }
+
+
+# ==================== DRAIN ====================
+
+def requeue_stale() -> int:
+    """Drain beech mein mara → SENDING rows wapas PENDING."""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'OUTBOX_STALE_SECONDS', 600))
+    return OutboxMessage.objects.filter(status='SENDING', claimed_at__lt=cutoff).update(status='PENDING', batch='')
+
+
+def _claim(batch_size, started):
+    """Agla batch — PENDING, ya FAILED jiske attempts bache hain (is drain mein pehle nahi chhua)."""
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 3)
+    eligible = Q(status='PENDING') | Q(status='FAILED', attempts__lt=max_attempts, claimed_at__lt=started)
+    ids = list(OutboxMessage.objects.filter(eligible).order_by('created_at', 'pk').values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return None
+    token = uuid.uuid4().hex
+    OutboxMessage.objects.filter(eligible, pk__in=ids).update(
+        status='SENDING', batch=token, claimed_at=timezone.now(), attempts=F('attempts') + 1,
+    )
+    return list(OutboxMessage.objects.filter(batch=token, status='SENDING'))
+
+
+def drain(batch_size=None) -> dict:
+    """Outbox khaali hone tak batch-wise bhejo. Returns: {'sent': n, 'failed': n, 'skipped': n}."""
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 200)
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 3)
+    requeue_stale()
+    started = timezone.now()
+    counts = Counter()
+    while True:
+        rows = _claim(batch_size, started)
+        if rows is None:
+            break
+        if not rows:
+            continue   # koi aur drainer ye ids le gaya
+
+        # Log sirf pehli koshish par — FAILED retry dobara Notification nahi banata
+        first = [r for r in rows if r.attempts == 1]
+        deliverable = [r for r in rows if r.recipient]
+        outcomes = send_many([Message(r.recipient, r.body, r.channel, ref=r.pk) for r in deliverable])
+        now = timezone.now()
+        for row, outcome in zip(deliverable, outcomes):
+            if outcome.get('success'):
+                row.status, row.provider_sid, row.error, row.sent_at = 'SENT', outcome.get('sid', '')[:64], '', now
+            elif outcome.get('demo'):
+                row.status, row.error = 'SKIPPED', outcome.get('error', '')
+            else:
+                row.status, row.error = 'FAILED', outcome.get('error', '')
+                if outcome.get('uncertain'):
+                    row.attempts = max(row.attempts, max_attempts)   # _claim dobara nahi uthayega
+        for row in rows:
+            if not row.recipient:
+                row.status, row.error = 'SKIPPED', 'No recipient phone'
+            counts[row.status.lower()] += 1
+        OutboxMessage.objects.bulk_update(rows, ['status', 'provider_sid', 'error', 'sent_at', 'attempts'])
+
+        Notification.objects.bulk_create([
+            Notification(title=r.title, message=f"[Auto] {r.body}" + (f" | Sent to: {r.recipient}" if r.recipient else ""))
+            for r in first
+        ])
+        touch(Notification)
+
+    if counts:
+        logger.info("Outbox drained: %s", dict(counts))
+    return {key: counts.get(key, 0) for key in ('sent', 'failed', 'skipped')}
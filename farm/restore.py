@@ -0,0 +1,471 @@
+"""
+🐐 Restore Engine — v6.1
+JSON / NDJSON backup ko stream-parse karke bulk restore — ek-ek obj.save() nahi.
+
+Features:
+- Stream parsing     → upload chunks mein padha jaata hai (purane indent=2 backups bhi), poori file memory mein nahi
+- FK-aware order     → models topological order mein (FK dependencies pehle); out-of-order backup
+                       ke records tab tak ruke rehte hain jab tak unke parent tables load na ho jaayein
+- Self references    → Goat.mother / Goat.father pehle NULL, saari goats aane ke baad bulk_update
+- Bulk inserts       → multi-row INSERT chunks (raw, timestamps same); har batch apne savepoint mein (ek batch fail = baaki restore chalta rahe)
+- M2M deferred       → VetVisit.goats_visited, FarmEvent.goats_involved through-table bulk insert aakhir mein
+- Sequences reset    → PostgreSQL par restore ke baad naye records ke IDs clash nahi karte
+- Report             → har model: deleted / restored / seconds; total rows/sec
+- Incremental chain  → restore_chain([full, incr1, incr2, ...]) — incremental files ke
+                       {"block"} ranges delete + dobara insert (farm/incremental_backup.py)
+
+    result = restore_backup(uploaded_file, ALL_MODELS)
+"""
+
+import codecs
+import json
+import time
+from collections import defaultdict, namedtuple
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from . import search
+from .watermarks import touch
+
+DEFAULT_BATCH_SIZE = 2000
+_END = object()  # event: ek model ka block khatam
+_Range = namedtuple('_Range', 'lo hi')  # event: incremental backup — is pk range ko replace karo
+_decoder = json.JSONDecoder()
+
+
+class BackupFormatError(ValueError):
+    """Upload valid backup nahi hai."""
+
+
+# ==================== DEPENDENCY ORDER ====================
+
+def _fk_dependencies(Model, models):
+    """Model kin (backup wale) models par FK se depend karta hai — self reference chhod ke."""
+    return {
+        f.related_model for f in Model._meta.fields
+        if f.is_relation and f.related_model in models and f.related_model is not Model
+    }
+
+
+def topological_order(pairs):
+    """
+    [(key, Model)] → same list, FK parents pehle. Ties mein original order (Kahn's algorithm).
+    Cycle ho (abhi nahi hai) to bache hue models original order mein.
+    """
+    models = {Model for _, Model in pairs}
+    deps = {key: _fk_dependencies(Model, models) for key, Model in pairs}
+    ordered, placed = [], set()
+    while len(ordered) < len(pairs):
+        ready = [(k, M) for k, M in pairs if M not in placed and deps[k] <= placed]
+        if not ready:
+            ready = [(k, M) for k, M in pairs if M not in placed]
+        key, Model = ready[0]
+        ordered.append((key, Model))
+        placed.add(Model)
+    return ordered
+
+
+# ==================== STREAM PARSERS ====================
+
+class _JSONStream:
+    """Chunked text buffer + raw_decode — ek value (object) ek baar mein, poora document nahi."""
+
+    def __init__(self, fileobj, chunk_size=64 * 1024):
+        self._file = fileobj
+        self._chunk_size = chunk_size
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf, self.pos, self.eof = '', 0, False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self._file.read(self._chunk_size)
+        if isinstance(data, bytes):
+            text = self._utf8.decode(data, final=not data)
+        else:
+            text = data
+        if not data:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return bool(data)
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise BackupFormatError(f"Backup JSON mein '{char}' expected tha, mila: {self.peek()!r}")
+        self.pos += 1
+
+    def skip(self, char) -> bool:
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise BackupFormatError(f"Invalid JSON: {e}")
+            # Buffer ke end par number adhoora ho sakta hai ("12" of "123") — aur padho
+            if end == len(self.buf) and not isinstance(obj, (dict, list, str)) and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _iter_json_events(stream):
+    """{"meta": ..., "data": {key: [records]}} → (key, record) / (key, _END) events."""
+    stream.expect('{')
+    seen_data = False
+    while not stream.skip('}'):
+        name = stream.value()
+        stream.expect(':')
+        if name != 'data':
+            stream.value()  # meta — chhota object, restore ko zaroorat nahi
+        else:
+            seen_data = True
+            stream.expect('{')
+            while not stream.skip('}'):
+                key = stream.value()
+                stream.expect(':')
+                stream.expect('[')
+                while not stream.skip(']'):
+                    yield key, stream.value()
+                    stream.skip(',')
+                yield key, _END
+                stream.skip(',')
+        stream.skip(',')
+    if not seen_data:
+        raise BackupFormatError("File mein 'data' key nahi mili — valid backup nahi hai")
+
+
+def _iter_ndjson_events(stream, first_line, label_to_key):
+    """
+    NDJSON: {"meta"} line, phir {"model": "farm.goat", ...} lines.
+    Incremental files mein records se pehle {"block": {"model", "lo", "hi"}} lines.
+    """
+    declared = first_line.get('meta', {}).get('models', [])
+    current = None
+    for line in _iter_lines(stream):
+        record = json.loads(line)
+        if 'meta' in record and 'model' not in record:
+            continue  # trailer
+        if 'block' in record:
+            block = record['block']
+            record = _Range(block['lo'], block['hi'])
+            label = block.get('model')
+        else:
+            label = record.get('model')
+        key = label_to_key.get(label)
+        if key is None:
+            raise BackupFormatError(f"Unknown model in backup: {label!r}")
+        if key != current:
+            if current is not None:
+                yield current, _END
+            # Header ke order mein pehle aane wale (khaali) models bhi khatam
+            if key in declared:
+                for earlier in declared[:declared.index(key)]:
+                    yield earlier, _END
+            current = key
+        yield key, record
+    if current is not None:
+        yield current, _END
+    else:
+        # Khaali backup — sab tables khaali restore hongi
+        for key in declared:
+            yield key, _END
+
+
+def _iter_lines(stream):
+    while True:
+        newline = stream.buf.find('\n', stream.pos)
+        if newline == -1:
+            if stream.fill():
+                continue
+            tail = stream.buf[stream.pos:].strip()
+            stream.pos = len(stream.buf)
+            if tail:
+                yield tail
+            return
+        line = stream.buf[stream.pos:newline].strip()
+        stream.pos = newline + 1
+        if line:
+            yield line
+
+
+def iter_backup_events(fileobj, pairs):
+    """
+    Format khud pehchano: pehli line akela poora JSON object ho to NDJSON, warna JSON document.
+    Returns: (header meta — NDJSON ka, JSON document ke liye {}), events
+    """
+    stream = _JSONStream(fileobj)
+    if stream.peek() != '{':
+        raise BackupFormatError('Backup file JSON object se shuru nahi hoti')
+    lines = _iter_lines(stream)
+    first = next(lines, '')
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        header = None
+    if isinstance(header, dict) and 'data' not in header:
+        label_to_key = {Model._meta.label_lower: key for key, Model in pairs}
+        return header.get('meta', {}), _iter_ndjson_events(stream, header, label_to_key)
+    # Single JSON document — shuru se dobara (pehli line buffer mein hi hai)
+    stream.buf, stream.pos = first + '\n' + stream.buf[stream.pos:], 0
+    return {}, _iter_json_events(stream)
+
+
+# ==================== RESTORE ====================
+
+class _Loader:
+    """Events → bulk inserts, FK dependencies ka dhyan rakhte hue."""
+
+    def __init__(self, pairs, using, batch_size):
+        self.order = topological_order(pairs)
+        self.models = dict(self.order)
+        models = set(self.models.values())
+        key_of = {Model: key for key, Model in self.order}
+        self.deps = {key: {key_of[M] for M in _fk_dependencies(Model, models)} for key, Model in self.order}
+        self.self_fks = {
+            key: [f for f in Model._meta.fields if f.is_relation and f.related_model is Model]
+            for key, Model in self.order
+        }
+        self.using, self.batch_size = using, batch_size
+        self.ended, self.finished = set(), set()
+        self.batches, self.waiting = defaultdict(list), defaultdict(list)
+        self.self_links = defaultdict(list)   # key → [(pk, field, value)]
+        self.m2m_rows = defaultdict(list)     # through model → [through objects]
+        self.results = {key: {'deleted': 0, 'restored': 0, 'seconds': 0.0} for key in self.models}
+        self.errors = {}
+
+    # ---- delete ----
+    def delete_existing(self):
+        """Reverse FK order mein tables khaali karo — pehle M2M through tables."""
+        for key, Model in reversed(self.order):
+            for field in Model._meta.many_to_many:
+                field.remote_field.through.objects.using(self.using).all()._raw_delete(self.using)
+        for key, Model in reversed(self.order):
+            started = time.monotonic()
+            # _raw_delete: ek DELETE statement. .delete() har row load karke post_delete signals bhejta
+            # (watermarks / search) — restore ke baad dono ek saath refresh hote hain.
+            self.results[key]['deleted'] = Model.objects.using(self.using).all()._raw_delete(self.using) or 0
+            self.results[key]['seconds'] += time.monotonic() - started
+
+    def delete_range(self, key, pk_range):
+        """Incremental replay: [lo, hi) pk range ki rows (aur unke M2M rows) hatao — backup wali rows aage aayengi."""
+        if key not in self.models:
+            return
+        Model = self.models[key]
+        started = time.monotonic()
+        for field in Model._meta.many_to_many:
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            through.objects.using(self.using).filter(
+                **{f'{source}__gte': pk_range.lo, f'{source}__lt': pk_range.hi}
+            )._raw_delete(self.using)
+        self.results[key]['deleted'] += Model.objects.using(self.using).filter(
+            pk__gte=pk_range.lo, pk__lt=pk_range.hi
+        )._raw_delete(self.using) or 0
+        self.results[key]['seconds'] += time.monotonic() - started
+
+    # ---- insert ----
+    def add(self, key, record):
+        if key not in self.models:
+            self.errors.setdefault(key, {'restore_error': 'Unknown model key — skip kiya'})
+            return
+        if self.deps[key] <= self.finished:
+            self.batches[key].append(record)
+            if len(self.batches[key]) >= self.batch_size:
+                self._flush(key)
+        else:
+            self.waiting[key].append(record)
+
+    def end(self, key):
+        if key not in self.models:
+            return
+        self.ended.add(key)
+        self._settle()
+
+    def finish(self):
+        """EOF — jo ruke hue hain sab FK order mein daal do."""
+        self.ended.update(self.models)
+        self._settle(force=True)
+        self._insert_m2m()
+        self._reset_sequences()
+
+    def _settle(self, force=False):
+        progress = True
+        while progress:
+            progress = False
+            for key, _ in self.order:
+                if key in self.finished or key not in self.ended:
+                    continue
+                if not force and not self.deps[key] <= self.finished:
+                    continue
+                if self.waiting[key]:
+                    self.batches[key].extend(self.waiting.pop(key))
+                self._flush(key)
+                self._link_self_references(key)
+                self.finished.add(key)
+                progress = True
+
+    def _flush(self, key):
+        records, self.batches[key] = self.batches[key], []
+        Model = self.models[key]
+        started = time.monotonic()
+        for i in range(0, len(records), self.batch_size):
+            chunk = records[i:i + self.batch_size]
+            objs = []
+            try:
+                with transaction.atomic(using=self.using):
+                    for item in serializers.deserialize('python', chunk, using=self.using, ignorenonexistent=True):
+                        obj = item.object
+                        for field in self.self_fks[key]:
+                            value = getattr(obj, field.attname)
+                            if value is not None:
+                                self.self_links[key].append((obj.pk, field, value))
+                                setattr(obj, field.attname, None)
+                        self._defer_m2m(Model, obj.pk, item.m2m_data)
+                        objs.append(obj)
+                    self._insert_raw(Model, objs)
+                self.results[key]['restored'] += len(objs)
+            except Exception as e:
+                self.errors.setdefault(key, {'restore_error': str(e)})
+                self.results[key].setdefault('failed', 0)
+                self.results[key]['failed'] += len(chunk)
+        self.results[key]['seconds'] += time.monotonic() - started
+
+    def _insert_raw(self, Model, objs):
+        """
+        Multi-row INSERT, raw=True — loaddata / obj.save(raw) jaisa: created_at / updated_at
+        (auto_now) backup wali values hi rehti hain. bulk_create unhe 'abhi' se overwrite kar deta.
+        """
+        if not objs:
+            return
+        fields = Model._meta.local_concrete_fields
+        ops = connections[self.using].ops
+        size = max(min(self.batch_size, ops.bulk_batch_size(fields, objs)), 1)
+        manager = Model._base_manager.using(self.using)
+        for i in range(0, len(objs), size):
+            manager._insert(objs[i:i + size], fields=fields, raw=True, using=self.using)
+
+    def _link_self_references(self, key):
+        links = self.self_links.pop(key, [])
+        if not links:
+            return
+        Model = self.models[key]
+        by_field = defaultdict(list)
+        for pk, field, value in links:
+            obj = Model(pk=pk)
+            setattr(obj, field.attname, value)
+            by_field[field.name].append(obj)
+        for name, objs in by_field.items():
+            Model.objects.using(self.using).bulk_update(objs, [name], batch_size=self.batch_size)
+
+    def _defer_m2m(self, Model, pk, m2m_data):
+        for name, ids in (m2m_data or {}).items():
+            field = Model._meta.get_field(name)
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+            self.m2m_rows[through].extend(through(**{source: pk, target: value}) for value in ids)
+
+    def _insert_m2m(self):
+        for through, rows in self.m2m_rows.items():
+            through.objects.using(self.using).bulk_create(rows, batch_size=self.batch_size)
+
+    def _reset_sequences(self):
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self.models.values()))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+
+def _replay(loader, fileobj, pairs, incremental):
+    """Ek file ke events loader mein. Full backup: pehle sab delete; incremental: sirf block ranges."""
+    meta, events = iter_backup_events(fileobj, pairs)
+    if (meta.get('kind') == 'incremental') != incremental:
+        raise BackupFormatError(
+            'Incremental backup akela restore nahi hota — poori chain (full + incrementals) do'
+            if not incremental else 'Chain ki pehli file ke baad sirf incremental backups aa sakte hain'
+        )
+    started = False
+    for key, record in events:
+        if not started and not incremental:
+            loader.delete_existing()
+        started = True
+        if record is _END:
+            loader.end(key)
+        elif isinstance(record, _Range):
+            loader.delete_range(key, record)
+        else:
+            loader.add(key, record)
+    if not started and not incremental:
+        raise BackupFormatError('Backup mein koi data nahi mila')
+    loader.finish()
+
+
+def _report(loaders, started):
+    results = {}
+    for loader in loaders:
+        for key, r in loader.results.items():
+            total = results.setdefault(key, {'deleted': 0, 'restored': 0, 'seconds': 0.0})
+            for name, value in r.items():
+                total[name] = total.get(name, 0) + value
+    errors = {}
+    for loader in loaders:
+        errors.update(loader.errors)
+    elapsed = time.monotonic() - started
+    rows = sum(r['restored'] for r in results.values())
+    return {
+        'results': results,
+        'errors': errors,
+        'rows': rows,
+        'seconds': round(elapsed, 2),
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed else rows,
+    }
+
+
+def _refresh_after_restore(pairs):
+    # Raw inserts / _raw_delete signals nahi bhejte — caches aur search index yahan refresh
+    touch(*[Model for _, Model in pairs])
+    search.rebuild_index()
+
+
+def restore_backup(fileobj, pairs, using=DEFAULT_DB_ALIAS, batch_size=DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Existing data DELETE karke backup restore karo — ek transaction mein (fail = kuch nahi badla).
+    Delete tab hota hai jab pehla data block mil jaaye; format galat ho to BackupFormatError.
+    """
+    return restore_chain([fileobj], pairs, using=using, batch_size=batch_size)
+
+
+def restore_chain(fileobjs, pairs, using=DEFAULT_DB_ALIAS, batch_size=DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Full backup + uske incrementals (purane se naye) ek transaction mein replay karo.
+    Report mein saari files ke counts jude hue.
+    """
+    started = time.monotonic()
+    loaders = []
+    with transaction.atomic(using=using):
+        for i, fileobj in enumerate(fileobjs):
+            loader = _Loader(pairs, using, batch_size)
+            _replay(loader, fileobj, pairs, incremental=i > 0)
+            loaders.append(loader)
+    _refresh_after_restore(pairs)
+    return _report(loaders, started)
@@ -0,0 +1,345 @@
+"""
+🐐 Scheduler — v6.1
+Periodic kaam (reminders, daily summary, custom reminders, weather, cache warmup) ab kisi ke endpoint
+dabane ka intezaar nahi karte — `python manage.py run_scheduler` unhe time par chalata hai.
+
+Features:
+- DB definitions   → ScheduledTask rows (admin se edit): cron (minute hour day month weekday), params,
+                      jitter, enabled. DEFAULT_SCHEDULE pehli baar bulk_create hota hai, edits overwrite nahi hote
+- Jitter           → next_run_at = cron ka agla minute + random(0, jitter_seconds)
+- Single instance  → SchedulerLease row (conditional UPDATE / INSERT); kai run_scheduler processes ho to bhi
+                      ek hi leader, baaki standby. Lease expire → standby le leta hai
+- No double runs   → har run next_run_at par conditional UPDATE se claim hota hai
+- Run history      → ScheduledTaskRun: status, result, error, timing (SCHEDULER_HISTORY_DAYS tak)
+- Missed runs      → scheduler band tha to wapas aate hi ek baar (catch-up), phir normal schedule
+
+Naya task type:
+
+    @task('my_rollup')
+    def my_rollup(year=None):
+        return {'rows': 123}      # → ScheduledTaskRun.result
+
+Times TIME_ZONE (Asia/Kolkata) ke wall clock mein hain.
+"""
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ScheduledTask, ScheduledTaskRun, SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+LEASE_NAME = 'scheduler'
+
+
+def task(name):
+    """Task register karo: fn(**params) → JSON-able result (ya None)."""
+    def register(fn):
+        TASKS[name] = fn
+        return fn
+    return register
+
+
+# ==================== CRON ====================
+
+class Cron:
+    """
+    5-field cron: minute hour day-of-month month day-of-week (0/7 = Sunday).
+    Har field: *, 5, 1-5, */15, 0-30/10, 1,15 — standard cron jaisa. Day-of-month aur day-of-week
+    dono diye hon to koi bhi match ho jaaye (OR), warna jo diya hai wahi.
+    """
+    FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron mein 5 fields chahiye (minute hour day month weekday): {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._field(part, lo, hi) for part, (lo, hi) in zip(parts, self.FIELDS)
+        )
+        self.weekdays = {d % 7 for d in weekdays}
+        self.any_day, self.any_weekday = parts[2] == '*', parts[4] == '*'
+
+    @staticmethod
+    def _field(spec, lo, hi) -> set:
+        values = set()
+        for part in spec.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/', 1)
+                step = int(step)
+            if part == '*':
+                start, end = lo, hi
+            elif '-' in part:
+                start, end = (int(x) for x in part.split('-', 1))
+            else:
+                start = int(part)
+                end = hi if step > 1 else start
+            if step < 1 or not lo <= start <= end <= hi:
+                raise ValueError(f"Cron field {spec!r}: {lo}-{hi} ke bahar")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, day) -> bool:
+        weekday = (day.weekday() + 1) % 7     # Python Monday=0 → cron Sunday=0
+        in_month, in_week = day.day in self.days, weekday in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, moment):
+        """moment ke baad ka pehla matching minute (aware datetime, TIME_ZONE ke wall clock par)."""
+        local = timezone.localtime(moment).replace(tzinfo=None, second=0, microsecond=0)
+        t = local + timedelta(minutes=1)
+        limit = local + timedelta(days=366 * 5)
+        while t <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return timezone.make_aware(t)
+        raise ValueError(f"Cron {self.expression!r} kabhi match nahi hota")
+
+
+def next_run(scheduled_task, after):
+    """Agla run — cron + jitter."""
+    moment = Cron(scheduled_task.schedule).next_after(after)
+    if scheduled_task.jitter_seconds:
+        moment += timedelta(seconds=random.uniform(0, scheduled_task.jitter_seconds))
+    return moment
+
+
+# ==================== DEFAULTS ====================
+
+# name, task, cron, params, jitter seconds, enabled — pehli baar DB mein; baad mein admin se badlo
+DEFAULT_SCHEDULE = [
+    ('daily-summary',         'daily_summary',   '0 6 * * *',     {},                                  120, True),
+    ('vaccination-reminders', 'reminders',       '0 7 * * *',     {'reminder': 'vaccination'},         120, True),
+    ('delivery-reminders',    'reminders',       '5 7 * * *',     {'reminder': 'delivery'},            120, True),
+    ('low-feed-alerts',       'reminders',       '30 7 * * *',    {'reminder': 'low_feed'},            120, True),
+    ('payment-reminders',     'reminders',       '0 10 * * *',    {'reminder': 'payment'},             300, True),
+    ('custom-reminders',      'reminders',       '* * * * *',     {'reminder': 'custom'},              0,   True),
+    ('outbox-retry',          'outbox_drain',    '*/10 * * * *',  {},                                  30,  True),
+    ('weather-refresh',       'weather_refresh', '*/15 * * * *',  {},                                  60,  True),
+    # Morning rush (5–10 AM) mein dashboard cache kabhi thanda na ho — STATS_CACHE_TTL (5 min) se kam interval
+    ('dashboard-warmup',      'cache_warmup',    '*/4 5-9 * * *', {},                                  0,   True),
+    ('analytics-refresh',     'analytics_refresh', '30 5 * * *',  {},                                  60,  True),
+    ('nightly-backup',        'command',         '30 2 * * *',    {'command': 'create_backup', 'args': ['--incremental']}, 300, False),
+]
+
+
+def ensure_defaults() -> int:
+    """DEFAULT_SCHEDULE ke missing rows banao (ek bulk_create) — maujooda rows chhue nahi jaate."""
+    existing = set(ScheduledTask.objects.values_list('name', flat=True))
+    missing = [
+        ScheduledTask(name=name, task=kind, schedule=cron, params=params, jitter_seconds=jitter, enabled=enabled)
+        for name, kind, cron, params, jitter, enabled in DEFAULT_SCHEDULE if name not in existing
+    ]
+    ScheduledTask.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(missing)
+
+
+# ==================== LEASE ====================
+
+def acquire_lease(holder, seconds=None) -> bool:
+    """Lease lo / renew karo. Kisi aur ke paas hai aur expire nahi hua → False."""
+    seconds = getattr(settings, 'SCHEDULER_LEASE_SECONDS', 120) if seconds is None else seconds
+    now = timezone.now()
+    expires = now + timedelta(seconds=seconds)
+    if SchedulerLease.objects.filter(name=LEASE_NAME).filter(Q(holder=holder) | Q(expires_at__lt=now)).update(
+        holder=holder, expires_at=expires,
+    ):
+        return True
+    try:
+        with transaction.atomic():
+            SchedulerLease.objects.create(name=LEASE_NAME, holder=holder, expires_at=expires)
+        return True
+    except IntegrityError:
+        return False
+
+
+def release_lease(holder):
+    """Shutdown par — standby ko turant lene do."""
+    SchedulerLease.objects.filter(name=LEASE_NAME, holder=holder).delete()
+
+
+# ==================== RUN ====================
+
+def run_task(scheduled_task, holder='', scheduled_for=None) -> ScheduledTaskRun:
+    """Ek task chalao, history row likho."""
+    run = ScheduledTaskRun.objects.create(task=scheduled_task, scheduled_for=scheduled_for, holder=holder)
+    result, error = None, ''
+    try:
+        handler = TASKS.get(scheduled_task.task)
+        if handler is None:
+            raise ValueError(f"Unknown task: {scheduled_task.task}")
+        result = handler(**scheduled_task.params)
+        status = 'DONE'
+    except Exception:
+        logger.exception("Scheduled task %s fail hua", scheduled_task.name)
+        status, error = 'FAILED', traceback.format_exc()[-5000:]
+    finished = timezone.now()
+    ScheduledTaskRun.objects.filter(pk=run.pk).update(status=status, finished_at=finished, result=result, error=error)
+    ScheduledTask.objects.filter(pk=scheduled_task.pk).update(last_run_at=run.started_at, last_status=status)
+    run.status, run.finished_at, run.result, run.error = status, finished, result, error
+    return run
+
+
+def _schedule_or_disable(scheduled_task, now) -> bool:
+    try:
+        scheduled_task.next_run_at = next_run(scheduled_task, now)
+    except ValueError as e:
+        logger.error("Scheduled task %s ka cron galat hai (%s) — disable kiya", scheduled_task.name, e)
+        ScheduledTask.objects.filter(pk=scheduled_task.pk).update(enabled=False, last_status='INVALID')
+        return False
+    ScheduledTask.objects.filter(pk=scheduled_task.pk).update(next_run_at=scheduled_task.next_run_at)
+    return True
+
+
+def run_due(holder, now=None) -> list:
+    """
+    Jinka next_run_at aa gaya unhe chalao. Har task se pehle lease renew — lease chali gayi to ruk jao.
+    Returns: ScheduledTaskRun list.
+    """
+    now = now or timezone.now()
+    for fresh in ScheduledTask.objects.filter(enabled=True, next_run_at__isnull=True):
+        _schedule_or_disable(fresh, now)
+
+    runs = []
+    for due in ScheduledTask.objects.filter(enabled=True, next_run_at__lte=now).order_by('next_run_at'):
+        if not acquire_lease(holder):
+            logger.warning("Scheduler lease %s ke haath se gayi — ruk rahe hain", holder)
+            break
+        scheduled_for = due.next_run_at
+        try:
+            following = next_run(due, timezone.now())
+        except ValueError:
+            _schedule_or_disable(due, now)
+            continue
+        if not ScheduledTask.objects.filter(pk=due.pk, next_run_at=scheduled_for).update(next_run_at=following):
+            continue   # kisi aur ne claim kar liya
+        logger.info("Scheduled task %s shuru (%s)", due.name, holder)
+        runs.append(run_task(due, holder, scheduled_for))
+    return runs
+
+
+def prune_history(days=None) -> int:
+    days = getattr(settings, 'SCHEDULER_HISTORY_DAYS', 30) if days is None else days
+    deleted, _ = ScheduledTaskRun.objects.filter(started_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
+
+
+# ==================== TASKS ====================
+
+def _summary(results) -> dict:
+    return {
+        'alerts': len(results),
+        'new': sum(1 for r in results if not r['duplicate']),
+        'sent': sum(1 for r in results if r['status'] == 'SENT'),
+    }
+
+
+@task('reminders')
+def reminders_task(reminder='vaccination', days_ahead=None):
+    """Wahi reminder functions jo /api/notifications/send-*-reminders/ chalate hain — outbox dedup karta hai."""
+    from . import notifications
+
+    if reminder == 'vaccination':
+        results = notifications.send_vaccination_reminders(3 if days_ahead is None else days_ahead)
+    elif reminder == 'delivery':
+        results = notifications.send_delivery_reminders(2 if days_ahead is None else days_ahead)
+    elif reminder == 'payment':
+        results = notifications.send_overdue_payment_reminders()
+    elif reminder == 'low_feed':
+        results = notifications.send_low_feed_alerts(days_ahead)
+    elif reminder == 'custom':
+        results = notifications.send_custom_reminders()
+    else:
+        raise ValueError(f"Unknown reminder type: {reminder}")
+    return _summary(results)
+
+
+@task('daily_summary')
+def daily_summary_task():
+    from .notifications import send_daily_summary
+    result = send_daily_summary()
+    return {'status': result['status'], 'duplicate': result['duplicate'], **result['summary']}
+
+
+@task('outbox_drain')
+def outbox_drain_task():
+    """FAILED outbox rows (attempts bache hon) dobara bhejo."""
+    from .outbox import drain
+    return drain()
+
+
+@task('weather_refresh')
+def weather_refresh_task():
+    """Default location ka current + forecast cache taaza karo; API fail ho to purana cache wapas."""
+    from django.core.cache import cache
+    from .weather_service import FORECAST_TTL, WEATHER_TTL, WeatherService
+
+    lat, lng = WeatherService.DEFAULT_LAT, WeatherService.DEFAULT_LNG
+    keys = {WeatherService._cur_key(lat, lng): WEATHER_TTL, WeatherService._fore_key(lat, lng): FORECAST_TTL}
+    previous = cache.get_many(list(keys))
+    cache.delete_many(list(keys))
+    current = WeatherService.get_current_weather(lat, lng)
+    forecast = WeatherService.get_forecast(lat, lng)
+    for key, value in previous.items():
+        if cache.get(key) is None:
+            cache.set(key, value, keys[key])
+    return {'current': bool(current), 'forecast_days': len(forecast or [])}
+
+
+@task('cache_warmup')
+def cache_warmup_task():
+    """
+    Dashboard stats sections (farm/stats.py) cache mein — pehla visitor bhi cache hit paaye.
+    refresh=True: har run TTL (STATS_CACHE_TTL) naye sire se — run ka interval TTL se chhota rakho.
+    """
+    import time
+    from .stats import SECTIONS, get_section
+
+    timings = {}
+    for name in SECTIONS:
+        started = time.perf_counter()
+        get_section(name, refresh=True)
+        timings[name] = round(time.perf_counter() - started, 4)
+    return timings
+
+
+@task('analytics_refresh')
+def analytics_refresh_task():
+    """ANALYTICS_SQLITE_COPY mode mein read-only analytics copy refresh; dusre modes mein kuch nahi."""
+    from django.core.management import call_command
+    from .db_router import analytics_sqlite_path
+
+    if not analytics_sqlite_path():
+        return {'skipped': 'ANALYTICS_SQLITE_COPY off'}
+    call_command('refresh_analytics_db')
+    return {'refreshed': str(analytics_sqlite_path())}
+
+
+@task('command')
+def command_task(command, args=None):
+    """Koi bhi management command (create_backup, sqlite_maintenance ...)."""
+    from io import StringIO
+    from django.core.management import call_command
+
+    out = StringIO()
+    call_command(command, *(args or []), stdout=out)
+    return {'output': out.getvalue()[-2000:]}
@@ -0,0 +1,224 @@
+"""
+🐐 Search Index — v6.1
+SQLite FTS5 virtual table `farm_search_index` — goats, customers, health records
+aur documents ka full-text index (prefix matching + bm25 ranking).
+
+Features:
+- search(q)            → /api/search/ ke ranked hits
+- matching_ids(kind,q) → `pk__in=` filter (list_goats, admin search) — full scan nahi
+- Signals se sync      → save/delete par index row upsert/remove
+- rebuild_index()      → `python manage.py rebuild_search_index`
+
+FTS5 na ho (PostgreSQL ya FTS5 ke bina compiled SQLite) to icontains fallback.
+NOTE: bulk_create() signals nahi bhejta — bulk imports ke baad index_queryset()
+ya rebuild_index() call karo.
+"""
+
+import logging
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save, post_delete
+
+from .models import Goat, Customer, HealthRecord, Document
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'farm_search_index'
+
+# kind → (model, select_related, title fn, body fn, icontains fallback fields)
+INDEXED = {
+    'goat': (
+        Goat, (),
+        lambda g: f"{g.tag_number} {g.name}",
+        lambda g: f"{g.breed} {g.color} {g.notes}",
+        ('tag_number', 'name'),
+    ),
+    'customer': (
+        Customer, (),
+        lambda c: c.name,
+        lambda c: f"{c.contact} {c.email} {c.address}",
+        ('name', 'contact'),
+    ),
+    'health': (
+        HealthRecord, ('goat',),
+        lambda h: f"{h.goat.tag_number} {h.goat.name}",
+        lambda h: f"{h.description} {h.medicine_used} {h.veterinarian}",
+        ('description', 'goat__name'),
+    ),
+    'document': (
+        Document, (),
+        lambda d: d.title,
+        lambda d: f"{d.tags} {d.document_number}",
+        ('title', 'tags'),
+    ),
+}
+
+_KIND_BY_MODEL = {spec[0]: kind for kind, spec in INDEXED.items()}
+_available = {}
+
+
+def search_available() -> bool:
+    """FTS5 table maujood hai? (per-process cache)"""
+    alias = connection.alias
+    if alias not in _available:
+        _available[alias] = (
+            connection.vendor == 'sqlite'
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available[alias]
+
+
+def build_match(query: str):
+    """
+    User input → FTS5 MATCH expression. Har word quoted + prefix (*):
+        'G-00 lai'  →  "G-00"* "lai"*
+    Quote ke andar FTS5 khud tokenize karta hai, isliye 'G-00' phrase-prefix banta hai.
+    """
+    terms = [t.replace('"', '""') for t in query.split()]
+    return ' '.join(f'"{t}"*' for t in terms) or None
+
+
+# ==================== INDEX MAINTENANCE ====================
+
+def index_objects(kind: str, objs):
+    """Objects ki index rows replace karo (delete + insert)."""
+    if not search_available():
+        return
+    _, _, title_fn, body_fn, _ = INDEXED[kind]
+    objs = list(objs)
+    if not objs:
+        return
+    with connection.cursor() as cursor:
+        remove_ids(kind, [o.pk for o in objs], cursor=cursor)
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (kind, object_id, title, body) VALUES (%s, %s, %s, %s)",
+            [(kind, o.pk, title_fn(o), body_fn(o)) for o in objs],
+        )
+
+
+def remove_ids(kind: str, ids, cursor=None):
+    if not search_available() or not ids:
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    sql = f"DELETE FROM {SEARCH_TABLE} WHERE kind = %s AND object_id IN ({placeholders})"
+    if cursor is not None:
+        cursor.execute(sql, [kind, *ids])
+    else:
+        with connection.cursor() as c:
+            c.execute(sql, [kind, *ids])
+
+
+def index_queryset(kind: str, queryset=None, chunk_size: int = 2000) -> int:
+    """Queryset ko chunks mein index karo — bulk imports ke baad use karo."""
+    model, related, *_ = INDEXED[kind]
+    if queryset is None:
+        queryset = model.objects.all()
+    queryset = queryset.select_related(*related).order_by()
+    batch, total = [], 0
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            index_objects(kind, batch)
+            total += len(batch)
+            batch = []
+    index_objects(kind, batch)
+    return total + len(batch)
+
+
+def rebuild_index() -> dict:
+    """Poora index dobara banao."""
+    if not search_available():
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+    counts = {kind: index_queryset(kind) for kind in INDEXED}
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    return counts
+
+
+def _on_save(sender, instance, **kwargs):
+    kind = _KIND_BY_MODEL.get(sender)
+    if kind:
+        index_objects(kind, [instance])
+    if sender is Goat:
+        # Health titles mein goat ka naam/tag hai
+        index_queryset('health', HealthRecord.objects.filter(goat_id=instance.pk))
+
+
+def _on_delete(sender, instance, **kwargs):
+    kind = _KIND_BY_MODEL.get(sender)
+    if kind:
+        remove_ids(kind, [instance.pk])
+
+
+def connect_signals():
+    """FarmConfig.ready() se call hota hai."""
+    for model in _KIND_BY_MODEL:
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'farm_search_save_{model.__name__}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'farm_search_delete_{model.__name__}')
+
+
+# ==================== QUERIES ====================
+
+def matching_ids(kind: str, query: str):
+    """
+    `Model.objects.filter(pk__in=matching_ids('goat', q))` ke liye.
+    FTS available hai to subquery (RawSQL), warna icontains wala pk queryset.
+    """
+    match = build_match(query)
+    if match and search_available():
+        return RawSQL(
+            f"SELECT object_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND kind = %s",
+            (match, kind),
+        )
+    model, _, _, _, fields = INDEXED[kind]
+    cond = Q()
+    for field in fields:
+        cond |= Q(**{f"{field}__icontains": query})
+    return model.objects.filter(cond).values('pk')
+
+
+def search(query: str, kinds=None, limit: int = 20) -> list:
+    """
+    Ranked hits: [{kind, id, title, snippet, score}, ...]
+    Title column ka weight body se 10x zyada hai.
+    """
+    kinds = [k for k in (kinds or INDEXED) if k in INDEXED]
+    match = build_match(query or '')
+    if not match or not kinds:
+        return []
+
+    if not search_available():
+        return _fallback_search(query, kinds, limit)
+
+    placeholders = ', '.join(['%s'] * len(kinds))
+    sql = (
+        f"SELECT kind, object_id, title, "
+        f"snippet({SEARCH_TABLE}, 3, '[', ']', '…', 12), "
+        f"bm25({SEARCH_TABLE}, 0, 0, 10.0, 1.0) AS rank "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND kind IN ({placeholders}) "
+        f"ORDER BY rank LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, *kinds, limit])
+        rows = cursor.fetchall()
+    return [
+        {'kind': kind, 'id': obj_id, 'title': title, 'snippet': snippet, 'score': round(-rank, 3)}
+        for kind, obj_id, title, snippet, rank in rows
+    ]
+
+
+def _fallback_search(query, kinds, limit):
+    hits = []
+    for kind in kinds:
+        model, related, title_fn, body_fn, _ = INDEXED[kind]
+        qs = model.objects.filter(pk__in=matching_ids(kind, query)).select_related(*related)
+        for obj in qs[:limit]:
+            hits.append({
+                'kind': kind, 'id': obj.pk, 'title': title_fn(obj),
+                'snippet': body_fn(obj)[:80], 'score': 0.0,
+            })
+    return hits[:limit]
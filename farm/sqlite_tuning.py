@@ -0,0 +1,65 @@
+"""
+🐐 SQLite Tuning — v6.1
+Har nayi SQLite connection par production pragmas (connection_created signal).
+
+Features:
+- WAL journal        → readers writers ko block nahi karte (milk entry + analytics saath)
+- synchronous=NORMAL → WAL mein safe, har commit par fsync nahi
+- cache_size / mmap  → hot pages memory mein
+- temp_store=MEMORY  → sort / GROUP BY temp tables RAM mein
+- busy_timeout       → lock mile to turant "database is locked" nahi, wait karo
+
+Sab values settings.SQLITE_PRAGMAS se override hoti hain (None = pragma skip).
+Maintenance: `python manage.py sqlite_maintenance` (PRAGMA optimize + WAL checkpoint).
+"""
+
+import logging
+import sqlite3
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,           # negative = KiB → ~20 MB page cache
+    'mmap_size': 128 * 1024 * 1024,  # 128 MB memory-mapped reads
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,           # ms
+}
+
+
+def get_pragmas() -> dict:
+    """DEFAULT_PRAGMAS + settings.SQLITE_PRAGMAS (None values hata do)."""
+    pragmas = {**DEFAULT_PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+    return {k: v for k, v in pragmas.items() if v is not None}
+
+
+def apply_pragmas(raw_connection, pragmas=None) -> list:
+    """
+    Raw sqlite3 connection par pragmas chalao — benchmark bhi yahi use karta hai.
+    Har pragma alag se; jo fail hue unke naam return (jaise read-only copy par journal_mode).
+    """
+    failed = []
+    for name, value in (get_pragmas() if pragmas is None else pragmas).items():
+        try:
+            raw_connection.execute(f"PRAGMA {name}={value}")
+        except sqlite3.DatabaseError:
+            failed.append(name)
+    return failed
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    failed = apply_pragmas(connection.connection)
+    # Read-only connection (analytics copy, mode=ro) par journal_mode ka fail hona expected hai
+    if failed and 'mode=ro' not in str(connection.settings_dict['NAME']):
+        logger.warning("SQLite pragmas apply nahi hue (%s): %s", connection.alias, ', '.join(failed))
+
+
+def connect_signals():
+    """FarmConfig.ready() se call hota hai."""
+    connection_created.connect(_on_connection_created, dispatch_uid='farm_sqlite_pragmas')
@@ -0,0 +1,259 @@
+"""
+🐐 Farm Stats Service — v6.1
+API dashboard (/api/stats/dashboard/) aur HTML dashboard dono yahi use karte hain.
+
+Har table ke counts/sums ek hi conditional-aggregate SELECT mein (FILTER/CASE),
+aur ek section ke saare tables ek hi round-trip mein (CROSS JOIN of single-row
+subqueries). Sections:
+- herd     → Goat counts                                  (1 query)
+- finance  → Sale + Expense + MilkProduction totals        (1 query)
+- alerts   → Vaccination + Breeding + Task + Reminder      (1 query)
+- recent   → dashboard ki recent lists (sirf HTML page)
+
+Har section alag cache hota hai; cache key mein table watermarks hain
+(farm/watermarks.py) — data badla to key badal jaati hai, manual invalidation nahi.
+
+Async (ASGI) endpoints ke liye aget_section() / aget_dashboard_stats() —
+sections asyncio.gather se ek saath await hote hain.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Sum, Q, Value, IntegerField
+
+from .models import (
+    Goat, Sale, Expense, MilkProduction, VaccinationSchedule,
+    BreedingRecord, Task, CustomReminder, HealthRecord,
+)
+from .watermarks import watermark_token
+
+STATS_CACHE_TTL = getattr(settings, 'STATS_CACHE_TTL', 5 * 60)
+
+
+# ==================== QUERY HELPERS ====================
+
+def table_aggregates(model, **aggregates):
+    """
+    Single-row aggregate queryset: constant Value par group karne se
+    GROUP BY nahi banta, aur khaali table par bhi ek row milti hai.
+    """
+    return (
+        model.objects.order_by()
+        .annotate(_one=Value(1, output_field=IntegerField()))
+        .values('_one')
+        .annotate(**aggregates)
+        .values(*aggregates)
+    )
+
+
+def combined_aggregates(*querysets) -> dict:
+    """
+    Kai table_aggregates() ek hi SELECT mein chalao:
+        SELECT * FROM (SELECT ... FROM goat) t0 CROSS JOIN (SELECT ... FROM sale) t1 ...
+    Aliases sab querysets mein unique hone chahiye.
+    """
+    parts, params, columns = [], [], []
+    for i, qs in enumerate(querysets):
+        sql, qs_params = qs.query.sql_with_params()
+        parts.append(f"({sql}) AS t{i}")
+        params.extend(qs_params)
+        columns.extend(qs.query.annotation_select)
+    with connections[querysets[0].db].cursor() as cursor:
+        cursor.execute('SELECT * FROM ' + ' CROSS JOIN '.join(parts), params)
+        row = cursor.fetchone()
+    return dict(zip(columns, row))
+
+
+def _month_bounds(today):
+    start = today.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+# ==================== SECTIONS ====================
+
+def _herd_stats(today):
+    return combined_aggregates(table_aggregates(
+        Goat,
+        total_goats=Count('id'),
+        active_goats=Count('id', filter=Q(status='A')),
+        pregnant_goats=Count('id', filter=Q(status='P')),
+        sold_goats=Count('id', filter=Q(status='S')),
+        dead_goats=Count('id', filter=Q(status='D')),
+        male_goats=Count('id', filter=Q(gender='M')),
+        female_goats=Count('id', filter=Q(gender='F')),
+    ))
+
+
+def _finance_stats(today):
+    month_start, month_end = _month_bounds(today)
+    this_month = Q(date__gte=month_start, date__lt=month_end)
+    row = combined_aggregates(
+        table_aggregates(
+            Sale,
+            total_sales_count=Count('id'),
+            total_revenue=Sum('total_amount'),
+            this_month_revenue=Sum('total_amount', filter=this_month),
+            unpaid_sales=Count('id', filter=Q(payment_status='UP')),
+        ),
+        table_aggregates(
+            Expense,
+            total_expenses_count=Count('id'),
+            total_expenses=Sum('amount'),
+            this_month_expenses=Sum('amount', filter=this_month),
+        ),
+        table_aggregates(
+            MilkProduction,
+            total_milk=Sum('quantity'),
+            total_milk_today=Sum('quantity', filter=Q(date=today)),
+        ),
+    )
+    # SUM khaali table par NULL deta hai
+    return {k: (v or 0) for k, v in row.items()}
+
+
+def _alert_stats(today):
+    return combined_aggregates(
+        table_aggregates(
+            VaccinationSchedule,
+            upcoming_vaccinations=Count('id', filter=Q(completed=False, due_date__gte=today)),
+            overdue_vaccinations=Count('id', filter=Q(completed=False, due_date__lt=today)),
+        ),
+        table_aggregates(
+            BreedingRecord,
+            upcoming_deliveries=Count('id', filter=Q(
+                status__in=['P', 'C'], expected_delivery_date__gte=today
+            )),
+        ),
+        table_aggregates(
+            Task,
+            overdue_tasks=Count('id', filter=Q(status__in=['P', 'IP'], due_date__lt=today)),
+            pending_tasks=Count('id', filter=Q(status='P')),
+        ),
+        table_aggregates(
+            CustomReminder,
+            pending_reminders=Count('id', filter=Q(is_active=True)),
+        ),
+    )
+
+
+def _recent_lists(today):
+    """HTML dashboard ki lists — list() se evaluate karke cache-able banao."""
+    return {
+        'recent_goats': list(Goat.objects.order_by('-created_at')[:6]),
+        'recent_health': list(HealthRecord.objects.select_related('goat').order_by('-date')[:5]),
+        'upcoming_deliveries': list(
+            BreedingRecord.objects.select_related('mother', 'father')
+            .filter(status__in=['P', 'C'], expected_delivery_date__gte=today)
+            .order_by('expected_delivery_date')[:4]
+        ),
+        'recent_sales': list(Sale.objects.order_by('-date')[:5]),
+    }
+
+
+SECTIONS = {
+    'herd':    ((Goat,), _herd_stats),
+    'finance': ((Sale, Expense, MilkProduction), _finance_stats),
+    'alerts':  ((VaccinationSchedule, BreedingRecord, Task, CustomReminder), _alert_stats),
+    'recent':  ((Goat, HealthRecord, BreedingRecord, Sale), _recent_lists),
+}
+
+
+def get_section(name: str, refresh: bool = False) -> dict:
+    """
+    Ek section — cache hit par zero DB queries.
+    refresh=True → hamesha dobara banao aur cache.set (TTL naye sire se) — scheduler ka cache_warmup;
+    sirf hit par TTL nahi badhta, to entry warmup runs ke beech expire ho jaati.
+    """
+    models, builder = SECTIONS[name]
+    today = date.today()
+    key = f"stats_{name}_{today.isoformat()}_{watermark_token(models)}"
+    data = None if refresh else cache.get(key)
+    if data is None:
+        data = builder(today)
+        cache.set(key, data, STATS_CACHE_TTL)
+    return data
+
+
+async def aget_section(name: str) -> dict:
+    """
+    get_section() ka async version. Cache + DB dono sync APIs hain, isliye
+    sync_to_async — Django 4.2 mein async ORM bhi andar yahi karta hai.
+    """
+    return await sync_to_async(get_section)(name)
+
+
+# ==================== PUBLIC API ====================
+
+def get_dashboard_stats() -> dict:
+    """/api/stats/dashboard/ ka response."""
+    return _dashboard_payload(get_section('herd'), get_section('finance'), get_section('alerts'))
+
+
+async def aget_dashboard_stats() -> dict:
+    """Async dashboard — teeno sections concurrently await karo."""
+    herd, finance, alerts = await asyncio.gather(
+        aget_section('herd'), aget_section('finance'), aget_section('alerts'),
+    )
+    return _dashboard_payload(herd, finance, alerts)
+
+
+def _dashboard_payload(herd, finance, alerts) -> dict:
+    revenue = finance['total_revenue']
+    expenses = finance['total_expenses']
+    month_revenue = finance['this_month_revenue']
+    month_expenses = finance['this_month_expenses']
+
+    return {
+        # Goat counts
+        "total_goats": herd['total_goats'],
+        "active_goats": herd['active_goats'],
+        "pregnant_goats": herd['pregnant_goats'],
+        "sold_goats": herd['sold_goats'],
+        "dead_goats": herd['dead_goats'],
+        # Sales & expenses
+        "total_sales_count": finance['total_sales_count'],
+        "total_expenses_count": finance['total_expenses_count'],
+        "total_milk_production_liters": round(finance['total_milk'], 2),
+        "total_revenue": round(revenue, 2),
+        "total_expenses": round(expenses, 2),
+        "net_profit": round(revenue - expenses, 2),
+        # This month
+        "this_month_revenue": round(month_revenue, 2),
+        "this_month_expenses": round(month_expenses, 2),
+        "this_month_profit": round(month_revenue - month_expenses, 2),
+        # Alerts
+        "upcoming_vaccinations": alerts['upcoming_vaccinations'],
+        "upcoming_deliveries": alerts['upcoming_deliveries'],
+        "overdue_tasks": alerts['overdue_tasks'],
+        "unpaid_sales": finance['unpaid_sales'],
+    }
+
+
+def get_dashboard_context() -> dict:
+    """views.dashboard ka template context."""
+    herd = get_section('herd')
+    finance = get_section('finance')
+    alerts = get_section('alerts')
+    context = {
+        'total_goats':           herd['total_goats'],
+        'active_goats':          herd['active_goats'],
+        'pregnant_goats':        herd['pregnant_goats'],
+        'male_goats':            herd['male_goats'],
+        'female_goats':          herd['female_goats'],
+        'total_milk_today':      finance['total_milk_today'],
+        'total_sales_amount':    finance['total_revenue'],
+        'total_expenses_amount': finance['total_expenses'],
+        'pending_tasks':         alerts['pending_tasks'],
+        'overdue_vaccinations':  alerts['overdue_vaccinations'],
+        'pending_reminders':     alerts['pending_reminders'],
+        **get_section('recent'),
+    }
+    context['profit'] = context['total_sales_amount'] - context['total_expenses_amount']
+    return context
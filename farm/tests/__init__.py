@@ -0,0 +1,27 @@
+"""
+🐐 farm tests
+    python manage.py test farm                          # SQLite (default settings)
+    python manage.py test farm.tests.test_postgres      # DATABASE_URL (PostgreSQL) ho tab
+
+Watermarks / stats cache FileBasedCache (BASE_DIR/cache) mein likhte hain — tests locmem par,
+taaki repo ka cache/ folder na bhare aur test classes ek doosre ka cache na dekhein.
+"""
+
+from datetime import date
+
+from django.test import override_settings
+
+isolated_cache = override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'farm-tests'},
+})
+
+
+def make_goat(tag, **fields):
+    from farm.models import Goat
+
+    values = dict(
+        tag_number=tag, name=tag, breed='boer', gender='F', status='A', color='brown',
+        date_of_birth=date(2023, 1, 1), weight=30, purchase_date=date(2023, 6, 1), purchase_price=8000,
+    )
+    values.update(fields)
+    return Goat.objects.create(**values)
@@ -0,0 +1,54 @@
+"""Admin Excel import view (farm/admin_excel_views.py) — form ke galat inputs job banne se pehle."""
+
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+
+from farm.admin_excel_views import admin_excel_import
+from farm.models import BackgroundJob
+
+from . import isolated_cache
+
+
+@isolated_cache
+@override_settings(IMPORT_ASYNC_BYTES=0)     # har upload background job wale raste par
+class AdminImportFormTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+
+    def setUp(self):
+        media = tempfile.mkdtemp(prefix='farm-media-test-')     # save_upload() yahan likhta hai
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media))
+
+    def _post(self, model, mode):
+        upload = SimpleUploadedFile('sheet.csv', b'goat,date,weight\nW-1,2025-03-01,31\n', content_type='text/csv')
+        request = RequestFactory().post('/', {'file': upload, 'model': model, 'mode': mode})
+        request.user, request.session = self.admin, SessionStore()
+        request._messages = FallbackStorage(request)
+        response = admin_excel_import(request)
+        return response, [str(m) for m in request._messages]
+
+    def test_unknown_mode_rejected_before_enqueue(self):
+        response, notes = self._post('weight', 'replace')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('Galat import mode', notes[0])
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_upsert_without_natural_key_rejected(self):
+        _, notes = self._post('sales', 'upsert')
+        self.assertIn('upsert nahi', notes[0])
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_valid_mode_enqueues(self):
+        _, notes = self._post('weight', 'upsert')
+        job = BackgroundJob.objects.get()
+        self.assertEqual((job.kind, job.params['mode'], job.params['layout']), ('bulk_import', 'upsert', 'sheet'))
+        self.assertIn(f"#{job.pk}", notes[0])
@@ -0,0 +1,89 @@
+"""Bulk import (farm/bulk_import.py) — upsert dobara chalana, insert duplicates, chunked resume."""
+
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from farm.bulk_import import ImportFileError, import_chunks, import_file
+from farm.models import Goat, WeightRecord
+
+from . import isolated_cache, make_goat
+
+
+def _csv(name, text):
+    return SimpleUploadedFile(name, text.encode(), content_type='text/csv')
+
+
+WEIGHTS = "goat_tag,date,weight\nW-1,2025-03-01,31.5\nW-2,2025-03-01,28\n"
+WEIGHTS_FIXED = "goat_tag,date,weight\nW-1,2025-03-01,32.5\nW-2,2025-03-01,28\n"
+
+
+@isolated_cache
+class UpsertImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = make_goat('W-1')
+        make_goat('W-2')
+
+    def test_reapplying_upsert_updates_instead_of_duplicating(self):
+        report = import_file(_csv('w.csv', WEIGHTS), 'weight', mode='upsert')
+        self.assertEqual((report['success'], report['failed'], report['updated']), (2, 0, 0))
+
+        report = import_file(_csv('w.csv', WEIGHTS_FIXED), 'weight', mode='upsert')
+        self.assertEqual((report['failed'], report['updated']), (0, 2))
+        self.assertEqual(WeightRecord.objects.count(), 2)
+        self.assertEqual(WeightRecord.objects.get(goat=self.first, date=date(2025, 3, 1)).weight, 32.5)
+
+    def test_insert_mode_reports_existing_rows(self):
+        import_file(_csv('w.csv', WEIGHTS), 'weight')
+        report = import_file(_csv('w.csv', WEIGHTS_FIXED), 'weight')
+        self.assertEqual((report['success'], report['failed']), (0, 2))
+        self.assertTrue(all(error.startswith('Row ') for error in report['errors']))
+        self.assertEqual(WeightRecord.objects.get(goat=self.first).weight, 31.5)
+
+    def test_upsert_only_touches_columns_in_file(self):
+        import_file(_csv('g.csv', "tag_number,name,breed,gender,color,date_of_birth,weight,purchase_date,"
+                                  "purchase_price\nW-1,Champa,boer,F,white,2023-01-01,40,2023-06-01,9000\n"),
+                    'goats', mode='upsert')
+        goat = Goat.objects.get(tag_number='W-1')
+        self.assertEqual((goat.name, goat.weight), ('Champa', 40))
+        self.assertEqual(Goat.objects.count(), 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ImportFileError):
+            import_file(_csv('w.csv', WEIGHTS), 'weight', mode='replace')
+
+
+@isolated_cache
+class ChunkedResumeTests(TestCase):
+
+    def setUp(self):
+        folder = Path(tempfile.mkdtemp(prefix='farm-import-test-'))
+        self.addCleanup(shutil.rmtree, folder, ignore_errors=True)
+        for i in range(5):
+            make_goat(f"R-{i}")
+        self.path = folder / 'weights.csv'
+        self.path.write_text('goat_tag,date,weight\n' + ''.join(f"R-{i},2025-04-01,{30 + i}\n" for i in range(5)))
+
+    def test_resume_from_checkpoint_after_crash(self):
+        checkpoints = []
+
+        def crash_on_second_chunk(state):
+            if checkpoints:
+                raise RuntimeError('worker mar gaya')
+            checkpoints.append(dict(state, errors=list(state['errors'])))
+
+        with self.assertRaises(RuntimeError):
+            import_chunks(str(self.path), 'weight', chunk_rows=2, save=crash_on_second_chunk)
+        # Dusra chunk save ke saath rollback — sirf pehla chunk committed
+        self.assertEqual(WeightRecord.objects.count(), 2)
+        self.assertEqual(checkpoints[0]['rows'], 2)
+
+        report = import_chunks(str(self.path), 'weight', chunk_rows=2, state=checkpoints[0])
+        self.assertEqual((report['rows'], report['success'], report['failed']), (5, 5, 0))
+        self.assertEqual(WeightRecord.objects.count(), 5)
@@ -0,0 +1,114 @@
+"""Feed stock ledger (farm/feed_stock.py) — conditional UPDATE aur record_day ka all-or-nothing."""
+
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from farm import feed_stock
+from farm.models import FeedConsumption, FeedInventory
+
+from . import isolated_cache
+
+DAY = date(2025, 6, 1)
+
+
+def _feed(name, quantity):
+    return FeedInventory.objects.create(feed_name=name, feed_type='D', quantity=quantity, unit_price=20,
+                                        purchase_date=date(2025, 5, 1), supplier='Mandi')
+
+
+def _quantity(feed):
+    return FeedInventory.objects.get(pk=feed.pk).quantity
+
+
+@isolated_cache
+class ConsumeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bajra = _feed('Bajra', 10)
+
+    def test_insufficient_stock_changes_nothing(self):
+        with self.assertRaisesMessage(ValidationError, 'Insufficient stock: Bajra available 10'):
+            feed_stock.consume(self.bajra.pk, 12)
+        self.assertEqual(_quantity(self.bajra), 10)
+
+    def test_exact_stock_goes_to_zero(self):
+        feed_stock.consume(self.bajra.pk, 10)
+        self.assertEqual(_quantity(self.bajra), 0)
+
+    def test_consumption_edit_and_delete(self):
+        entry = FeedConsumption.objects.create(feed=self.bajra, date=DAY, quantity_consumed=4)
+        self.assertEqual(_quantity(self.bajra), 6)
+        entry.quantity_consumed = 7
+        entry.save()
+        self.assertEqual(_quantity(self.bajra), 3)
+        entry.delete()
+        self.assertEqual(_quantity(self.bajra), 10)
+
+
+@isolated_cache
+class RecordDayTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bajra = _feed('Bajra', 50)
+        cls.chara = _feed('Hara Chara', 5)
+
+    def test_shortfall_rolls_back_every_feed(self):
+        with self.assertRaises(ValidationError) as caught:
+            feed_stock.record_day(DAY, [(self.bajra.pk, 20), (self.chara.pk, 4), (self.chara.pk, 3)])
+        self.assertEqual(len(caught.exception.messages), 1)
+        self.assertIn('Hara Chara', caught.exception.messages[0])
+        self.assertEqual((_quantity(self.bajra), _quantity(self.chara)), (50, 5))
+        self.assertFalse(FeedConsumption.objects.exists())
+
+    def test_records_whole_day(self):
+        result = feed_stock.record_day(DAY, [(self.bajra.pk, 20), (self.chara.pk, 2), (self.chara.pk, 3)])
+        self.assertEqual({r['feed_id']: r['remaining'] for r in result}, {self.bajra.pk: 30, self.chara.pk: 0})
+        self.assertEqual(FeedConsumption.objects.filter(date=DAY).count(), 3)
+
+    def test_zero_quantity_rejected(self):
+        with self.assertRaises(ValidationError):
+            feed_stock.record_day(DAY, [(self.bajra.pk, 0)])
+        self.assertEqual(_quantity(self.bajra), 50)
+
+
+@isolated_cache
+class ConsumptionDeleteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bajra = _feed('Bajra', 100)
+        cls.chara = _feed('Hara Chara', 100)
+        for feed, quantity in ((cls.bajra, 5), (cls.bajra, 7), (cls.bajra, 8), (cls.chara, 10), (cls.chara, 15)):
+            FeedConsumption.objects.create(feed=feed, date=DAY, quantity_consumed=quantity)
+
+    def _restock_updates(self, ctx):
+        return [q['sql'] for q in ctx.captured_queries
+                if q['sql'].startswith('UPDATE') and 'farm_feedinventory' in q['sql']]
+
+    def test_bulk_delete_one_update_per_feed(self):
+        with CaptureQueriesContext(connection) as ctx:
+            deleted, _ = FeedConsumption.objects.all().delete()
+        self.assertEqual(deleted, 5)
+        self.assertEqual(len(self._restock_updates(ctx)), 2)
+        self.assertEqual((_quantity(self.bajra), _quantity(self.chara)), (100, 100))
+
+    def test_related_manager_delete(self):
+        self.bajra.consumption.filter(quantity_consumed__gt=5).delete()
+        self.assertEqual((_quantity(self.bajra), _quantity(self.chara)), (95, 75))
+
+    def test_feed_delete_cascade_skips_restock(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.bajra.delete()
+        self.assertEqual(self._restock_updates(ctx), [])
+        self.assertEqual(FeedConsumption.objects.count(), 2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            FeedInventory.objects.filter(pk=self.chara.pk).delete()
+        self.assertEqual(self._restock_updates(ctx), [])
+        self.assertFalse(FeedConsumption.objects.exists())
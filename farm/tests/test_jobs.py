@@ -0,0 +1,82 @@
+"""Background jobs (farm/jobs.py) — claim race, retry / resume, stale workers."""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from farm import jobs
+from farm.models import BackgroundJob
+
+from . import isolated_cache
+
+
+def _flaky(ctx, fail=True):
+    """Pehli baar checkpoint likh ke fail; retry par checkpoint se aage."""
+    if isinstance(ctx.job.result, dict) and 'step' in ctx.job.result:
+        return {'resumed_from': ctx.job.result['step']}
+    BackgroundJob.objects.filter(pk=ctx.job.pk).update(result={'step': 1})
+    raise RuntimeError('beech mein fail')
+
+
+# work() har loop par close_old_connections() — TestCase ke transaction mein (autocommit off) Postgres
+# connection band kar deta; test client bhi request signals se ise hata deta hai
+@mock.patch.object(jobs, 'close_old_connections', lambda: None)
+@isolated_cache
+@mock.patch.dict(jobs.HANDLERS, {'flaky': _flaky, 'echo': lambda ctx, **params: params})
+class JobQueueTests(TestCase):
+
+    def test_double_claim_gets_the_job_once(self):
+        queued = jobs.enqueue('echo', {'n': 1})
+        first = jobs.claim_next('worker-a')
+        second = jobs.claim_next('worker-b')
+
+        self.assertEqual(first.pk, queued.pk)
+        self.assertIsNone(second)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.worker, queued.attempts), ('RUNNING', 'worker-a', 1))
+
+    def test_claims_oldest_first(self):
+        older, newer = jobs.enqueue('echo'), jobs.enqueue('echo')
+        self.assertEqual(jobs.claim_next('a').pk, older.pk)
+        self.assertEqual(jobs.claim_next('b').pk, newer.pk)
+
+    def test_unknown_kind_rejected(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('nahi-hai')
+
+    def test_work_runs_queue_to_done(self):
+        queued = jobs.enqueue('echo', {'n': 7})
+        self.assertEqual(jobs.work('w', once=True), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.progress, queued.result), ('DONE', 100, {'n': 7}))
+
+    def test_retry_resumes_from_checkpoint(self):
+        queued = jobs.enqueue('flaky')
+        with self.assertLogs('farm.jobs', 'ERROR'):
+            jobs.work('w', once=True)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'FAILED')
+        self.assertIn('beech mein fail', queued.error)
+
+        self.assertTrue(jobs.retry(queued))
+        self.assertFalse(jobs.retry(queued))    # ab QUEUED hai, FAILED nahi
+        jobs.work('w', once=True)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts, queued.result), ('DONE', 1, {'resumed_from': 1}))
+
+    def test_retry_only_failed(self):
+        queued = jobs.enqueue('echo')
+        self.assertFalse(jobs.retry(queued))
+
+    @override_settings(JOB_STALE_SECONDS=60, JOB_MAX_ATTEMPTS=2)
+    def test_requeue_stale_respects_max_attempts(self):
+        old = timezone.now() - timedelta(minutes=5)
+        lost = BackgroundJob.objects.create(kind='echo', status='RUNNING', attempts=1, heartbeat_at=old, worker='x')
+        spent = BackgroundJob.objects.create(kind='echo', status='RUNNING', attempts=2, heartbeat_at=old, worker='x')
+        alive = BackgroundJob.objects.create(kind='echo', status='RUNNING', attempts=1, heartbeat_at=timezone.now())
+
+        self.assertEqual(jobs.requeue_stale(), 2)
+        statuses = dict(BackgroundJob.objects.values_list('pk', 'status'))
+        self.assertEqual((statuses[lost.pk], statuses[spent.pk], statuses[alive.pk]), ('QUEUED', 'FAILED', 'RUNNING'))
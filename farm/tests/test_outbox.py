@@ -0,0 +1,82 @@
+"""Notification outbox (farm/outbox.py) — dedup aur drain ke outcomes."""
+
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from farm import outbox
+from farm.models import Notification, OutboxMessage
+
+from . import isolated_cache
+
+TODAY = date(2025, 5, 1)
+
+
+def _alert(subject_id=12, recipient='+919800000000'):
+    return outbox.alert('vaccination', subject_id, 'Vaccination due', 'PPR kal hai', recipient=recipient, for_date=TODAY)
+
+
+@isolated_cache
+class EnqueueTests(TestCase):
+
+    def test_same_key_twice_is_one_row(self):
+        self.assertEqual(outbox.enqueue([_alert()]), {('vaccination', 12, TODAY)})
+        self.assertEqual(outbox.enqueue([_alert()]), set())
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_duplicates_in_one_call(self):
+        new = outbox.enqueue([_alert(), _alert(), _alert(13)])
+        self.assertEqual(len(new), 2)
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+
+    def test_next_day_is_a_new_message(self):
+        outbox.enqueue([_alert()])
+        later = outbox.alert('vaccination', 12, 'Vaccination due', 'PPR aaj hai', for_date=date(2025, 5, 2))
+        self.assertEqual(len(outbox.enqueue([later])), 1)
+
+
+@isolated_cache
+@override_settings(OUTBOX_MAX_ATTEMPTS=3)
+class DrainTests(TestCase):
+
+    def _drain(self, *outcomes):
+        with mock.patch.object(outbox, 'send_many', side_effect=[list(outcomes)] * 5) as send:
+            counts = outbox.drain()
+        return counts, send
+
+    def test_sent_and_logged_once(self):
+        outbox.enqueue([_alert()])
+        counts, _ = self._drain({'success': True, 'sid': 'SM1'})
+        row = OutboxMessage.objects.get()
+        self.assertEqual(counts, {'sent': 1, 'failed': 0, 'skipped': 0})
+        self.assertEqual((row.status, row.provider_sid), ('SENT', 'SM1'))
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_no_recipient_skipped_without_sending(self):
+        outbox.enqueue([_alert(recipient='')])
+        counts, send = self._drain()
+        self.assertEqual(counts['skipped'], 1)
+        self.assertEqual(send.call_args[0][0], [])
+
+    def test_uncertain_failure_not_reclaimed(self):
+        outbox.enqueue([_alert()])
+        counts, _ = self._drain({'success': False, 'uncertain': True, 'error': 'HTTP 502 — delivery unknown'})
+        row = OutboxMessage.objects.get()
+        self.assertEqual(counts['failed'], 1)
+        self.assertEqual((row.status, row.attempts), ('FAILED', 3))
+
+        counts, send = self._drain({'success': True, 'sid': 'SM2'})
+        self.assertEqual(counts, {'sent': 0, 'failed': 0, 'skipped': 0})
+        send.assert_not_called()
+
+    def test_plain_failure_retried_next_drain(self):
+        outbox.enqueue([_alert()])
+        self._drain({'success': False, 'error': 'HTTP 400'})
+        self.assertEqual(OutboxMessage.objects.get().attempts, 1)
+
+        counts, _ = self._drain({'success': True, 'sid': 'SM3'})
+        row = OutboxMessage.objects.get()
+        self.assertEqual(counts['sent'], 1)
+        self.assertEqual((row.status, row.attempts), ('SENT', 2))
+        self.assertEqual(Notification.objects.count(), 1)    # retry par dobara log nahi
@@ -0,0 +1,131 @@
+"""Backup → restore round trip (farm/restore.py) aur incremental chain (create_backup --incremental)."""
+
+import io
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from farm.backup_stream import iter_json_backup, iter_ndjson_backup, pinned_querysets
+from farm.backup_views import ALL_MODELS
+from farm.models import Customer, FeedConsumption, FeedInventory, Goat, HealthRecord, VetVisit
+from farm.restore import BackupFormatError, restore_backup, topological_order
+
+from . import isolated_cache, make_goat
+
+
+def _snapshot():
+    """Restore ke baad compare karne layak state — pk + important fields, M2M bhi."""
+    return {
+        'goats': sorted(Goat.objects.values_list('pk', 'tag_number', 'mother_id', 'father_id')),
+        'health': sorted(HealthRecord.objects.values_list('pk', 'goat_id', 'record_type', 'cost')),
+        'feed': sorted(FeedInventory.objects.values_list('pk', 'feed_name', 'quantity')),
+        'consumption': sorted(FeedConsumption.objects.values_list('pk', 'feed_id', 'quantity_consumed')),
+        'visits': sorted((v.pk, tuple(sorted(v.goats_visited.values_list('pk', flat=True))))
+                         for v in VetVisit.objects.all()),
+    }
+
+
+def _backup(writer) -> io.BytesIO:
+    return io.BytesIO(''.join(writer(pinned_querysets(ALL_MODELS))).encode())
+
+
+@isolated_cache
+class RestoreRoundTripTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        mother = make_goat('M-1')
+        father = make_goat('F-1', gender='M')
+        # Goat → Goat self FK (mother / father) restore ke baad bhi same pk par
+        kid = make_goat('K-1', mother=mother, father=father)
+        HealthRecord.objects.create(goat=kid, record_type='V', date=date(2025, 2, 1), description='PPR', cost=50)
+        feed = FeedInventory.objects.create(feed_name='Bajra', feed_type='D', quantity=90, unit_price=20,
+                                            purchase_date=date(2025, 1, 1), supplier='Mandi')
+        FeedConsumption.objects.create(feed=feed, date=date(2025, 2, 1), quantity_consumed=10)
+        visit = VetVisit.objects.create(date=date(2025, 2, 2), vet_name='Dr. Rao', contact='1',
+                                        observations='ok', cost=300)
+        visit.goats_visited.set([mother, kid])
+
+    def _round_trip(self, writer):
+        before = _snapshot()
+        backup = _backup(writer)
+        # Backup ke baad data badla — restore ko ye sab hata ke backup wali state lani hai
+        make_goat('EXTRA-1')
+        Goat.objects.filter(tag_number='M-1').update(weight=99)
+        HealthRecord.objects.all().delete()
+
+        report = restore_backup(backup, ALL_MODELS)
+
+        self.assertEqual(report['errors'], {})
+        self.assertEqual(report['results']['goats']['restored'], 3)
+        self.assertEqual(_snapshot(), before)
+        self.assertEqual(Goat.objects.get(tag_number='M-1').weight, 30)
+        self.assertFalse(Goat.objects.filter(tag_number='EXTRA-1').exists())
+
+    def test_ndjson_round_trip(self):
+        self._round_trip(iter_ndjson_backup)
+
+    def test_json_round_trip(self):
+        self._round_trip(iter_json_backup)
+
+    def test_new_rows_after_restore_get_fresh_ids(self):
+        restore_backup(_backup(iter_ndjson_backup), ALL_MODELS)
+        goat = make_goat('NEW-1')
+        self.assertGreater(goat.pk, max(pk for pk, *_ in _snapshot()['goats'] if pk != goat.pk))
+
+    def test_feed_stock_untouched_by_restore(self):
+        # FeedConsumption.save() 90 → 80 kar chuka; raw inserts / _raw_delete ledger dobara nahi chalate
+        self.assertEqual(FeedInventory.objects.get().quantity, 80)
+        restore_backup(_backup(iter_ndjson_backup), ALL_MODELS)
+        self.assertEqual(FeedInventory.objects.get().quantity, 80)
+
+    def test_empty_upload_is_rejected_without_deleting(self):
+        with self.assertRaises(BackupFormatError):
+            restore_backup(io.BytesIO(b'{"data": {}}'), ALL_MODELS)
+        self.assertEqual(Goat.objects.count(), 3)
+
+    def test_parents_before_children(self):
+        order = [key for key, _ in topological_order(list(reversed(ALL_MODELS)))]
+        self.assertLess(order.index('goats'), order.index('health'))
+        self.assertLess(order.index('feed_inventory'), order.index('feed_consumption'))
+        self.assertLess(order.index('customers'), order.index('credits'))
+
+
+@isolated_cache
+class IncrementalChainTests(TestCase):
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp(prefix='farm-backup-test-'))
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def _create_backup(self, *args):
+        call_command('create_backup', '--incremental', '--dir', str(self.directory), *args, stdout=io.StringIO())
+
+    def test_base_plus_incremental_restores_latest_state(self):
+        keep = make_goat('A-1')
+        edited = make_goat('A-2')
+        gone = make_goat('A-3')
+        self._create_backup('--full')
+
+        Goat.objects.filter(pk=edited.pk).update(weight=44)
+        gone.delete()
+        make_goat('A-4')
+        Customer.objects.create(name='Ramesh', contact='9', address='Gaon')
+        self._create_backup()
+        expected = sorted(Goat.objects.values_list('tag_number', 'weight'))
+
+        incremental = sorted(self.directory.glob('farm_incr_*.ndjson'))
+        self.assertEqual(len(incremental), 1)
+        Goat.objects.all().delete()
+        Customer.objects.all().delete()
+
+        call_command('restore_backup', str(incremental[0]), '--noinput', stdout=io.StringIO())
+
+        self.assertEqual(sorted(Goat.objects.values_list('tag_number', 'weight')), expected)
+        self.assertTrue(Goat.objects.filter(pk=keep.pk).exists())
+        self.assertFalse(Goat.objects.filter(pk=gone.pk).exists())
+        self.assertEqual(Customer.objects.get().name, 'Ramesh')
@@ -0,0 +1,69 @@
+"""Scheduler (farm/scheduler.py) — cron matching aur single-holder lease."""
+
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from farm.models import SchedulerLease
+from farm.scheduler import Cron, acquire_lease, release_lease
+
+from . import isolated_cache
+
+
+def _at(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class CronTests(SimpleTestCase):
+
+    def test_next_after(self):
+        cases = [
+            ('0 7 * * *',     _at(2025, 6, 1, 6, 59),  _at(2025, 6, 1, 7, 0)),
+            ('0 7 * * *',     _at(2025, 6, 1, 7, 0),   _at(2025, 6, 2, 7, 0)),   # usi minute par → agla din
+            ('*/4 5-9 * * *', _at(2025, 6, 1, 9, 58),  _at(2025, 6, 2, 5, 0)),
+            ('30 2 1 * *',    _at(2025, 1, 31, 12, 0), _at(2025, 2, 1, 2, 30)),
+            ('0 0 29 2 *',    _at(2025, 3, 1, 0, 0),   _at(2028, 2, 29, 0, 0)),  # leap year tak
+            ('0 9 * * 0',     _at(2025, 6, 2, 0, 0),   _at(2025, 6, 8, 9, 0)),   # Sunday
+            ('0 9 * * 7',     _at(2025, 6, 2, 0, 0),   _at(2025, 6, 8, 9, 0)),   # 7 bhi Sunday
+        ]
+        for expression, after, expected in cases:
+            with self.subTest(expression=expression, after=after):
+                self.assertEqual(Cron(expression).next_after(after), expected)
+
+    def test_day_of_month_or_weekday(self):
+        # 15 tareekh YA Monday — jo pehle aaye
+        cron = Cron('0 8 15 * 1')
+        self.assertEqual(cron.next_after(_at(2025, 6, 10, 9, 0)), _at(2025, 6, 15, 8, 0))   # Sunday 15th
+        self.assertEqual(cron.next_after(_at(2025, 6, 15, 9, 0)), _at(2025, 6, 16, 8, 0))   # Monday
+
+    def test_invalid_expressions(self):
+        for expression in ('0 7 * *', '60 * * * *', '0 24 * * *', '*/0 * * * *', 'x * * * *'):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                Cron(expression)
+
+    def test_never_matching(self):
+        with self.assertRaises(ValueError):
+            Cron('0 0 31 2 *').next_after(_at(2025, 1, 1, 0, 0))
+
+
+@isolated_cache
+class LeaseTests(TestCase):
+
+    def test_one_holder_at_a_time(self):
+        self.assertTrue(acquire_lease('node-a', 60))
+        self.assertFalse(acquire_lease('node-b', 60))
+        self.assertTrue(acquire_lease('node-a', 60))     # renew
+
+    def test_expired_lease_taken_over(self):
+        acquire_lease('node-a', 60)
+        SchedulerLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(acquire_lease('node-b', 60))
+        self.assertEqual(SchedulerLease.objects.get().holder, 'node-b')
+
+    def test_release_lets_standby_in(self):
+        acquire_lease('node-a', 60)
+        release_lease('node-b')                           # doosre ka release kuch nahi karta
+        self.assertFalse(acquire_lease('node-b', 60))
+        release_lease('node-a')
+        self.assertTrue(acquire_lease('node-b', 60))
@@ -32,6 +32,7 @@ from .backup_views import (
     download_excel_customers,
     download_excel_feed,
     download_excel_mortality,
+    download_export,
     backup_stats_api,
 )
 
@@ -74,6 +75,7 @@ urlpatterns = [
     path('excel/', excel_views.excel_import_page, name='excel_import'),
     path('excel/import/goats/', excel_views.import_goats_from_excel, name='import_goats'),
     path('excel/import/milk/', excel_views.import_milk_from_excel, name='import_milk'),
+    path('excel/import/weight/', excel_views.import_weight_from_excel, name='import_weight'),
     path('excel/import/sales/', excel_views.import_sales_from_excel, name='import_sales'),
     path('excel/import/health/', excel_views.import_health_from_excel, name='import_health'),
     path('excel/import/expenses/', excel_views.import_expenses_from_excel, name='import_expenses'),
@@ -81,6 +83,7 @@ urlpatterns = [
     # Excel template downloads
     path('excel/template/goats/', excel_views.download_goats_template, name='template_goats'),
     path('excel/template/milk/', excel_views.download_milk_template, name='template_milk'),
+    path('excel/template/weight/', excel_views.download_weight_template, name='template_weight'),
     path('excel/template/sales/', excel_views.download_sales_template, name='template_sales'),
     path('excel/template/health/', excel_views.download_health_template, name='template_health'),
     path('excel/template/expenses/', excel_views.download_expenses_template, name='template_expenses'),
@@ -147,6 +150,9 @@ urlpatterns = [
     path('backup/excel/customers/',   download_excel_customers,   name='excel_customers'),
     path('backup/excel/feed/',        download_excel_feed,        name='excel_feed'),
     path('backup/excel/mortality/',   download_excel_mortality,   name='excel_mortality'),
+
+    # Generic export — koi bhi registry dataset ('all' = sab), ?format=xlsx|csv|parquet
+    path('export/<str:dataset>/', download_export, name='export_dataset'),
 ]
 
 
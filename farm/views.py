@@ -7,18 +7,15 @@ from datetime import datetime, timedelta
 
 # Use specific imports instead of wildcard
 from .models import (
-    Goat, BreedingRecord, HealthRecord, MilkProduction,
-    FeedInventory, FeedConsumption, Sale, Expense, WeightRecord,
-    Task, Customer, Credit, Notification, Insurance, MortalityRecord,
-    AdditionalIncome, ActivityLog, VetVisit, VaccinationSchedule,
-    BudgetPlanning, PerformanceEvaluation, CustomReminder, Document,
+    Goat, HealthRecord, MilkProduction,
+    FeedInventory, FeedConsumption, WeightRecord,
+    Customer, Credit, Notification, Insurance, MortalityRecord,
+    AdditionalIncome, ActivityLog, VetVisit,
+    BudgetPlanning, PerformanceEvaluation, Document,
     PhotoGallery, WeatherRecord, MarketPrice, FarmEvent, BreedingPlan
 )
 
 
-
-from django.http import HttpResponse
-
 from .excel_export import export_to_excel
 
 
@@ -50,31 +47,8 @@ def logout_view(request):
 @require_http_methods(["GET"])
 def dashboard(request):
     """Professional Dashboard - मुख्य डैशबोर्ड"""
-    from datetime import date
-    today = date.today()
-    context = {
-        'total_goats':        Goat.objects.count(),
-        'active_goats':       Goat.objects.filter(status='A').count(),
-        'pregnant_goats':     Goat.objects.filter(status='P').count(),
-        'male_goats':         Goat.objects.filter(gender='M').count(),
-        'female_goats':       Goat.objects.filter(gender='F').count(),
-        'recent_goats':       Goat.objects.order_by('-created_at')[:6],
-        'recent_health':      HealthRecord.objects.select_related('goat').order_by('-date')[:5],
-        'upcoming_deliveries':BreedingRecord.objects.select_related('mother','father').filter(
-                                  status__in=['P','C'], expected_delivery_date__gte=today
-                              ).order_by('expected_delivery_date')[:4],
-        'total_milk_today':   MilkProduction.objects.filter(date=today).aggregate(
-                                  total=Sum('quantity'))['total'] or 0,
-        'total_sales_amount': Sale.objects.aggregate(total=Sum('total_amount'))['total'] or 0,
-        'total_expenses_amount': Expense.objects.aggregate(total=Sum('amount'))['total'] or 0,
-        'pending_tasks':      Task.objects.filter(status='P').count(),
-        'overdue_vaccinations': VaccinationSchedule.objects.filter(
-                                  completed=False, due_date__lt=today).count(),
-        'pending_reminders':  CustomReminder.objects.filter(is_active=True).count(),
-        'recent_sales':       Sale.objects.order_by('-date')[:5],
-    }
-    context['profit'] = context['total_sales_amount'] - context['total_expenses_amount']
-    return render(request, 'farm/professional_dashboard.html', context)
+    from .stats import get_dashboard_context
+    return render(request, 'farm/professional_dashboard.html', get_dashboard_context())
 
 @login_required(login_url='/login/')
 @require_http_methods(["GET"])
@@ -139,134 +113,16 @@ def api_help(request):
 def download_all_data(request):
     """
     सभी data को एक Excel file में download करो
-    Multiple sheets के साथ
+    Summary + har model ki sheet — backup page wala hi workbook (farm/exports.py registry), streaming
     """
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    
-    wb = Workbook()
-    wb.remove(wb.active)  # पहली blank sheet को remove करो
-    
-    timestamp = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
-    
-    # ==================== GOATS SHEET ====================
-    ws = wb.create_sheet("Goats (बकरियां)")
-    goats = Goat.objects.all()
-    headers = ['Tag Number', 'Name', 'Breed', 'Gender', 'Color', 'DOB', 
-              'Age (Years)', 'Weight (kg)', 'Purchase Date', 'Purchase Price (₹)', 
-              'Status', 'Created At']
-    ws.append(headers)
-    
-    for goat in goats:
-        ws.append([
-            goat.tag_number, goat.name, goat.breed, goat.gender, goat.color,
-            goat.date_of_birth.strftime('%d-%m-%Y'), goat.get_age_years(), 
-            goat.weight, goat.purchase_date.strftime('%d-%m-%Y'),
-            goat.purchase_price, goat.get_status_display(), 
-            goat.created_at.strftime('%d-%m-%Y %H:%M')
-        ])
-    
-    # ==================== HEALTH RECORDS SHEET ====================
-    ws = wb.create_sheet("Health (स्वास्थ्य)")
-    health = HealthRecord.objects.select_related('goat')
-    headers = ['Goat', 'Type', 'Date', 'Description', 'Medicine', 'Dosage', 
-              'Cost (₹)', 'Created At']
-    ws.append(headers)
-    
-    for record in health:
-        ws.append([
-            record.goat.name, record.get_record_type_display(),
-            record.date.strftime('%d-%m-%Y'), record.description,
-            record.medicine_used, record.dosage, record.cost,
-            record.created_at.strftime('%d-%m-%Y %H:%M')
-        ])
-    
-    # ==================== MILK PRODUCTION SHEET ====================
-    ws = wb.create_sheet("Milk (दूध)")
-    milk = MilkProduction.objects.select_related('goat')
-    headers = ['Goat', 'Date', 'Session', 'Quantity (L)', 'Fat %', 'Created At']
-    ws.append(headers)
-    
-    for record in milk:
-        ws.append([
-            record.goat.name, record.date.strftime('%d-%m-%Y'),
-            record.session, record.quantity, record.fat_percentage or '',
-            record.created_at.strftime('%d-%m-%Y %H:%M')
-        ])
-    
-    # ==================== SALES SHEET ====================
-    ws = wb.create_sheet("Sales (बिक्रय)")
-    sales = Sale.objects.select_related('goat')
-    headers = ['Type', 'Goat', 'Date', 'Quantity', 'Unit', 'Price per Unit (₹)', 
-              'Total Amount (₹)', 'Buyer', 'Created At']
-    ws.append(headers)
-    
-    for sale in sales:
-        ws.append([
-            sale.sale_type, sale.goat.name if sale.goat else '',
-            sale.date.strftime('%d-%m-%Y'), sale.quantity, sale.unit,
-            sale.price_per_unit, sale.total_amount, sale.buyer_name,
-            sale.created_at.strftime('%d-%m-%Y %H:%M')
-        ])
-    
-    # ==================== EXPENSES SHEET ====================
-    ws = wb.create_sheet("Expenses (खर्च)")
-    expenses = Expense.objects.all()
-    headers = ['Date', 'Type', 'Description', 'Amount (₹)', 'Paid To', 'Created At']
-    ws.append(headers)
-    
-    for expense in expenses:
-        ws.append([
-            expense.date.strftime('%d-%m-%Y'), expense.expense_type,
-            expense.description, expense.amount, expense.paid_to,
-            expense.created_at.strftime('%d-%m-%Y %H:%M')
-        ])
-    
-    # ==================== SUMMARY SHEET ====================
-    ws = wb.create_sheet("Summary (सारांश)", 0)
-    
-    total_milk = MilkProduction.objects.aggregate(total=Sum('quantity'))['total'] or 0
-    total_revenue = Sale.objects.aggregate(total=Sum('total_amount'))['total'] or 0
-    total_expenses = Expense.objects.aggregate(total=Sum('amount'))['total'] or 0
-    
-    ws['A1'] = "🐐 GOAT FARM MANAGEMENT - DATA SUMMARY"
-    ws['A1'].font = Font(bold=True, size=14)
-    ws['A3'] = "Export Date"
-    ws['B3'] = timestamp
-    
-    ws['A5'] = "STATISTICS"
-    ws['A5'].font = Font(bold=True, size=12)
-    
-    ws['A6'] = "Total Goats"
-    ws['B6'] = Goat.objects.count()
-    
-    ws['A7'] = "Active Goats"
-    ws['B7'] = Goat.objects.filter(status='A').count()
-    
-    ws['A8'] = "Total Milk Production (L)"
-    ws['B8'] = round(total_milk, 2)
-    
-    ws['A9'] = "Total Sales Revenue (₹)"
-    ws['B9'] = round(total_revenue, 2)
-    
-    ws['A10'] = "Total Expenses (₹)"
-    ws['B10'] = round(total_expenses, 2)
-    
-    ws['A11'] = "Net Profit (₹)"
-    ws['B11'] = round(total_revenue - total_expenses, 2)
-    
-    ws['A11'].font = Font(bold=True)
-    ws['B11'].font = Font(bold=True)
-    
-    # Response
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    from .backup_stream import streaming_response
+    from .backup_views import _build_complete_workbook
+    from .exports import XLSX_TYPE, iter_workbook
+
+    chunks = iter_workbook(_build_complete_workbook, datetime.now().strftime('%d-%m-%Y %H:%M:%S'))
+    return streaming_response(
+        request, chunks, XLSX_TYPE, f"farm_complete_data_{datetime.now().strftime('%d-%m-%Y')}.xlsx",
     )
-    response['Content-Disposition'] = f'attachment; filename="farm_complete_data_{datetime.now().strftime("%d-%m-%Y")}.xlsx"'
-    wb.save(response)
-    
-    return response
 
 
 @login_required(login_url='/login/')
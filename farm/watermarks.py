@@ -0,0 +1,155 @@
+"""
+🐐 Table Watermarks + Conditional GET — v6.1
+
+Har farm table ka ek "watermark" (last modification timestamp) Django cache
+mein rakha jaata hai. Model save/delete par signal se bump hota hai.
+
+Features:
+- touch(*models)            → tables ka watermark abhi ke time par set karo
+- get_watermarks(models)    → cache se watermarks lo (data tables ko touch kiye bina)
+- conditional_resource(...) → Ninja endpoints ke liye ETag / Last-Modified + 304
+
+NOTE: QuerySet.update() aur bulk_create() signals nahi bhejte — aise code paths
+mein touch(Model) khud call karo, warna clients ko stale 304 mil sakta hai.
+"""
+
+import hashlib
+import inspect
+import time
+from datetime import date
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+WATERMARK_PREFIX = 'wm_'
+
+
+def _key(model) -> str:
+    return f"{WATERMARK_PREFIX}{model._meta.label_lower}"
+
+
+def touch(*models):
+    """Given tables ka watermark bump karo."""
+    stamp = time.time()
+    cache.set_many({_key(m): stamp for m in models}, timeout=None)
+
+
+def get_watermarks(models) -> dict:
+    """
+    {label: stamp} return karo. Cache mein watermark na mile (cold cache /
+    eviction) to abhi ka time set kar do — safe side: client ko fresh 200 milega.
+    """
+    keys = {_key(m): m for m in models}
+    found = cache.get_many(list(keys))
+    missing = [m for k, m in keys.items() if k not in found]
+    if missing:
+        touch(*missing)
+        found.update(cache.get_many([_key(m) for m in missing]))
+    return {k: found.get(k, 0) for k in sorted(keys)}
+
+
+def watermark_token(models) -> str:
+    """Models ke watermarks ka short hash — cache keys ke liye useful."""
+    marks = get_watermarks(models)
+    raw = '|'.join(f"{k}={v}" for k, v in marks.items())
+    return hashlib.md5(raw.encode()).hexdigest()[:16]
+
+
+# ==================== SIGNAL RECEIVERS ====================
+
+def _on_change(sender, **kwargs):
+    if sender._meta.app_label == 'farm':
+        touch(sender)
+
+
+def _on_m2m_change(sender, instance, action, **kwargs):
+    if action.startswith('post_') and instance._meta.app_label == 'farm':
+        touch(type(instance))
+
+
+def connect_signals():
+    """FarmConfig.ready() se call hota hai."""
+    post_save.connect(_on_change, dispatch_uid='farm_watermark_save')
+    post_delete.connect(_on_change, dispatch_uid='farm_watermark_delete')
+    m2m_changed.connect(_on_m2m_change, dispatch_uid='farm_watermark_m2m')
+
+
+# ==================== CONDITIONAL GET ====================
+
+def _validators(request, models, per_day):
+    """(etag, last_modified, is_authenticated) — cache + session access, sync code."""
+    marks = get_watermarks(models)
+    authenticated = request.user.is_authenticated
+    raw = '|'.join([
+        request.get_full_path(), str(request.user.pk if authenticated else 'anon'),
+        *(f"{k}={v}" for k, v in marks.items()),
+        date.today().isoformat() if per_day else '',
+    ])
+    etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    return etag, int(max(marks.values(), default=0)), authenticated
+
+
+def _finish(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_resource(*models, per_day=False):
+    """
+    View decorator — Ninja mein `@decorate_view(conditional_resource(Goat))` se lagao.
+
+    ETag = hash(path + query + user + table watermarks [+ aaj ki date]).
+    Response body ka hash nahi banta — isliye unchanged data par 304 bina
+    koi data query chalaye return ho jaata hai.
+
+    per_day=True un endpoints ke liye jinka output date.today() par depend karta hai
+    (jaise dashboard ke "upcoming"/"this month" numbers).
+
+    Sync aur async (ASGI) dono operations par kaam karta hai — async mein cache/session
+    wala hissa sync_to_async se chalta hai.
+    """
+    def decorator(view):
+        if inspect.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+
+                etag, last_modified, authenticated = await sync_to_async(_validators)(
+                    request, models, per_day
+                )
+                response = None
+                if authenticated:
+                    response = get_conditional_response(
+                        request, etag=etag, last_modified=last_modified
+                    )
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _finish(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            etag, last_modified, authenticated = _validators(request, models, per_day)
+
+            # 304 sirf logged-in users ko — auth check Ninja operation ke andar hota hai
+            response = None
+            if authenticated:
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified
+                )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _finish(response, etag, last_modified)
+        return wrapper
+    return decorator
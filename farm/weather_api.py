@@ -1,20 +1,26 @@
 from ninja import Router
 import time
+from asgiref.sync import sync_to_async
 from .weather_service import WeatherService
 
 # auth=None — weather sabke liye open hai (frontend bina login ke use karta hai)
 weather_api = Router(tags=["Weather Live"])
 
+# Live endpoints async hain — upstream HTTP call (requests) thread pool mein chalti hai,
+# event loop / baaki requests block nahi hote. thread_sensitive=False: DB nahi chhoota.
+_current_weather = sync_to_async(WeatherService.get_current_weather, thread_sensitive=False)
+_forecast = sync_to_async(WeatherService.get_forecast, thread_sensitive=False)
+
 
 @weather_api.get("/current/", auth=None)
-def get_current_weather(request, lat: float = None, lng: float = None):
+async def get_current_weather(request, lat: float = None, lng: float = None):
     """
     Real-time current weather.
     Server-side FileBasedCache: 15 min TTL.
     Response mein from_cache + data_age_sec bhi aata hai.
     """
     try:
-        w = WeatherService.get_current_weather(lat, lng)
+        w = await _current_weather(lat, lng)
         if w:
             now       = int(time.time())
             fetched   = w.get("fetched_at", now)
@@ -65,10 +71,10 @@ def clear_weather_cache(request):
 
 
 @weather_api.get("/forecast/", auth=None)
-def get_forecast(request, lat: float = None, lng: float = None, days: int = 10):
+async def get_forecast(request, lat: float = None, lng: float = None, days: int = 10):
     """7-day forecast. Cache TTL: 1 hour."""
     try:
-        forecast = WeatherService.get_forecast(lat, lng, days)
+        forecast = await _forecast(lat, lng, days)
         if forecast:
             return {
                 "success": True,
@@ -91,9 +97,9 @@ def get_forecast(request, lat: float = None, lng: float = None, days: int = 10):
 
 
 @weather_api.get("/alerts/", auth=None)
-def get_alerts(request, lat: float = None, lng: float = None):
+async def get_alerts(request, lat: float = None, lng: float = None):
     try:
-        current = WeatherService.get_current_weather(lat, lng)
+        current = await _current_weather(lat, lng)
         alerts  = WeatherService.get_weather_alerts(current)
         return {"success": True, "alerts": alerts}
     except Exception as e:
@@ -102,9 +108,9 @@ def get_alerts(request, lat: float = None, lng: float = None):
 
 
 @weather_api.get("/health-recommendations/", auth=None)
-def get_health(request, lat: float = None, lng: float = None):
+async def get_health(request, lat: float = None, lng: float = None):
     try:
-        current = WeatherService.get_current_weather(lat, lng)
+        current = await _current_weather(lat, lng)
         tips    = WeatherService.get_health_impact(current)
         return {
             "success":         True,
@@ -1,3 +1,11 @@
+"""
+ASGI entry point — async Ninja endpoints (stats, lists, notifications, live weather)
+yahan event loop par chalte hain; sync endpoints Django thread pool mein.
+
+Run:
+    uvicorn goat_farm.asgi:application --host 0.0.0.0 --port 8000
+"""
+
 import os
 from django.core.asgi import get_asgi_application
 
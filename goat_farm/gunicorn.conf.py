@@ -0,0 +1,83 @@
+"""
+🐐 Gunicorn config — production ASGI serving (uvicorn workers)
+
+Run:
+    gunicorn -c goat_farm/gunicorn.conf.py goat_farm.asgi:application
+    python manage.py serve            # yahi command wrap karta hai
+
+Sab values env se override ho sakti hain (Render / Docker ke liye):
+- PORT / GUNICORN_BIND      → bind address (default 0.0.0.0:8000)
+- WEB_CONCURRENCY           → workers (default: 2 x CPU + 1, max GUNICORN_MAX_WORKERS=8)
+- GUNICORN_KEEPALIVE        → idle keep-alive seconds (default 5; LB ke idle timeout se kam rakho)
+- GUNICORN_MAX_REQUESTS     → itni requests ke baad worker recycle (memory leaks se bachao)
+- GUNICORN_TIMEOUT          → hung worker kill timeout
+- SERVE_JOB_WORKER          → 0 = background job worker (run_worker) saath mein mat chalao
+                              (docker-compose ki alag worker service ho tab; serve --no-worker yahi set karta hai)
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+_cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND') or f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Async worker — ek process kai concurrent requests sambhalta hai (farm/api.py ke async endpoints)
+worker_class = 'uvicorn_worker.UvicornWorker'
+# SQLite single-writer hai — bahut zyada processes sirf lock contention badhate hain, isliye cap
+workers = _env_int('WEB_CONCURRENCY', min(_cpus * 2 + 1, _env_int('GUNICORN_MAX_WORKERS', 8)))
+
+# Keep-alive: browser/LB connection reuse — har request par naya TCP handshake nahi
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Worker recycling — jitter taaki saare workers ek saath restart na hon
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+# Heartbeat file tmpfs par (Docker mein /tmp disk par ho sakta hai → worker timeouts)
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+forwarded_allow_ips = os.environ.get('FORWARDED_ALLOW_IPS', '*')
+
+
+# ==================== BACKGROUND JOB WORKER ====================
+# Exports / QR PDF / reminders BackgroundJob queue mein jaate hain — koi worker na ho to hamesha QUEUED.
+# Isliye default deployment (Dockerfile → manage.py serve) mein arbiter ek run_worker child bhi chalata hai;
+# gunicorn band ho to worker ko bhi SIGTERM (current job poora karke exit). Ek se zyada workers safe hain.
+_job_worker = None
+
+
+def when_ready(server):
+    global _job_worker
+    if os.environ.get('SERVE_JOB_WORKER', '1') == '0':
+        return
+    manage = Path(__file__).resolve().parent.parent / 'manage.py'
+    _job_worker = subprocess.Popen([sys.executable, str(manage), 'run_worker'])
+    server.log.info('Background job worker started (pid %s)', _job_worker.pid)
+
+
+def on_exit(server):
+    if _job_worker is None or _job_worker.poll() is not None:
+        return
+    _job_worker.terminate()
+    try:
+        _job_worker.wait(server.cfg.graceful_timeout)
+    except subprocess.TimeoutExpired:
+        _job_worker.kill()
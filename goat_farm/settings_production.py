@@ -9,10 +9,15 @@ RENDER_EXTERNAL_HOSTNAME = os.environ.get('RENDER_EXTERNAL_HOSTNAME')
 if RENDER_EXTERNAL_HOSTNAME:
     ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
 
-MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+# WhiteNoise — SecurityMiddleware ke theek baad (whitenoise docs)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+)
+# Manifest storage: hashed filenames + collectstatic ke time .gz / .br (Brotli) precompress.
+# Hashed files par WhiteNoise far-future headers bhejta hai (max-age 10 saal, immutable);
+# WHITENOISE_MAX_AGE sirf non-hashed URLs ke liye hai.
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+WHITENOISE_MAX_AGE = int(os.environ.get('WHITENOISE_MAX_AGE', 60 * 60 * 24))
 
-DATABASE_URL = os.environ.get('DATABASE_URL')
-if DATABASE_URL:
-    import dj_database_url
-    DATABASES = {'default': dj_database_url.config(default=DATABASE_URL, conn_max_age=600)}
\ No newline at end of file
+# DATABASE_URL (PostgreSQL) profile goat_farm/settings.py mein hai — yahan dobara nahi
\ No newline at end of file